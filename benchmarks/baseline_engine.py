@@ -0,0 +1,296 @@
+# benchmarks/baseline_engine.py
+#
+# The engine as it was before the long-lived managers (and everything built on
+# them) were added, copied unchanged apart from its name, so that benchmarks can
+# measure the current engine against the real baseline rather than against an
+# approximation of it.  It dispatches each event down a chain of isinstance()
+# checks and builds a new manager, with new cursors and SQL, for every event.
+
+
+import sqlite3
+from p2app.events import *
+
+
+class DatabaseManager:
+    def __init__(self):
+        self._conn = None
+        self.path = None
+
+    def open_database(self, event):
+        try:
+            self.path = event.path()
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA foreign_keys = ON;")
+            yield DatabaseOpenedEvent(self.path)
+        except sqlite3.Error as e:
+            yield DatabaseOpenFailedEvent(str(e))
+
+    def connection(self):
+        return self._conn
+
+    def database_path(self):
+        return self.path
+
+
+class ContinentManager:
+    def __init__(self, connection):
+        self._conn = connection
+
+    def start_continent_search(self, event):
+        search_criteria = event.continent_code(), event.name()
+
+        if event.continent_code() is None or event.name() is None:
+            query = "SELECT * FROM continent WHERE continent_code = ? OR name = ?"
+        else:
+            query = "SELECT * FROM continent WHERE continent_code = ? AND name = ?"
+
+        cursor = self._conn.cursor()
+        cursor.execute(query, search_criteria)
+        _continents = cursor.fetchall()
+        cursor.close()
+        for continent in _continents:
+            yield ContinentSearchResultEvent(Continent(*continent))
+
+    def load_continent(self, event):
+        continent_id = event.continent_id()
+        query = "SELECT * FROM continent WHERE continent_id = ?"
+        cursor = self._conn.cursor()
+        cursor.execute(query, (continent_id,))
+        _continent = cursor.fetchone()
+        cursor.close()
+        if _continent:
+            yield ContinentLoadedEvent(Continent(*_continent))
+
+    def save_new_continent(self, event):
+        _continent = event.continent()
+        try:
+            query = "INSERT INTO continent (continent_code, name) VALUES (?, ?)"
+            cursor = self._conn.cursor()
+            cursor.execute(query, (_continent.continent_code, _continent.name))
+            self._conn.commit()
+            cursor.close()
+            yield ContinentSavedEvent(_continent)
+        except sqlite3.Error as e:
+            yield SaveContinentFailedEvent(str(e))
+
+    def save_continent(self, event):
+        _continent = event.continent()
+        try:
+            query = "UPDATE continent SET continent_code = ?, name = ? WHERE continent_id = ?"
+            cursor = self._conn.cursor()
+            cursor.execute(query, (_continent.continent_code, _continent.name, _continent.continent_id))
+            self._conn.commit()
+            cursor.close()
+            yield ContinentSavedEvent(_continent)
+        except sqlite3.Error as e:
+            yield SaveContinentFailedEvent(str(e))
+
+
+class CountryManager:
+    def __init__(self, connection):
+        self._conn = connection
+
+    def start_country_search(self, event):
+        search_criteria = event.country_code(), event.name()
+
+        if event.country_code() is None or event.name() is None:
+            query = "SELECT * FROM country WHERE country_code = ? OR name = ?"
+        else:
+            query = "SELECT * FROM country WHERE country_code = ? AND name = ?"
+
+        cursor = self._conn.cursor()
+        cursor.execute(query, search_criteria)
+        _countries = cursor.fetchall()
+        cursor.close()
+        for country in _countries:
+            yield CountrySearchResultEvent(Country(*country))
+
+    def load_country(self, event):
+        country_id = event.country_id()
+        query = "SELECT * FROM country WHERE country_id = ?"
+        cursor = self._conn.cursor()
+        cursor.execute(query, (country_id,))
+        _country = cursor.fetchone()
+        cursor.close()
+        if _country:
+            yield CountryLoadedEvent(Country(*_country))
+
+    def save_new_country(self, event):
+        _country = event.country()
+        try:
+            query = "INSERT INTO country (country_code, name, continent_id, wikipedia_link) VALUES (?, ?, ?, ?)"
+            cursor = self._conn.cursor()
+            cursor.execute(query, (_country.country_code, _country.name,
+                                   _country.continent_id, _country.wikipedia_link))
+            self._conn.commit()
+            cursor.close()
+            yield CountrySavedEvent(_country)
+        except sqlite3.Error as e:
+            yield SaveCountryFailedEvent(str(e))
+
+    def save_country(self, event):
+        _country = event.country()
+        try:
+            query = ("UPDATE country SET country_code = ?, name = ?, continent_id = ?, wikipedia_link = ?"
+                     "WHERE country_id = ?")
+            cursor = self._conn.cursor()
+            cursor.execute(query, (_country.country_code, _country.name, _country.continent_id,
+                                   _country.wikipedia_link, _country.country_id))
+            self._conn.commit()
+            cursor.close()
+            yield CountrySavedEvent(_country)
+        except sqlite3.Error as e:
+            yield SaveCountryFailedEvent(str(e))
+
+
+class RegionManager:
+    def __init__(self, connection):
+        self._conn = connection
+
+    def start_region_search(self, event):
+        search_criteria = []
+        conditions = []
+
+        if event.region_code() is not None:
+            search_criteria.append(event.region_code())
+            conditions.append("region_code = ?")
+        if event.local_code() is not None:
+            search_criteria.append(event.local_code())
+            conditions.append("local_code = ?")
+        if event.name() is not None:
+            search_criteria.append(event.name())
+            conditions.append("name = ?")
+
+        where_clause = " AND ".join(conditions)
+        if where_clause:
+            query = f"SELECT * FROM region WHERE {where_clause}"
+        else:
+            query = "SELECT * FROM region"
+
+        cursor = self._conn.cursor()
+        cursor.execute(query, search_criteria)
+        _regions = cursor.fetchall()
+        cursor.close()
+        for region in _regions:
+            yield RegionSearchResultEvent(Region(*region))
+
+    def load_region(self, event):
+        region_id = event.region_id()
+        query = "SELECT * FROM region WHERE region_id = ?"
+        cursor = self._conn.cursor()
+        cursor.execute(query, (region_id,))
+        _regions = cursor.fetchall()
+        cursor.close()
+        for _region in _regions:
+            yield RegionLoadedEvent(Region(*_region))
+
+    def save_new_region(self, event):
+        _region = event.region()
+        try:
+            query = ("INSERT INTO region (region_code, local_code, name, continent_id, country_id)"
+                     "VALUES (?, ?, ?, ?, ?)")
+            cursor = self._conn.cursor()
+            cursor.execute(query, (_region.region_code, _region.local_code, _region.name,
+                                   _region.continent_id, _region.country_id))
+            self._conn.commit()
+            cursor.close()
+            yield RegionSavedEvent(_region)
+        except sqlite3.Error as e:
+            yield SaveRegionFailedEvent(str(e))
+
+    def save_region(self, event):
+        _region = event.region()
+        try:
+            query = ("UPDATE region SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?"
+                     "WHERE region_id = ?")
+            cursor = self._conn.cursor()
+            cursor.execute(query, (_region.region_code, _region.local_code, _region.name, _region.continent_id,
+                                   _region.country_id, _region.region_id))
+            self._conn.commit()
+            cursor.close()
+            yield RegionSavedEvent(_region)
+        except sqlite3.Error as e:
+            yield SaveRegionFailedEvent(str(e))
+
+
+class BaselineEngine:
+    """An object that represents the application's engine, whose main role is to
+    process events sent to it by the user interface, then generate events that are
+    sent back to the user interface in response, allowing the user interface to be
+    unaware of any details of how the engine is implemented.
+    """
+
+    def __init__(self):
+        """Initializes the engine"""
+        self._conn = None
+        self.path = None
+        self._db_manager = DatabaseManager()
+        self._continent_manager = None
+        self._country_manager = None
+        self._region_manager = None
+
+    def process_event(self, event):
+        """A generator function that processes one event sent from the user interface,
+        yielding zero or more events in response."""
+
+        if isinstance(event, QuitInitiatedEvent):
+            yield EndApplicationEvent()
+
+        elif isinstance(event, OpenDatabaseEvent):
+            yield from self._db_manager.open_database(event)
+            self._conn = self._db_manager.connection()
+            self.path = self._db_manager.database_path()
+
+        elif isinstance(event, CloseDatabaseEvent):
+            yield DatabaseClosedEvent()
+
+        elif isinstance(event, StartContinentSearchEvent):
+            self._continent_manager = ContinentManager(self._conn)
+            yield from self._continent_manager.start_continent_search(event)
+
+        elif isinstance(event, LoadContinentEvent):
+            self._continent_manager = ContinentManager(self._conn)
+            yield from self._continent_manager.load_continent(event)
+
+        elif isinstance(event, SaveNewContinentEvent):
+            self._continent_manager = ContinentManager(self._conn)
+            yield from self._continent_manager.save_new_continent(event)
+
+        elif isinstance(event, SaveContinentEvent):
+            self._continent_manager = ContinentManager(self._conn)
+            yield from self._continent_manager.save_continent(event)
+
+        elif isinstance(event, StartCountrySearchEvent):
+            self._country_manager = CountryManager(self._conn)
+            yield from self._country_manager.start_country_search(event)
+
+        elif isinstance(event, LoadCountryEvent):
+            self._country_manager = CountryManager(self._conn)
+            yield from self._country_manager.load_country(event)
+
+        elif isinstance(event, SaveNewCountryEvent):
+            self._country_manager = CountryManager(self._conn)
+            yield from self._country_manager.save_new_country(event)
+
+        elif isinstance(event, SaveCountryEvent):
+            self._country_manager = CountryManager(self._conn)
+            yield from self._country_manager.save_country(event)
+
+        elif isinstance(event, StartRegionSearchEvent):
+            self._region_manager = RegionManager(self._conn)
+            yield from self._region_manager.start_region_search(event)
+
+        elif isinstance(event, LoadRegionEvent):
+            self._region_manager = RegionManager(self._conn)
+            yield from self._region_manager.load_region(event)
+
+        elif isinstance(event, SaveNewRegionEvent):
+            self._region_manager = RegionManager(self._conn)
+            yield from self._region_manager.save_new_region(event)
+
+        elif isinstance(event, SaveRegionEvent):
+            self._region_manager = RegionManager(self._conn)
+            yield from self._region_manager.save_region(event)
+
+        else:
+            yield ErrorEvent(f"ERROR: {event}")
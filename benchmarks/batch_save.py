@@ -0,0 +1,57 @@
+# benchmarks/batch_save.py
+#
+# Compares saving regions one event at a time (one commit per row) with a single
+# SaveRegionBatchEvent (one transaction for the whole batch).
+#
+# Usage: python -m benchmarks.batch_save [row_count]
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from p2app.engine import Engine
+from p2app.events import *
+from .engine_overhead import _create_database
+
+
+_DEFAULT_ROW_COUNT = 10_000
+
+
+def _make_regions(count, prefix):
+    return [Region(None, f'{prefix}-{i}', str(i), f'{prefix} Region {i}', 1, 1, None, None)
+            for i in range(count)]
+
+
+def _time(engine, events):
+    start = time.perf_counter()
+
+    for event in events:
+        for result in engine.process_event(event):
+            if isinstance(result, SaveRegionFailedEvent):
+                raise RuntimeError(result.reason())
+
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else _DEFAULT_ROW_COUNT
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'bench.db'
+        _create_database(path)
+
+        engine = Engine()
+        list(engine.process_event(OpenDatabaseEvent(path)))
+
+        single = _time(engine, [SaveNewRegionEvent(r) for r in _make_regions(count, 'SINGLE')])
+        batch = _time(engine, [SaveRegionBatchEvent(_make_regions(count, 'BATCH'))])
+
+        list(engine.process_event(CloseDatabaseEvent()))
+
+    print(f'rows: {count}')
+    print(f'one save per row: {single:.3f}s ({count / single:,.0f} rows/s)')
+    print(f'one batch       : {batch:.3f}s ({count / batch:,.0f} rows/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/engine_overhead.py
+#
+# Measures the per-event overhead of Engine.process_event against a small
+# database in a temporary file, comparing the long-lived manager layer with the
+# baseline engine (see baseline_engine.py), which builds a manager (and formats
+# SQL) for every event.
+#
+# The engine is run with its entity and query caches turned off, since they
+# were added later and would otherwise answer most of these repeated events
+# without reaching the database; the comparison is of dispatch alone.
+#
+# Usage: python -m benchmarks.engine_overhead [event_count]
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from p2app.engine import Engine, EngineConfig
+from p2app.events import *
+from .baseline_engine import BaselineEngine
+
+
+_SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'schema.sql'
+_DEFAULT_EVENT_COUNT = 100_000
+
+# Only what this benchmark compares: no caches in front of the statements.
+_CONFIG = EngineConfig(entity_cache_size=0, query_cache_size=0)
+
+
+def _create_database(path):
+    connection = sqlite3.connect(path)
+    connection.executescript(_SCHEMA_PATH.read_text())
+    connection.execute("INSERT INTO continent VALUES (1, 'NA', 'North America')")
+    connection.execute(
+        "INSERT INTO country VALUES (1, 'US', 'United States', 1, 'https://example.org', NULL)")
+    connection.executemany(
+        "INSERT INTO region VALUES (?, ?, ?, ?, 1, 1, NULL, NULL)",
+        [(i, f'US-{i}', str(i), f'Region {i}') for i in range(1, 51)])
+    connection.commit()
+    connection.close()
+
+
+def _make_events(count):
+    shapes = [
+        lambda i: LoadContinentEvent(1),
+        lambda i: StartContinentSearchEvent('NA', None),
+        lambda i: LoadCountryEvent(1),
+        lambda i: StartRegionSearchEvent(f'US-{i % 50 + 1}', None, None),
+        lambda i: StartRegionSearchEvent(None, str(i % 50 + 1), f'Region {i % 50 + 1}'),
+        lambda i: LoadRegionEvent(i % 50 + 1),
+    ]
+
+    return [shapes[i % len(shapes)](i) for i in range(count)]
+
+
+def _run(engine, events):
+    start = time.perf_counter()
+
+    for event in events:
+        for _ in engine.process_event(event):
+            pass
+
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else _DEFAULT_EVENT_COUNT
+    events = _make_events(count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'bench.db'
+        _create_database(path)
+
+        baseline = BaselineEngine()
+        list(baseline.process_event(OpenDatabaseEvent(path)))
+        before = _run(baseline, events)
+        # The baseline never closed its connection, even on CloseDatabaseEvent.
+        baseline._conn.close()
+
+        engine = Engine(_CONFIG)
+        list(engine.process_event(OpenDatabaseEvent(path)))
+        after = _run(engine, events)
+        list(engine.process_event(CloseDatabaseEvent()))
+
+    print(f'events: {count}')
+    print(f'per-event managers : {before:.3f}s ({before / count * 1e6:.2f} us/event)')
+    print(f'long-lived managers: {after:.3f}s ({after / count * 1e6:.2f} us/event)')
+
+
+if __name__ == '__main__':
+    main()
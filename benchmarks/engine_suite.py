@@ -0,0 +1,253 @@
+# benchmarks/engine_suite.py
+#
+# Drives every kind of event the engine handles (other than imports, which
+# replace the data) headlessly against a database, such as one made by
+# benchmarks.synthetic, and reports the p50, p95 and p99 latency of each along
+# with its throughput.  Results can be saved as JSON and later runs compared with
+# them, failing if any scenario's median got slower by more than a tolerance.
+#
+# The database is copied to a temporary directory first, since some scenarios
+# save rows, unless --in-place is given.
+#
+# Usage: python -m benchmarks.engine_suite DATABASE [--iterations N] [--json PATH]
+#                                          [--baseline PATH [--tolerance RATIO]] [--in-place]
+
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from p2app.engine import Engine
+from p2app.engine.distances import is_available as is_numpy_available
+from p2app.events import *
+
+
+_DEFAULT_ITERATIONS = 200
+_DEFAULT_TOLERANCE = 1.5
+
+# Scenarios whose single events do much more work run this many times fewer
+# iterations.
+_HEAVY_DIVISOR = 20
+
+_SAMPLE_SIZE = 1000
+
+# Untimed events run before each scenario, so that lazily built indexes and cold
+# caches don't show up as its slowest events.
+_WARM_UP_EVENTS = 3
+
+# Medians this close to the baseline's are never counted as regressions, since
+# at these sizes the difference is timer noise.
+_MIN_REGRESSION_MS = 0.05
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Benchmark every engine event handler.')
+    parser.add_argument('database', type = Path, help = 'the database to benchmark against')
+    parser.add_argument(
+        '--iterations', type = int, default = _DEFAULT_ITERATIONS,
+        help = f'events per scenario (default {_DEFAULT_ITERATIONS})')
+    parser.add_argument('--json', type = Path, help = 'also write the results to this file')
+    parser.add_argument('--baseline', type = Path, help = 'compare with results saved by --json')
+    parser.add_argument(
+        '--tolerance', type = float, default = _DEFAULT_TOLERANCE,
+        help = f'the slowdown in median latency counted as a regression (default {_DEFAULT_TOLERANCE})')
+    parser.add_argument(
+        '--in-place', action = 'store_true',
+        help = 'run against the database itself rather than a copy')
+    return parser.parse_args()
+
+
+class _Sample:
+    """Rows picked at random from the database, from which the scenarios build
+    their events, so that repeated events don't all hit the same cached row."""
+
+    def __init__(self, path, rng):
+        connection = sqlite3.connect(path)
+
+        def pick(query):
+            rows = connection.execute(query).fetchall()
+            return rng.sample(rows, min(len(rows), _SAMPLE_SIZE))
+
+        try:
+            self.continents = pick("SELECT * FROM continent")
+            self.countries = pick("SELECT * FROM country")
+            self.regions = pick("SELECT * FROM region")
+            self.airports = pick("SELECT * FROM airport")
+            self.runway_airport_ids = [row[0] for row in pick(
+                "SELECT DISTINCT airport_id FROM runway WHERE length_ft >= 8000 AND closed = 0")]
+        finally:
+            connection.close()
+
+        self._rng = rng
+
+    def choice(self, rows):
+        return self._rng.choice(rows)
+
+    def airport_ids(self, count):
+        return [row[0] for row in self._rng.sample(self.airports, min(count, len(self.airports)))]
+
+    def word(self, rows, column):
+        return self._rng.choice(self._rng.choice(rows)[column].split())
+
+
+def _scenarios(sample, export_path):
+    """Returns (name, is_heavy, event factory) triples; the factories take the
+    iteration number."""
+    def airport_box(i):
+        airport = sample.choice(sample.airports)
+        return StartAirportBoxSearchEvent(airport[4] - 1.0, airport[5] - 1.0, airport[4] + 1.0, airport[5] + 1.0)
+
+    def new_region(i):
+        country = sample.choice(sample.countries)
+        return SaveNewRegionEvent(Region(
+            None, f'BENCH-{time.time_ns()}-{i}', f'B{i}', f'Benchmark Region {i}', country[3], country[0],
+            None, None))
+
+    def route(i):
+        start_id, goal_id = random.Random(i).sample(sample.runway_airport_ids, 2)
+        return FindRouteEvent(start_id, goal_id, 2000.0, 8000)
+
+    scenarios = [
+        ('LoadContinent', False, lambda i: LoadContinentEvent(sample.choice(sample.continents)[0])),
+        ('ContinentSearch', False, lambda i: StartContinentSearchEvent(sample.choice(sample.continents)[1], None)),
+        ('ContinentTextSearch', False, lambda i: StartContinentTextSearchEvent(sample.word(sample.continents, 2))),
+        ('SaveContinent', False, lambda i: SaveContinentEvent(Continent(*sample.choice(sample.continents)))),
+        ('LoadCountry', False, lambda i: LoadCountryEvent(sample.choice(sample.countries)[0])),
+        ('CountrySearch', False, lambda i: StartCountrySearchEvent(sample.choice(sample.countries)[1], None)),
+        ('CountryTextSearch', False, lambda i: StartCountryTextSearchEvent(sample.word(sample.countries, 2))),
+        ('SaveCountry', False, lambda i: SaveCountryEvent(Country(*sample.choice(sample.countries)))),
+        ('LoadRegion', False, lambda i: LoadRegionEvent(sample.choice(sample.regions)[0])),
+        ('RegionSearchByCode', False,
+         lambda i: StartRegionSearchEvent(sample.choice(sample.regions)[1], None, None)),
+        ('RegionSearchByName', False,
+         lambda i: StartRegionSearchEvent(None, None, sample.choice(sample.regions)[3])),
+        ('RegionTextSearch', False, lambda i: StartRegionTextSearchEvent(sample.word(sample.regions, 3))),
+        ('SaveRegion', False, lambda i: SaveRegionEvent(Region(*sample.choice(sample.regions)))),
+        ('SaveNewRegion', False, new_region),
+        ('SaveRegionBatch', True,
+         lambda i: SaveRegionBatchEvent([Region(*sample.choice(sample.regions)) for _ in range(100)])),
+        ('LoadAirport', False, lambda i: LoadAirportEvent(sample.choice(sample.airports)[0])),
+        ('AirportTextSearch', True, lambda i: StartAirportTextSearchEvent(sample.word(sample.airports, 3))),
+        ('AirportBoxSearch', False, airport_box),
+        ('NearestAirports', False,
+         lambda i: StartNearestAirportsSearchEvent(*sample.choice(sample.airports)[4:6], 10)),
+        ('SaveAirport', False, lambda i: SaveAirportEvent(Airport(*sample.choice(sample.airports)))),
+        ('NavigationAidsNearAirports', False,
+         lambda i: FindNavigationAidsNearAirportsEvent(sample.airport_ids(100), 50.0)),
+        ('FindRoute', True, route),
+        ('ExportRegions', True, lambda i: StartExportEvent('region', export_path))
+    ]
+
+    if is_numpy_available():
+        scenarios += [
+            ('DistanceMatrix', False, lambda i: CalculateDistanceMatrixEvent(sample.airport_ids(200))),
+            ('AirportPairsWithin', True, lambda i: FindAirportPairsWithinEvent(25.0, sample.airport_ids(1000)))
+        ]
+
+    return scenarios
+
+
+def _run_scenario(engine, make_event, iterations):
+    latencies = []
+    result_count = 0
+
+    for i in range(-_WARM_UP_EVENTS, 0):
+        for result in engine.process_event(make_event(i)):
+            pass
+
+    for i in range(iterations):
+        event = make_event(i)
+        start = time.perf_counter()
+
+        for result in engine.process_event(event):
+            result_count += 1
+
+        latencies.append(time.perf_counter() - start)
+
+    total = sum(latencies)
+    percentiles = statistics.quantiles(latencies, n = 100, method = 'inclusive')
+
+    return {
+        'events': iterations,
+        'p50_ms': percentiles[49] * 1000,
+        'p95_ms': percentiles[94] * 1000,
+        'p99_ms': percentiles[98] * 1000,
+        'events_per_second': iterations / total if total else None,
+        'results_per_second': result_count / total if total else None
+    }
+
+
+def _print_results(results):
+    print(f"{'scenario':28} {'events':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'events/s':>10} {'results/s':>11}")
+
+    for name, result in results.items():
+        print(f"{name:28} {result['events']:>7} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} "
+              f"{result['p99_ms']:>9.3f} {result['events_per_second']:>10,.0f} "
+              f"{result['results_per_second']:>11,.0f}")
+
+
+def _regressions(results, baseline, tolerance):
+    regressions = []
+
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result['p50_ms'] / baseline[name]['p50_ms']
+
+            if ratio > tolerance and result['p50_ms'] - baseline[name]['p50_ms'] > _MIN_REGRESSION_MS:
+                regressions.append((name, ratio))
+
+    return regressions
+
+
+def _benchmark(path, iterations):
+    rng = random.Random(33)
+    sample = _Sample(path, rng)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = Engine()
+        list(engine.process_event(OpenDatabaseEvent(path)))
+
+        for name, is_heavy, make_event in _scenarios(sample, Path(directory) / 'export.csv'):
+            count = max(iterations // _HEAVY_DIVISOR, 2) if is_heavy else iterations
+            results[name] = _run_scenario(engine, make_event, count)
+
+        list(engine.process_event(CloseDatabaseEvent()))
+
+    return results
+
+
+def main():
+    arguments = _parse_arguments()
+
+    if arguments.in_place:
+        results = _benchmark(arguments.database, arguments.iterations)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / arguments.database.name
+            shutil.copyfile(arguments.database, path)
+            results = _benchmark(path, arguments.iterations)
+
+    _print_results(results)
+
+    if arguments.json:
+        arguments.json.write_text(json.dumps(results, indent = 2))
+
+    if arguments.baseline:
+        regressions = _regressions(
+            results, json.loads(arguments.baseline.read_text()), arguments.tolerance)
+
+        for name, ratio in regressions:
+            print(f'REGRESSION: {name} median is {ratio:.2f}x the baseline')
+
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+# benchmarks/mixed_workload.py
+#
+# Measures throughput when several threads send read-only events (searches,
+# loads, nearest-airport queries and exports) to one engine while another thread
+# saves regions and airports at a steady rate, once for each of the given reader
+# pool sizes.
+# A pool size of 0 is the single shared connection, on which every event waits
+# its turn; larger pools put the database in WAL mode and let reads proceed in
+# parallel with each other and with the saves.
+#
+# The database, such as one made by benchmarks.synthetic, is copied for each pool
+# size, since the writer saves rows and WAL mode is persistent.
+#
+# Usage: python -m benchmarks.mixed_workload DATABASE [--pool-sizes N ...]
+#                                            [--readers N] [--writes-per-second N]
+#                                            [--seconds S]
+
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from p2app.engine import Engine, EngineConfig
+from p2app.events import *
+from .engine_suite import _Sample
+
+
+_DEFAULT_POOL_SIZES = [0, 4]
+_DEFAULT_READERS = 4
+_DEFAULT_WRITES_PER_SECOND = 100.0
+_DEFAULT_SECONDS = 10.0
+
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Benchmark concurrent reads alongside saves.')
+    parser.add_argument('database', type = Path, help = 'the database to benchmark against')
+    parser.add_argument(
+        '--pool-sizes', type = int, nargs = '+', default = _DEFAULT_POOL_SIZES,
+        help = f'reader pool sizes to compare (default {" ".join(map(str, _DEFAULT_POOL_SIZES))})')
+    parser.add_argument(
+        '--readers', type = int, default = _DEFAULT_READERS,
+        help = f'threads sending read-only events (default {_DEFAULT_READERS})')
+    parser.add_argument(
+        '--writes-per-second', type = float, default = _DEFAULT_WRITES_PER_SECOND,
+        help = f'how often the writing thread saves (default {_DEFAULT_WRITES_PER_SECOND})')
+    parser.add_argument(
+        '--seconds', type = float, default = _DEFAULT_SECONDS,
+        help = f'how long each pool size runs (default {_DEFAULT_SECONDS})')
+    return parser.parse_args()
+
+
+def _read_events(sample, rng, export_path):
+    def export(i):
+        return StartExportEvent(
+            'region', export_path, criteria = {'continent_id': sample.choice(sample.continents)[0]})
+
+    factories = [
+        lambda i: StartRegionSearchEvent(None, None, sample.choice(sample.regions)[3]),
+        lambda i: LoadCountryEvent(sample.choice(sample.countries)[0]),
+        lambda i: LoadAirportEvent(sample.choice(sample.airports)[0]),
+        lambda i: StartAirportTextSearchEvent(sample.word(sample.airports, 3)),
+        lambda i: StartNearestAirportsSearchEvent(*sample.choice(sample.airports)[4:6], 10),
+        export
+    ]
+
+    return lambda i: rng.choice(factories)(i)
+
+
+def _write_events(sample, rng):
+    def make(i):
+        if i % 2 == 0:
+            airport = Airport(*sample.choice(sample.airports))
+            return SaveAirportEvent(airport._replace(elevation_ft = rng.randrange(0, 10_000)))
+        else:
+            country = sample.choice(sample.countries)
+            return SaveNewRegionEvent(Region(
+                None, f'MIXED-{time.time_ns()}-{i}', f'M{i}', f'Mixed Region {i}',
+                country[3], country[0], None, None))
+
+    return make
+
+
+class _Results:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.read_latencies = []
+        self.write_latencies = []
+        self.failures = []
+
+
+    def add(self, latencies, failures, is_write):
+        with self._lock:
+            (self.write_latencies if is_write else self.read_latencies).extend(latencies)
+            self.failures.extend(failures)
+
+
+_FAILURE_EVENTS = (
+    ErrorEvent, ExportFailedEvent, SaveAirportFailedEvent, SaveRegionFailedEvent)
+
+
+def _drive(engine, make_event, deadline, results, is_write, interval = 0.0):
+    latencies = []
+    failures = []
+    i = 0
+    next_start = time.perf_counter()
+
+    while time.perf_counter() < deadline:
+        # A paced thread keeps to its schedule even if one event runs long, so the
+        # rate it achieves is the rate asked for, unless the events can't keep up.
+        time.sleep(max(next_start - time.perf_counter(), 0.0))
+        next_start += interval
+
+        event = make_event(i)
+        start = time.perf_counter()
+
+        for result in engine.process_event(event):
+            if isinstance(result, _FAILURE_EVENTS):
+                failures.append(result)
+
+        latencies.append(time.perf_counter() - start)
+        i += 1
+
+    results.add(latencies, failures, is_write)
+
+
+def _warm_up(engine, thread_count, events):
+    # Each event is sent from thread_count threads at once, each keeping its reader
+    # until all of them have one, so that every reader in the pool builds its own
+    # indexes before the timing starts.  The events must have results.
+    barrier = threading.Barrier(thread_count)
+
+    def send(event):
+        results = engine.process_event(event)
+        next(results)
+        barrier.wait()
+
+        for result in results:
+            pass
+
+    for event in events:
+        threads = [threading.Thread(target = send, args = (event,)) for _ in range(thread_count)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+
+def _run(path, pool_size, reader_count, writes_per_second, seconds):
+    sample = _Sample(path, random.Random(33))
+    results = _Results()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = Engine(EngineConfig(read_pool_size = pool_size))
+        list(engine.process_event(OpenDatabaseEvent(path)))
+
+        airport = sample.choice(sample.airports)
+        _warm_up(engine, max(pool_size, 1), [
+            StartNearestAirportsSearchEvent(airport[4], airport[5], 1),
+            StartAirportTextSearchEvent(airport[3].split()[0])
+        ])
+
+        deadline = time.perf_counter() + seconds
+
+        threads = [
+            threading.Thread(target = _drive, args = (
+                engine, _read_events(sample, random.Random(i), Path(directory) / f'export-{i}.csv'),
+                deadline, results, False))
+            for i in range(reader_count)
+        ]
+
+        threads.append(threading.Thread(target = _drive, args = (
+            engine, _write_events(sample, random.Random(-1)), deadline, results, True,
+            1.0 / writes_per_second)))
+
+        start = time.perf_counter()
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start
+        list(engine.process_event(CloseDatabaseEvent()))
+
+    return results, elapsed
+
+
+def _describe(latencies, elapsed):
+    if len(latencies) < 2:
+        return f'{len(latencies):>8} {"":>10} {"":>9} {"":>9}'
+
+    percentiles = statistics.quantiles(latencies, n = 100, method = 'inclusive')
+    return (f'{len(latencies):>8} {len(latencies) / elapsed:>10,.0f} '
+            f'{percentiles[49] * 1000:>9.3f} {percentiles[98] * 1000:>9.3f}')
+
+
+def main():
+    arguments = _parse_arguments()
+
+    print(f"{'pool':>4} {'kind':6} {'events':>8} {'events/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+
+    for pool_size in arguments.pool_sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / arguments.database.name
+            shutil.copyfile(arguments.database, path)
+            results, elapsed = _run(
+                path, pool_size, arguments.readers, arguments.writes_per_second, arguments.seconds)
+
+        print(f'{pool_size:>4} {"reads":6} {_describe(results.read_latencies, elapsed)}')
+        print(f'{pool_size:>4} {"writes":6} {_describe(results.write_latencies, elapsed)}')
+
+        for failure in results.failures[:5]:
+            print(f'     FAILED: {failure}')
+
+
+if __name__ == '__main__':
+    main()
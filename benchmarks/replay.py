@@ -0,0 +1,163 @@
+# benchmarks/replay.py
+#
+# Replays a recording made by the event bus (see p2app.events.recording) against
+# an engine, either keeping the original time between events or as fast as the
+# engine allows, and reports how long each event took: to its first result, to
+# its last, and (when paced) how late it started because earlier events ran long.
+#
+# With --database, every OpenDatabaseEvent in the recording opens a copy of that
+# database instead of the one recorded (or the database itself with --in-place).
+# Exports are always redirected to a temporary directory.
+#
+# Usage: python -m benchmarks.replay RECORDING [--database PATH [--in-place]]
+#                                    [--max-speed] [--session N] [--json PATH]
+#                                    [--quiet]
+
+import argparse
+import json
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from p2app.engine import Engine
+from p2app.events import *
+from p2app.events.recording import read_recording
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Replay a recording of events against the engine.')
+    parser.add_argument('recording', type = Path, help = 'the recording to replay')
+    parser.add_argument('--database', type = Path, help = 'open this database instead of those recorded')
+    parser.add_argument(
+        '--in-place', action = 'store_true',
+        help = 'open the --database itself rather than a copy')
+    parser.add_argument(
+        '--max-speed', action = 'store_true',
+        help = 'send each event as soon as the last has finished, not at its recorded time')
+    parser.add_argument('--session', type = int, help = 'replay only this session of the recording')
+    parser.add_argument('--json', type = Path, help = 'also write the per-event results to this file')
+    parser.add_argument('--quiet', action = 'store_true', help = 'print only the summary')
+    return parser.parse_args()
+
+
+def _redirected(event, database_path, export_directory):
+    if database_path is not None and isinstance(event, OpenDatabaseEvent):
+        return OpenDatabaseEvent(database_path)
+    elif isinstance(event, StartExportEvent):
+        return StartExportEvent(
+            event.table(), export_directory / Path(event.path()).name, event.format(),
+            event.criteria(), event.compress())
+    else:
+        return event
+
+
+def _replay(recorded_events, engine, is_paced, database_path, export_directory):
+    results = []
+    session = None
+    session_start = None
+
+    for recorded in recorded_events:
+        if recorded.session != session:
+            # Sessions were recorded at different times, so each starts as soon as
+            # the last one has finished.
+            session = recorded.session
+            session_start = time.perf_counter() - recorded.offset
+
+        lag = 0.0
+
+        if is_paced:
+            scheduled = session_start + recorded.offset
+            lag = time.perf_counter() - scheduled
+
+            if lag < 0:
+                time.sleep(-lag)
+                lag = 0.0
+
+        event = _redirected(recorded.event, database_path, export_directory)
+        start = time.perf_counter()
+        first_result = None
+        result_count = 0
+
+        for result in engine.process_event(event):
+            if first_result is None:
+                first_result = time.perf_counter() - start
+
+            result_count += 1
+
+        results.append({
+            'session': recorded.session,
+            'offset': recorded.offset,
+            'event': type(event).__name__,
+            'first_result_ms': first_result * 1000 if first_result is not None else None,
+            'last_result_ms': (time.perf_counter() - start) * 1000,
+            'lag_ms': lag * 1000,
+            'results': result_count
+        })
+
+    return results
+
+
+def _print_events(results):
+    print(f"{'offset s':>10} {'event':36} {'first ms':>9} {'last ms':>9} {'lag ms':>8} {'results':>8}")
+
+    for result in results:
+        first = f"{result['first_result_ms']:>9.3f}" if result['first_result_ms'] is not None else f"{'-':>9}"
+        print(f"{result['offset']:>10.3f} {result['event']:36} {first} {result['last_result_ms']:>9.3f} "
+              f"{result['lag_ms']:>8.1f} {result['results']:>8}")
+
+
+def _print_summary(results):
+    by_event = {}
+
+    for result in results:
+        by_event.setdefault(result['event'], []).append(result['last_result_ms'])
+
+    print()
+    print(f"{'event':36} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+
+    for name, latencies in sorted(by_event.items()):
+        if len(latencies) > 1:
+            percentiles = statistics.quantiles(latencies, n = 100, method = 'inclusive')
+            p50, p95 = percentiles[49], percentiles[94]
+        else:
+            p50 = p95 = latencies[0]
+
+        print(f'{name:36} {len(latencies):>6} {p50:>9.3f} {p95:>9.3f} {max(latencies):>9.3f}')
+
+    lags = [result['lag_ms'] for result in results]
+
+    if any(lags):
+        print(f'\nevents started late: {sum(1 for lag in lags if lag > 0)}, worst by {max(lags):.1f} ms')
+
+
+def main():
+    arguments = _parse_arguments()
+    recorded_events = [
+        recorded for recorded in read_recording(arguments.recording)
+        if arguments.session is None or recorded.session == arguments.session]
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        database_path = arguments.database
+
+        if database_path is not None and not arguments.in_place:
+            database_path = directory / arguments.database.name
+            shutil.copyfile(arguments.database, database_path)
+
+        engine = Engine()
+        results = _replay(
+            recorded_events, engine, not arguments.max_speed, database_path, directory)
+        list(engine.process_event(CloseDatabaseEvent()))
+
+    if not arguments.quiet:
+        _print_events(results)
+
+    _print_summary(results)
+
+    if arguments.json:
+        arguments.json.write_text(json.dumps(results, indent = 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/route_finding.py
+#
+# Measures route finding against an imported database (ideally the full
+# OurAirports dataset): how long the first FindRouteEvent takes, including
+# building the route graph, and the median and slowest of the queries after it,
+# which reuse the cached graph.
+#
+# Usage: python -m benchmarks.route_finding DATABASE [query_count [max_range_km [min_runway_length_ft]]]
+
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+from p2app.engine import Engine
+from p2app.events import *
+
+
+_DEFAULT_QUERY_COUNT = 100
+_DEFAULT_MAX_RANGE_KM = 1500.0
+_DEFAULT_MIN_RUNWAY_LENGTH_FT = 5000
+
+
+def _airport_ids(path, min_runway_length_ft):
+    connection = sqlite3.connect(path)
+
+    try:
+        return [row[0] for row in connection.execute(
+            "SELECT DISTINCT airport_id FROM runway WHERE length_ft >= ? AND closed = 0",
+            (min_runway_length_ft,))]
+    finally:
+        connection.close()
+
+
+def _time(engine, event):
+    start = time.perf_counter()
+    results = list(engine.process_event(event))
+    return time.perf_counter() - start, results[-1]
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python -m benchmarks.route_finding DATABASE '
+              '[query_count [max_range_km [min_runway_length_ft]]]')
+        sys.exit(1)
+
+    path = Path(sys.argv[1])
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else _DEFAULT_QUERY_COUNT
+    max_range_km = float(sys.argv[3]) if len(sys.argv) > 3 else _DEFAULT_MAX_RANGE_KM
+    min_runway_length_ft = int(sys.argv[4]) if len(sys.argv) > 4 else _DEFAULT_MIN_RUNWAY_LENGTH_FT
+
+    airport_ids = _airport_ids(path, min_runway_length_ft)
+
+    if len(airport_ids) < 2:
+        print('Fewer than two airports have a qualifying runway')
+        sys.exit(1)
+
+    rng = random.Random(33)
+    events = [FindRouteEvent(*rng.sample(airport_ids, 2), max_range_km, min_runway_length_ft)
+              for _ in range(count + 1)]
+
+    engine = Engine()
+    list(engine.process_event(OpenDatabaseEvent(path)))
+
+    first, _ = _time(engine, events[0])
+    timings = []
+    found = 0
+
+    for event in events[1:]:
+        elapsed, result = _time(engine, event)
+        timings.append(elapsed)
+        found += isinstance(result, RouteFoundEvent)
+
+    list(engine.process_event(CloseDatabaseEvent()))
+
+    print(f'qualifying airports: {len(airport_ids):,}')
+    print(f'range: {max_range_km:,.0f} km, minimum runway: {min_runway_length_ft:,} ft')
+    print(f'first query (builds graph): {first * 1000:.1f} ms')
+    print(f'queries: {count}, routes found: {found}')
+    print(f'median: {statistics.median(timings) * 1000:.1f} ms, '
+          f'slowest: {max(timings) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/search_paging.py
+#
+# Measures how the search result list of the views (p2app.views.search_results)
+# behaves when browsing every region in a database: how long the first page
+# takes to appear, how long each further page takes as the list is scrolled to
+# the end and back again, and how many rows the list holds at most while doing so.
+#
+# The list is connected straight to an engine, rather than through the event bus,
+# so that the times are those of fetching and drawing the rows.  This needs a
+# display, since it creates a window.
+#
+# Usage: python -m benchmarks.search_paging DATABASE [--page-size N] [--height ROWS]
+
+import argparse
+import statistics
+import sys
+import time
+import tkinter
+from pathlib import Path
+from p2app.engine import Engine
+from p2app.events import *
+from p2app.views.search_results import SearchResultList
+
+
+_DEFAULT_PAGE_SIZE = 50
+_DEFAULT_HEIGHT = 20
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Benchmark browsing region search results.')
+    parser.add_argument('database', type = Path, help = 'the database to search')
+    parser.add_argument(
+        '--page-size', type = int, default = _DEFAULT_PAGE_SIZE,
+        help = f'rows fetched at a time (default {_DEFAULT_PAGE_SIZE})')
+    parser.add_argument(
+        '--height', type = int, default = _DEFAULT_HEIGHT,
+        help = f'visible rows in the list (default {_DEFAULT_HEIGHT})')
+    return parser.parse_args()
+
+
+class _Browser:
+    def __init__(self, root, engine, page_size, height):
+        self._engine = engine
+        self.request_count = 0
+        self.result_list = SearchResultList(
+            root, self._request_page, lambda: None, height = height, page_size = page_size)
+        self.result_list.pack(fill = tkinter.BOTH, expand = True)
+
+    def _request_page(self, after_id, page_size):
+        self.request_count += 1
+        event = StartRegionSearchEvent(
+            None, None, None, batch_results = True, page_size = page_size, after_id = after_id)
+
+        for result in self._engine.process_event(event):
+            if isinstance(result, RegionSearchResultsEvent):
+                self.result_list.add_rows(
+                    (region.region_id, f'{region.region_code} - {region.name}')
+                    for region in result.regions())
+            elif isinstance(result, MoreRegionSearchResultsEvent):
+                self.result_list.end_page(result.after_id())
+            elif isinstance(result, NoMoreRegionSearchResultsEvent):
+                self.result_list.end_page(None)
+
+
+def _scroll(root, browser, fraction):
+    # Scrolls to one end of the list repeatedly, timing each page fetched, until
+    # scrolling there no longer fetches one.
+    times = []
+    most_rows = 0
+
+    while True:
+        request_count = browser.request_count
+        start = time.perf_counter()
+
+        browser.result_list.yview(tkinter.MOVETO, fraction)
+        root.update()
+
+        if browser.request_count == request_count:
+            return times, most_rows
+
+        times.append(time.perf_counter() - start)
+        most_rows = max(most_rows, browser.result_list.row_count())
+
+
+def _report(direction, times, most_rows):
+    if times:
+        print(f'{direction:>6}: {len(times)} pages, median {statistics.median(times) * 1000:.2f} ms, '
+              f'max {max(times) * 1000:.2f} ms, at most {most_rows} rows held')
+    else:
+        print(f'{direction:>6}: no pages fetched')
+
+
+def main():
+    arguments = _parse_arguments()
+
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as e:
+        print(f'Cannot create the window: {e}', file = sys.stderr)
+        sys.exit(1)
+
+    engine = Engine()
+    list(engine.process_event(OpenDatabaseEvent(arguments.database)))
+    browser = _Browser(root, engine, arguments.page_size, arguments.height)
+    root.update()
+
+    start = time.perf_counter()
+    browser.result_list.start()
+    root.update()
+    print(f' first: {(time.perf_counter() - start) * 1000:.2f} ms')
+
+    _report('down', *_scroll(root, browser, 1.0))
+    _report('up', *_scroll(root, browser, 0.0))
+
+    list(engine.process_event(CloseDatabaseEvent()))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/search_rendering.py
+#
+# Compares how long the regions view takes to show a large search result when
+# it arrives as one RegionSearchResultEvent per row (each of which is routed
+# through the window's event handlers) with the same rows arriving as
+# RegionSearchResultsEvents of a batch each, including the time Tk then takes to
+# draw the list.  Neither is paged, so the list holds every row; for browsing
+# paged results, see benchmarks/search_paging.py.
+#
+# This needs a display, since it creates the application's real window.
+#
+# Usage: python -m benchmarks.search_rendering [row_count ...] [--batch-size N]
+
+import argparse
+import sys
+import time
+import tkinter
+from p2app import EventBus, MainView
+from p2app.engine.streaming import batched
+from p2app.events import *
+from p2app.views.events import ClearRegionsSearchListEvent, ShowEditRegionsViewEvent
+
+
+_DEFAULT_ROW_COUNTS = [1000, 5000, 20000]
+_DEFAULT_BATCH_SIZE = 500
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Benchmark rendering of region search results.')
+    parser.add_argument(
+        'row_counts', metavar = 'row_count', type = int, nargs = '*', default = _DEFAULT_ROW_COUNTS,
+        help = f'result sizes to render (default {" ".join(map(str, _DEFAULT_ROW_COUNTS))})')
+    parser.add_argument(
+        '--batch-size', type = int, default = _DEFAULT_BATCH_SIZE,
+        help = f'rows per batch event (default {_DEFAULT_BATCH_SIZE})')
+    return parser.parse_args()
+
+
+def _make_regions(count):
+    return [Region(i, f'XX-{i}', str(i), f'Region {i}', 1, 1, None, None) for i in range(1, count + 1)]
+
+
+def _render(main_view, events):
+    main_view.handle_event(ClearRegionsSearchListEvent())
+    main_view.update()
+
+    start = time.perf_counter()
+
+    for event in events:
+        main_view.handle_event(event)
+
+    main_view.update()
+    return time.perf_counter() - start
+
+
+def main():
+    arguments = _parse_arguments()
+
+    try:
+        main_view = MainView(EventBus())
+    except tkinter.TclError as e:
+        print(f'Cannot create the window: {e}', file = sys.stderr)
+        sys.exit(1)
+
+    main_view.handle_event(ShowEditRegionsViewEvent())
+    main_view.update()
+
+    print(f"{'rows':>8} {'per row ms':>11} {'batched ms':>11} {'speedup':>8}")
+
+    for row_count in arguments.row_counts:
+        regions = _make_regions(row_count)
+        per_row = _render(main_view, [RegionSearchResultEvent(region) for region in regions])
+        batches = _render(main_view, [
+            RegionSearchResultsEvent(batch) for batch in batched(regions, arguments.batch_size)])
+
+        print(f'{row_count:>8} {per_row * 1000:>11.1f} {batches * 1000:>11.1f} {per_row / batches:>7.1f}x')
+
+    main_view.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+# benchmarks/synthetic.py
+#
+# Generates a synthetic database conforming to schema.sql, with all seven tables
+# filled and every foreign key valid, at a multiple of the size of the real
+# OurAirports dataset.  Airports are clustered around their regions' centers and
+# named from a small vocabulary, so location and text searches see data shaped
+# roughly like the real thing; the same seed always generates the same database.
+#
+# Usage: python -m benchmarks.synthetic DATABASE [--scale SCALE] [--seed SEED] [--check]
+
+import argparse
+import random
+import sqlite3
+import string
+import sys
+import time
+from pathlib import Path
+
+
+_SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'schema.sql'
+
+# Approximate row counts of the real dataset, which scale 1 reproduces.  The
+# seven continents are the same at every scale.
+_WORLD_ROW_COUNTS = {
+    'country': 250,
+    'region': 4_000,
+    'airport': 80_000
+}
+
+# Child rows per airport, by airport type: (runways, frequencies, navigation aids)
+# on average, which together come to about the real dataset's 45,000 runways,
+# 30,000 frequencies and 11,000 navigation aids per 80,000 airports.
+_AIRPORT_TYPES = [
+    # type, share of airports, name suffix, runway lengths in feet, children
+    ('small_airport', 0.55, 'Airport', (1_500, 5_500), (0.75, 0.3, 0.1)),
+    ('heliport', 0.24, 'Heliport', (40, 200), (0.3, 0.05, 0.0)),
+    ('closed', 0.10, 'Airfield', (1_000, 6_000), (0.3, 0.0, 0.0)),
+    ('medium_airport', 0.06, 'Regional Airport', (4_000, 9_000), (1.5, 2.5, 0.8)),
+    ('seaplane_base', 0.03, 'Seaplane Base', (2_000, 10_000), (0.5, 0.1, 0.0)),
+    ('large_airport', 0.01, 'International Airport', (8_000, 13_000), (3.0, 8.0, 2.5)),
+    ('balloonport', 0.01, 'Balloonport', (100, 500), (0.1, 0.0, 0.0))
+]
+
+_CONTINENTS = [
+    (1, 'AF', 'Africa', (5.0, 20.0)), (2, 'AN', 'Antarctica', (-80.0, 0.0)),
+    (3, 'AS', 'Asia', (35.0, 90.0)), (4, 'EU', 'Europe', (50.0, 15.0)),
+    (5, 'NA', 'North America', (45.0, -100.0)), (6, 'OC', 'Oceania', (-25.0, 140.0)),
+    (7, 'SA', 'South America', (-15.0, -60.0))
+]
+
+_WORDS = [
+    'Lake', 'River', 'Mount', 'Saint', 'Valley', 'Harbor', 'Pine', 'Cedar', 'North',
+    'South', 'East', 'West', 'Green', 'Red', 'Rock', 'Sand', 'Bay', 'Spring', 'Fort',
+    'Port', 'Eagle', 'Falcon', 'Summit', 'Prairie', 'Mesa', 'Ridge', 'Creek', 'Island',
+    'Meadow', 'Grand', 'Silver', 'Golden', 'Maple', 'Oak', 'Willow', 'Canyon', 'Glen',
+    'Highland', 'Coastal', 'Desert', 'Forest', 'Union', 'Liberty', 'Victoria', 'Clear'
+]
+
+_FREQUENCY_TYPES = ['TWR', 'GND', 'ATIS', 'UNIC', 'CTAF', 'APP', 'DEP', 'AFIS']
+_NAVIGATION_AID_TYPES = ['VOR', 'VOR-DME', 'VORTAC', 'NDB', 'DME', 'TACAN', 'NDB-DME']
+_SURFACES = ['ASP', 'CON', 'TURF', 'GRS', 'GRVL', 'DIRT', 'WATER']
+_CHUNK_SIZE = 20_000
+
+_TUNING_PRAGMAS = ['PRAGMA synchronous = OFF', 'PRAGMA journal_mode = MEMORY',
+                   'PRAGMA cache_size = -65536']
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Generate a synthetic airport database.')
+    parser.add_argument('database', type = Path, help = 'the database file to create')
+    parser.add_argument(
+        '--scale', type = float, default = 1.0,
+        help = 'size relative to the real OurAirports dataset (default 1; 100 is about 8M airports)')
+    parser.add_argument('--seed', type = int, default = 33, help = 'the random seed (default 33)')
+    parser.add_argument(
+        '--check', action = 'store_true',
+        help = 'run PRAGMA foreign_key_check on the generated database')
+    return parser.parse_args()
+
+
+def _code(number, length):
+    # A unique code of capital letters for each number below 26 ** length, with
+    # digits appended beyond that.
+    letters = []
+    remaining = number
+
+    for _ in range(length):
+        remaining, digit = divmod(remaining, 26)
+        letters.append(string.ascii_uppercase[digit])
+
+    return ''.join(reversed(letters)) + (str(remaining) if remaining else '')
+
+
+def _name(rng, *suffix):
+    return ' '.join((rng.choice(_WORDS), rng.choice(_WORDS)) + suffix)
+
+
+def _wrap_longitude(longitude):
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def _clamp_latitude(latitude):
+    return max(-89.9, min(89.9, latitude))
+
+
+class _Generator:
+    def __init__(self, connection, scale, rng):
+        self._conn = connection
+        self._rng = rng
+        self._counts = {table: max(1, round(count * scale)) for table, count in _WORLD_ROW_COUNTS.items()}
+        self._row_counts = {}
+        self._countries = []
+        self._regions = []
+
+    def generate(self):
+        self._insert('continent', [row[:3] for row in _CONTINENTS])
+        self._insert('country', self._generate_countries())
+        self._insert('region', self._generate_regions())
+        self._generate_airports()
+        return self._row_counts
+
+    def _insert(self, table, rows):
+        if rows:
+            self._conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(rows[0]))})", rows)
+            self._row_counts[table] = self._row_counts.get(table, 0) + len(rows)
+
+    def _generate_countries(self):
+        rows = []
+
+        for country_id in range(1, self._counts['country'] + 1):
+            continent_id, _, _, (latitude, longitude) = self._rng.choice(_CONTINENTS)
+            code = _code(country_id - 1, 2)
+            center = (_clamp_latitude(self._rng.gauss(latitude, 12.0)),
+                      _wrap_longitude(self._rng.gauss(longitude, 20.0)))
+            self._countries.append((country_id, code, continent_id, center))
+            rows.append((country_id, code, _name(self._rng), continent_id,
+                         f'https://en.wikipedia.org/wiki/Country_{code}', None))
+
+        return rows
+
+    def _generate_regions(self):
+        rows = []
+
+        for region_id in range(1, self._counts['region'] + 1):
+            country_id, country_code, continent_id, (latitude, longitude) = self._rng.choice(self._countries)
+            local_code = _code(region_id - 1, 3)
+            center = (_clamp_latitude(self._rng.gauss(latitude, 4.0)),
+                      _wrap_longitude(self._rng.gauss(longitude, 6.0)))
+            self._regions.append((region_id, country_id, country_code, continent_id, center))
+            rows.append((region_id, f'{country_code}-{local_code}', local_code,
+                         _name(self._rng, 'Province'), continent_id, country_id, None, None))
+
+        return rows
+
+    def _generate_airports(self):
+        types = [airport_type for airport_type, *_ in _AIRPORT_TYPES]
+        weights = [share for _, share, *_ in _AIRPORT_TYPES]
+        details = {airport_type: details for airport_type, _, *details in _AIRPORT_TYPES}
+        total = self._counts['airport']
+        ids = {'runway': 0, 'airport_frequency': 0, 'navigation_aid': 0}
+
+        for start in range(0, total, _CHUNK_SIZE):
+            airports, runways, frequencies, navigation_aids = [], [], [], []
+            chunk_types = self._rng.choices(types, weights, k = min(_CHUNK_SIZE, total - start))
+
+            for offset, airport_type in enumerate(chunk_types):
+                airport_id = start + offset + 1
+                suffix, lengths, (runway_rate, frequency_rate, navigation_aid_rate) = details[airport_type]
+                airport = self._airport(airport_id, airport_type, suffix)
+                airports.append(airport)
+
+                for _ in range(self._count(runway_rate)):
+                    ids['runway'] += 1
+                    runways.append(self._runway(ids['runway'], airport, airport_type, lengths))
+
+                for _ in range(self._count(frequency_rate)):
+                    ids['airport_frequency'] += 1
+                    frequencies.append(self._frequency(ids['airport_frequency'], airport_id))
+
+                for _ in range(self._count(navigation_aid_rate)):
+                    ids['navigation_aid'] += 1
+                    navigation_aids.append(self._navigation_aid(ids['navigation_aid'], airport))
+
+            self._insert('airport', airports)
+            self._insert('runway', runways)
+            self._insert('airport_frequency', frequencies)
+            self._insert('navigation_aid', navigation_aids)
+            print(f'airport: {start + len(chunk_types):,} of {total:,} rows', file = sys.stderr)
+
+    def _count(self, rate):
+        # A whole number of rows averaging the given rate.
+        whole = int(rate)
+        return whole + (self._rng.random() < rate - whole)
+
+    def _airport(self, airport_id, airport_type, suffix):
+        rng = self._rng
+        region_id, country_id, country_code, continent_id, (latitude, longitude) = rng.choice(self._regions)
+        ident = f'{country_code}-{airport_id}'
+        is_scheduled = airport_type in ('medium_airport', 'large_airport')
+
+        return (airport_id, ident, airport_type, _name(rng, suffix),
+                _clamp_latitude(rng.gauss(latitude, 1.5)), _wrap_longitude(rng.gauss(longitude, 2.0)),
+                rng.randrange(-50, 12_000), str(continent_id), country_id, region_id,
+                _name(rng), int(is_scheduled), ident, _code(airport_id, 3) if is_scheduled else None,
+                None, None, None, rng.choice(_WORDS) if rng.random() < 0.2 else None)
+
+    def _runway(self, runway_id, airport, airport_type, lengths):
+        rng = self._rng
+        heading = rng.randrange(1, 19)
+        latitude, longitude = airport[4], airport[5]
+
+        return (runway_id, airport[0], rng.randrange(*lengths), rng.randrange(20, 200),
+                rng.choice(_SURFACES), int(rng.random() < 0.4), int(airport_type == 'closed'),
+                f'{heading:02}', latitude, longitude, airport[6], heading * 10.0, None,
+                f'{heading + 18:02}', latitude + 0.01, longitude + 0.01, airport[6],
+                heading * 10.0 + 180.0, None)
+
+    def _frequency(self, frequency_id, airport_id):
+        frequency_type = self._rng.choice(_FREQUENCY_TYPES)
+        return (frequency_id, airport_id, frequency_type, frequency_type,
+                round(self._rng.uniform(108.0, 137.0), 3))
+
+    def _navigation_aid(self, navigation_aid_id, airport):
+        rng = self._rng
+        ident = _code(navigation_aid_id, 3)
+        latitude = _clamp_latitude(airport[4] + rng.gauss(0.0, 0.2))
+        longitude = _wrap_longitude(airport[5] + rng.gauss(0.0, 0.2))
+
+        return (navigation_aid_id, f'{ident}_{airport[1]}', ident, _name(rng), rng.choice(_NAVIGATION_AID_TYPES),
+                rng.randrange(190, 1_750) * 100, latitude, longitude, airport[6],
+                airport[1][:2], None, None, None, None, None, None, round(rng.uniform(-20.0, 20.0), 1),
+                rng.choice(['HI', 'LO', 'BOTH', 'TERMINAL']), rng.choice(['HIGH', 'MEDIUM', 'LOW']),
+                airport[0] if rng.random() < 0.5 else None)
+
+
+def generate(path, scale = 1.0, seed = 33):
+    """Creates a database at the given path, which must not exist yet, and fills it
+    with synthetic data at the given scale.  Returns the number of rows in each
+    table."""
+    connection = sqlite3.connect(path)
+
+    try:
+        connection.executescript(_SCHEMA_PATH.read_text())
+
+        for pragma in _TUNING_PRAGMAS:
+            connection.execute(pragma)
+
+        with connection:
+            return _Generator(connection, scale, random.Random(seed)).generate()
+    finally:
+        connection.close()
+
+
+def main():
+    arguments = _parse_arguments()
+
+    if arguments.database.exists():
+        print(f'{arguments.database} already exists')
+        sys.exit(1)
+
+    start = time.perf_counter()
+    row_counts = generate(arguments.database, arguments.scale, arguments.seed)
+    print(f'Generated {sum(row_counts.values()):,} rows in {time.perf_counter() - start:.1f}s')
+
+    for table, count in row_counts.items():
+        print(f'  {table}: {count:,}')
+
+    if arguments.check:
+        connection = sqlite3.connect(arguments.database)
+        violations = connection.execute("PRAGMA foreign_key_check").fetchall()
+        connection.close()
+        print(f'Foreign key violations: {len(violations)}')
+        sys.exit(1 if violations else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# headless.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Runs the engine without the user interface, for batch jobs (such as nightly
+# maintenance) and load tests on machines without a display.  Events are read
+# from a file, or from standard input, one per line in the JSON format of
+# p2app.events.serialization, e.g.
+#
+#     {"$type": "OpenDatabaseEvent", "path": "airports.db"}
+#     {"$type": "StartRegionSearchEvent", "region_code": null, "local_code": "CA", "name": null}
+#
+# and passed through the event bus to the engine as fast as it takes them.  The
+# events it sends back are written to standard output (or a file) in the same
+# format.  A line that isn't a valid event is answered with an ErrorEvent.
+#
+# Usage: python headless.py [EVENTS_PATH] [--output PATH] [--database PATH]
+#                           [--read-pool-size N] [--statistics PATH] [--record PATH]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from p2app import EventBus
+from p2app.engine import Engine, EngineConfig
+from p2app.events import *
+from p2app.events.serialization import event_from_json, event_to_json
+
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Runs the engine on events read from a file.')
+    parser.add_argument(
+        'events', nargs = '?', type = argparse.FileType('r', encoding = 'utf-8'), default = sys.stdin,
+        help = 'the file of events to process, one JSON object per line (default: standard input)')
+    parser.add_argument(
+        '--output', type = argparse.FileType('w', encoding = 'utf-8'), default = sys.stdout,
+        help = 'where to write the resulting events (default: standard output)')
+    parser.add_argument(
+        '--database', type = Path, help = 'open this database before the first event')
+    parser.add_argument(
+        '--read-pool-size', metavar = 'N', type = int, default = 0,
+        help = 'open databases in WAL mode with N read-only connections')
+    parser.add_argument(
+        '--statistics', metavar = 'PATH', type = Path,
+        help = 'record per-event-class statistics and write them to this file at the end')
+    parser.add_argument(
+        '--record', metavar = 'PATH', type = Path,
+        help = 'append the events sent to the engine to this recording')
+    return parser.parse_args()
+
+
+
+class JsonLinesSink:
+    """Takes the place of the user interface, writing each event the event bus
+    delivers to a file as a line of JSON."""
+
+    def __init__(self, output):
+        self._output = output
+        self._result_count = 0
+        self._is_ended = False
+
+
+    def handle_event(self, event):
+        self._output.write(event_to_json(event))
+        self._output.write('\n')
+        self._result_count += 1
+
+        if isinstance(event, EndApplicationEvent):
+            self._is_ended = True
+
+
+    def flush(self):
+        self._output.flush()
+
+
+    def result_count(self) -> int:
+        return self._result_count
+
+
+    def is_ended(self) -> bool:
+        return self._is_ended
+
+
+
+def _process(lines, event_bus, sink):
+    """Sends the event on each line to the bus until the lines run out or the engine
+    ends the application, returning how many events were sent and how many lines
+    were invalid."""
+    event_count = 0
+    invalid_count = 0
+
+    for line_number, line in enumerate(lines, start = 1):
+        if not line.strip():
+            continue
+
+        try:
+            event = event_from_json(line)
+        except ValueError as e:
+            sink.handle_event(ErrorEvent(f'Line {line_number}: {e}'))
+            invalid_count += 1
+        else:
+            event_bus.initiate_event(event)
+            event_count += 1
+
+        # Results are written as each event finishes, so that a program feeding
+        # events through a pipe sees them without waiting for the input to end.
+        sink.flush()
+
+        if sink.is_ended():
+            break
+
+    return event_count, invalid_count
+
+
+
+def main():
+    arguments = _parse_arguments()
+    event_bus = EventBus()
+    sink = JsonLinesSink(arguments.output)
+
+    event_bus.register_engine(Engine(EngineConfig(read_pool_size = arguments.read_pool_size)))
+    event_bus.register_view(sink)
+
+    if arguments.statistics:
+        event_bus.enable_instrumentation()
+
+    if arguments.record:
+        event_bus.start_recording(arguments.record)
+
+    if arguments.database:
+        event_bus.initiate_event(OpenDatabaseEvent(arguments.database))
+
+    start = time.perf_counter()
+    event_count, invalid_count = _process(arguments.events, event_bus, sink)
+    seconds = time.perf_counter() - start
+
+    event_bus.stop_recording()
+
+    if arguments.statistics:
+        event_bus.statistics().dump(arguments.statistics)
+
+    print(f'{event_count} events, {sink.result_count()} results in {seconds:.3f} seconds'
+          f' ({event_count / seconds if seconds else 0:,.0f} events/s)', file = sys.stderr)
+
+    if invalid_count:
+        print(f'{invalid_count} lines were not valid events', file = sys.stderr)
+        sys.exit(1)
+
+
+
+if __name__ == '__main__':
+    main()
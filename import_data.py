@@ -0,0 +1,71 @@
+# import_data.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Bulk-loads the OurAirports CSV files (countries.csv, regions.csv, airports.csv,
+# airport-frequencies.csv, runways.csv, navaids.csv and, optionally,
+# continents.csv) from a directory into a database, creating the database from
+# schema.sql if it does not exist yet.
+#
+# Usage: python import_data.py DATABASE_PATH CSV_DIRECTORY
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from p2app.engine.importer import import_directory
+from p2app.events import *
+
+
+
+_SCHEMA_PATH = Path(__file__).resolve().parent / 'schema.sql'
+
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Import OurAirports CSV files into a database.')
+    parser.add_argument('database', type = Path, help = 'the database to import into')
+    parser.add_argument('directory', type = Path, help = 'the directory containing the CSV files')
+    return parser.parse_args()
+
+
+
+def _create_schema_if_empty(connection):
+    table_count, = connection.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()
+
+    if table_count == 0:
+        connection.executescript(_SCHEMA_PATH.read_text())
+
+
+
+def main():
+    arguments = _parse_arguments()
+    connection = sqlite3.connect(arguments.database)
+    _create_schema_if_empty(connection)
+    start = time.perf_counter()
+    succeeded = False
+
+    for event in import_directory(connection, arguments.directory):
+        if isinstance(event, ImportProgressEvent):
+            print(f'{event.table()}: {event.rows():,} rows')
+        elif isinstance(event, ImportCompletedEvent):
+            print(f'Imported {sum(event.row_counts().values()):,} rows '
+                  f'in {time.perf_counter() - start:.1f}s')
+
+            for table, skipped in event.skipped_counts().items():
+                if skipped:
+                    print(f'  skipped {skipped:,} {table} rows with unknown references')
+
+            succeeded = True
+        elif isinstance(event, ImportFailedEvent):
+            print(f'Import failed: {event.reason()}')
+
+    connection.close()
+    raise SystemExit(0 if succeeded else 1)
+
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,9 @@
 #
 # Initialization module for the p2app.engine package.
 #
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
+# Importing a manager module registers its handlers with the engine, so support
+# for another table only needs its module listed here.
 
+from .config import EngineConfig
 from .main import Engine
+from . import airports, continents, countries, exporter, navigation_aids, regions
@@ -0,0 +1,208 @@
+# airports.py
+
+
+import sqlite3
+from p2app.events import *
+from . import distances, routes
+from .cache import EntityCache
+from .distances import DistanceCalculator, is_available
+from .registry import handles, manager
+from .routes import RoutePlanner
+from .spatial import SpatialIndex, spatial_index_statements
+from .streaming import SearchStream
+from .text_search import TextIndex, match_expression, text_index_statements
+
+
+_COLUMNS = Airport._fields[1:]
+
+# Statement table for the airport manager; see continents.py.
+_TEXT_COLUMNS = ('name', 'keywords')
+_TEXT_INDEX, _TEXT_STATEMENTS = text_index_statements('airport', 'airport_id', _TEXT_COLUMNS)
+_SPATIAL_INDEX, _SPATIAL_STATEMENTS = spatial_index_statements('airport', 'airport_id')
+_LOAD = "SELECT * FROM airport WHERE airport_id = ?"
+_INSERT = f"INSERT INTO airport ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+_UPDATE = f"UPDATE airport SET {', '.join(f'{column} = ?' for column in _COLUMNS)} WHERE airport_id = ?"
+
+STATEMENTS = (_LOAD, _INSERT, _UPDATE, *_TEXT_STATEMENTS, *_SPATIAL_STATEMENTS,
+              *distances.STATEMENTS, *routes.STATEMENTS)
+TEMP_TABLES = (_TEXT_INDEX, _SPATIAL_INDEX)
+
+
+def _insert_parameters(airport):
+    return airport[1:]
+
+
+def _update_parameters(airport):
+    return (*airport[1:], airport.airport_id)
+
+
+def _position(row):
+    return row[4], row[5]
+
+
+def _is_in_box(latitude, longitude, min_latitude, min_longitude, max_latitude, max_longitude):
+    if not min_latitude <= latitude <= max_latitude:
+        return False
+    elif min_longitude <= max_longitude:
+        return min_longitude <= longitude <= max_longitude
+    else:
+        return longitude >= min_longitude or longitude <= max_longitude
+
+
+@manager
+class AirportManager:
+    def __init__(self, connection, config):
+        self._conn = connection
+        self._cursor = connection.cursor()
+        self._searches = SearchStream(connection, config.search_batch_size)
+        self._cache = EntityCache('airport', config.entity_cache_size)
+        self._text_index = TextIndex(connection, 'airport', 'airport_id', _TEXT_COLUMNS)
+        self._spatial_index = SpatialIndex(connection, 'airport', 'airport_id')
+        self._distances = DistanceCalculator(connection, config.distance_block_size)
+        self._routes = RoutePlanner(connection, config.route_graph_cache_size)
+
+    def close(self):
+        self._searches.close()
+        self._cursor.close()
+
+    def refresh(self, table, row_ids):
+        """Brings the caches and indexes up to date with rows of the given table that
+        another connection changed."""
+        if table == 'airport':
+            for airport_id in row_ids:
+                self._cache.invalidate(airport_id)
+                self._text_index.update(airport_id)
+                self._spatial_index.update(airport_id)
+                self._distances.update(airport_id)
+
+        if table in ('airport', 'runway'):
+            self._routes.invalidate()
+
+    def cache_statistics(self):
+        return self._cache.statistics()
+
+    def _remember(self, row):
+        _airport = Airport(*row)
+        self._cache.put(_airport.airport_id, _airport)
+        return _airport
+
+    def _lookup(self, airport_id):
+        _airport = self._cache.get(airport_id)
+
+        if _airport is None:
+            self._cursor.execute(_LOAD, (airport_id,))
+            row = self._cursor.fetchone()
+
+            if row:
+                _airport = self._remember(row)
+
+        return _airport
+
+    @handles(StartAirportTextSearchEvent, read_only=True)
+    def start_airport_text_search(self, event):
+        expression = match_expression(event.text(), event.prefix())
+
+        if expression is not None:
+            query = self._text_index.search_statement()
+
+            for row in self._searches.rows(query, (expression,)):
+                yield AirportSearchResultEvent(self._remember(row))
+
+    @handles(StartAirportBoxSearchEvent, read_only=True)
+    def start_airport_box_search(self, event):
+        box = event.min_latitude(), event.min_longitude(), event.max_latitude(), event.max_longitude()
+
+        for query, parameters in self._spatial_index.box_queries(*box):
+            for row in self._searches.rows(query, parameters):
+                # The R*Tree's 32-bit coordinates can admit points just outside the box.
+                if _is_in_box(*_position(row), *box):
+                    yield AirportSearchResultEvent(self._remember(row))
+
+    @handles(StartNearestAirportsSearchEvent, read_only=True)
+    def start_nearest_airports_search(self, event):
+        nearest = self._spatial_index.nearest(event.latitude(), event.longitude(), event.count())
+
+        for distance, airport_id in nearest:
+            _airport = self._lookup(airport_id)
+
+            if _airport:
+                yield NearestAirportResultEvent(_airport, distance)
+
+    @handles(CalculateDistanceMatrixEvent, read_only=True)
+    def calculate_distance_matrix(self, event):
+        if not is_available():
+            yield DistanceCalculationFailedEvent('Distance calculations require NumPy')
+            return
+
+        try:
+            distances_km = self._distances.matrix(event.airport_ids())
+            yield DistanceMatrixCalculatedEvent(event.airport_ids(), distances_km)
+        except KeyError as e:
+            yield DistanceCalculationFailedEvent(e.args[0])
+
+    @handles(FindAirportPairsWithinEvent, read_only=True)
+    def find_airport_pairs_within(self, event):
+        if not is_available():
+            yield DistanceCalculationFailedEvent('Distance calculations require NumPy')
+            return
+
+        try:
+            for pairs in self._distances.pairs_within(event.max_distance_km(), event.airport_ids()):
+                yield AirportPairsFoundEvent(pairs)
+        except KeyError as e:
+            yield DistanceCalculationFailedEvent(e.args[0])
+
+    @handles(FindRouteEvent, read_only=True)
+    def find_route(self, event):
+        graph = self._routes.graph(event.max_range_km(), event.min_runway_length_ft())
+        start_id = event.from_airport_id()
+        goal_id = event.to_airport_id()
+
+        if start_id not in graph or goal_id not in graph:
+            yield RouteNotFoundEvent('Both airports need an open runway of the minimum length')
+            return
+
+        path = graph.shortest_path(start_id, goal_id)
+
+        if path is None:
+            yield RouteNotFoundEvent("No route is possible within the aircraft's range")
+        else:
+            legs = [graph.distance_km(*leg) for leg in zip(path, path[1:])]
+            yield RouteFoundEvent([self._lookup(airport_id) for airport_id in path], legs)
+
+    @handles(LoadAirportEvent, read_only=True)
+    def load_airport(self, event):
+        _airport = self._lookup(event.airport_id())
+
+        if _airport:
+            yield AirportLoadedEvent(_airport)
+
+    @handles(SaveNewAirportEvent)
+    def save_new_airport(self, event):
+        _airport = event.airport()
+        try:
+            self._cursor.execute(_INSERT, _insert_parameters(_airport))
+            airport_id = self._cursor.lastrowid
+            self._text_index.update(airport_id)
+            self._spatial_index.update(airport_id)
+            self._conn.commit()
+            self._distances.update(airport_id)
+            self._routes.invalidate()
+            yield AirportSavedEvent(_airport)
+        except sqlite3.Error as e:
+            yield SaveAirportFailedEvent(str(e))
+
+    @handles(SaveAirportEvent)
+    def save_airport(self, event):
+        _airport = event.airport()
+        try:
+            self._cursor.execute(_UPDATE, _update_parameters(_airport))
+            self._text_index.update(_airport.airport_id)
+            self._spatial_index.update(_airport.airport_id)
+            self._conn.commit()
+            self._distances.update(_airport.airport_id)
+            self._routes.invalidate()
+            self._cache.invalidate(_airport.airport_id)
+            yield AirportSavedEvent(_airport)
+        except sqlite3.Error as e:
+            yield SaveAirportFailedEvent(str(e))
@@ -0,0 +1,39 @@
+# batches.py
+
+
+import sqlite3
+
+
+def save_batch(connection, statements):
+    """Runs each (statement, rows) pair with executemany() in one transaction.
+
+    Rows are (position, parameters) pairs, where position identifies the row in the
+    batch the caller received.  If every row succeeds the transaction is committed
+    and an empty list is returned.  Otherwise nothing is kept, and the rows are
+    replayed one at a time (then rolled back again) to find each failing row,
+    returning a list of (position, reason) pairs in batch order.  If no row fails
+    on its own (say, because the commit failed), the list is a single pair whose
+    position is None, with the reason the batch failed."""
+    try:
+        for statement, rows in statements:
+            connection.executemany(statement, [parameters for _, parameters in rows])
+
+        connection.commit()
+        return []
+    except sqlite3.Error as e:
+        batch_reason = str(e)
+        connection.rollback()
+
+    failures = []
+
+    try:
+        for statement, rows in statements:
+            for position, parameters in rows:
+                try:
+                    connection.execute(statement, parameters)
+                except sqlite3.Error as e:
+                    failures.append((position, str(e)))
+    finally:
+        connection.rollback()
+
+    return sorted(failures) if failures else [(None, batch_reason)]
@@ -0,0 +1,101 @@
+# cache.py
+
+
+from collections import OrderedDict
+
+
+class EntityCache:
+    """A least-recently-used cache of the rows of one table, keyed by id.  Rows are
+    namedtuples, so cached rows can be handed out without copying."""
+
+    def __init__(self, table, capacity):
+        self._table = table
+        self._capacity = capacity
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, entity_id):
+        """Returns the cached row with the given id, or None."""
+        entity = self._entries.get(entity_id)
+
+        if entity is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._entries.move_to_end(entity_id)
+
+        return entity
+
+    def put(self, entity_id, entity):
+        if self._capacity == 0:
+            return
+
+        self._entries[entity_id] = entity
+        self._entries.move_to_end(entity_id)
+
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, entity_id):
+        self._entries.pop(entity_id, None)
+
+    def statistics(self):
+        return {
+            'table': self._table,
+            'size': len(self._entries),
+            'hits': self._hits,
+            'misses': self._misses
+        }
+
+
+class QueryCache:
+    """A least-recently-used cache of the ids found by searches of one table, keyed
+    by the normalized search criteria.  Every save to the table bumps its generation,
+    which makes all earlier entries stale without having to find them."""
+
+    def __init__(self, table, capacity, max_ids):
+        self._table = table
+        self._capacity = capacity
+        self._max_ids = max_ids
+        self._generation = 0
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def generation(self):
+        return self._generation
+
+    def bump(self):
+        self._generation += 1
+
+    def get(self, key):
+        """Returns the list of ids found by the search with the given key, or None if
+        it is not cached or the table has been saved to since."""
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] != self._generation:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, generation, ids):
+        """Caches the ids found by a search that started at the given generation.
+        Results too long to be served from the entity cache are not kept."""
+        if generation == self._generation and len(ids) <= self._max_ids:
+            self._entries[key] = (generation, ids)
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def statistics(self):
+        return {
+            'table': self._table,
+            'size': len(self._entries),
+            'hits': self._hits,
+            'misses': self._misses
+        }
@@ -0,0 +1,24 @@
+# config.py
+#
+# Tunable settings shared by the engine and its managers.
+
+from collections import namedtuple
+
+
+EngineConfig = namedtuple(
+    'EngineConfig',
+    ['search_batch_size', 'export_batch_size', 'entity_cache_size', 'query_cache_size',
+     'distance_block_size', 'route_graph_cache_size', 'create_recommended_indexes',
+     'read_pool_size'],
+    defaults=[500, 5000, 2048, 256, 1 << 20, 4, False, 0])
+
+EngineConfig.__annotations__ = {
+    'search_batch_size': int,
+    'export_batch_size': int,
+    'entity_cache_size': int,
+    'query_cache_size': int,
+    'distance_block_size': int,
+    'route_graph_cache_size': int,
+    'create_recommended_indexes': bool,
+    'read_pool_size': int
+}
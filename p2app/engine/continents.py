@@ -1,59 +1,108 @@
 # continents.py
 
 
-import sqlite3
+import itertools
 from p2app.events import *
+from .registry import handles, manager
+from .streaming import page_statement
+from .tables import TableManager
+from .text_search import match_expression, text_index_statements
 
 
-class ContinentManager:
-    def __init__(self, connection):
-        self._conn = connection
+_SEARCH_COLUMNS = ('continent_code', 'name')
 
+
+def _search_condition(key):
+    # A criterion that isn't given could only match "= NULL", which nothing does,
+    # so it is left out, letting a search by code alone use the code's unique
+    # index.  A search with neither matches nothing; it says so in a way that
+    # searches that index too, rather than one that the index advisor sees as a
+    # scan of the whole table.
+    conditions = [f"{column} = ?" for column, used in zip(_SEARCH_COLUMNS, key) if used]
+    return ' AND '.join(conditions) if conditions else f"{_SEARCH_COLUMNS[0]} = NULL"
+
+
+# The statement table for every query shape the continent manager issues, keyed
+# by a tuple of booleans telling which criteria (in _SEARCH_COLUMNS order) are
+# given.  The strings never change, so sqlite3's per-connection statement cache
+# compiles each one once and reuses the prepared statement for the rest of the
+# session.
+_SEARCHES = {
+    key: f"SELECT * FROM continent WHERE {_search_condition(key)}"
+    for key in itertools.product((False, True), repeat=len(_SEARCH_COLUMNS))
+}
+_PAGES = {
+    (key, is_continued): page_statement('continent', 'continent_id', _search_condition(key), is_continued)
+    for key in itertools.product((False, True), repeat=len(_SEARCH_COLUMNS))
+    for is_continued in (False, True)
+}
+_TEXT_COLUMNS = ('name',)
+_TEXT_INDEX, _TEXT_STATEMENTS = text_index_statements('continent', 'continent_id', _TEXT_COLUMNS)
+_LOAD = "SELECT * FROM continent WHERE continent_id = ?"
+_INSERT = "INSERT INTO continent (continent_code, name) VALUES (?, ?)"
+_UPDATE = "UPDATE continent SET continent_code = ?, name = ? WHERE continent_id = ?"
+
+STATEMENTS = (*_SEARCHES.values(), *_PAGES.values(), _LOAD, _INSERT, _UPDATE, *_TEXT_STATEMENTS)
+
+# The temp tables the statements above use, which the index advisor creates
+# (if they don't exist yet) to check the statements' plans.
+TEMP_TABLES = (_TEXT_INDEX,)
+
+
+@manager
+class ContinentManager(TableManager):
+    table = 'continent'
+    id_column = 'continent_id'
+    row_type = Continent
+    text_columns = _TEXT_COLUMNS
+    columns = ('continent_code', 'name')
+
+    load_statement = _LOAD
+    insert_statement = _INSERT
+    update_statement = _UPDATE
+    page_statements = _PAGES
+
+    result_event = ContinentSearchResultEvent
+    results_event = ContinentSearchResultsEvent
+    more_results_event = MoreContinentSearchResultsEvent
+    no_more_results_event = NoMoreContinentSearchResultsEvent
+    saved_event = ContinentSavedEvent
+    save_failed_event = SaveContinentFailedEvent
+
+    @handles(StartContinentSearchEvent, read_only=True)
     def start_continent_search(self, event):
-        search_criteria = event.continent_code(), event.name()
+        continent_code, name = criteria = event.continent_code(), event.name()
+        key = continent_code is not None, name is not None
+        search_criteria = [value for value in criteria if value is not None]
 
-        if event.continent_code() is None or event.name() is None:
-            query = "SELECT * FROM continent WHERE continent_code = ? OR name = ?"
+        if event.page_size() is not None:
+            yield from self._page(event, key, criteria, search_criteria)
         else:
-            query = "SELECT * FROM continent WHERE continent_code = ? AND name = ?"
+            continents = self._search(('equal', *criteria), _SEARCHES[key], search_criteria)
+            yield from self._results(event, continents)
 
-        cursor = self._conn.cursor()
-        cursor.execute(query, search_criteria)
-        _continents = cursor.fetchall()
-        cursor.close()
-        for continent in _continents:
-            yield ContinentSearchResultEvent(Continent(*continent))
+    @handles(StartContinentTextSearchEvent, read_only=True)
+    def start_continent_text_search(self, event):
+        expression = match_expression(event.text(), event.prefix())
 
+        if expression is not None:
+            yield from self._results(event, self._text_search(expression))
+
+    @handles(LoadContinentEvent, read_only=True)
     def load_continent(self, event):
-        continent_id = event.continent_id()
-        query = "SELECT * FROM continent WHERE continent_id = ?"
-        cursor = self._conn.cursor()
-        cursor.execute(query, (continent_id,))
-        _continent = cursor.fetchone()
-        cursor.close()
+        _continent = self._lookup(event.continent_id())
+
         if _continent:
-            yield ContinentLoadedEvent(Continent(*_continent))
+            yield ContinentLoadedEvent(_continent)
 
+    @handles(SaveNewContinentEvent)
     def save_new_continent(self, event):
-        _continent = event.continent()
-        try:
-            query = "INSERT INTO continent (continent_code, name) VALUES (?, ?)"
-            cursor = self._conn.cursor()
-            cursor.execute(query, (_continent.continent_code, _continent.name))
-            self._conn.commit()
-            cursor.close()
-            yield ContinentSavedEvent(_continent)
-        except sqlite3.Error as e:
-            yield SaveContinentFailedEvent(str(e))
+        yield from self._save_new(event.continent())
 
+    @handles(SaveContinentEvent)
     def save_continent(self, event):
-        _continent = event.continent()
-        try:
-            query = "UPDATE continent SET continent_code = ?, name = ? WHERE continent_id = ?"
-            cursor = self._conn.cursor()
-            cursor.execute(query, (_continent.continent_code, _continent.name, _continent.continent_id))
-            self._conn.commit()
-            cursor.close()
-            yield ContinentSavedEvent(_continent)
-        except sqlite3.Error as e:
-            yield SaveContinentFailedEvent(str(e))
+        yield from self._save(event.continent())
+
+    @handles(SaveContinentBatchEvent)
+    def save_continent_batch(self, event):
+        yield from self._save_batch(event.continents())
@@ -1,62 +1,98 @@
 # countries.py
 
 
-import sqlite3
+import itertools
 from p2app.events import *
+from .registry import handles, manager
+from .streaming import page_statement
+from .tables import TableManager
+from .text_search import match_expression, text_index_statements
 
 
-class CountryManager:
-    def __init__(self, connection):
-        self._conn = connection
+_SEARCH_COLUMNS = ('country_code', 'name')
 
+
+def _search_condition(key):
+    conditions = [f"{column} = ?" for column, used in zip(_SEARCH_COLUMNS, key) if used]
+    return ' AND '.join(conditions) if conditions else f"{_SEARCH_COLUMNS[0]} = NULL"
+
+
+# Statement table for the country manager; see continents.py.
+_SEARCHES = {
+    key: f"SELECT * FROM country WHERE {_search_condition(key)}"
+    for key in itertools.product((False, True), repeat=len(_SEARCH_COLUMNS))
+}
+_PAGES = {
+    (key, is_continued): page_statement('country', 'country_id', _search_condition(key), is_continued)
+    for key in itertools.product((False, True), repeat=len(_SEARCH_COLUMNS))
+    for is_continued in (False, True)
+}
+_TEXT_COLUMNS = ('name', 'keywords')
+_TEXT_INDEX, _TEXT_STATEMENTS = text_index_statements('country', 'country_id', _TEXT_COLUMNS)
+_LOAD = "SELECT * FROM country WHERE country_id = ?"
+_INSERT = ("INSERT INTO country (country_code, name, continent_id, wikipedia_link) "
+           "VALUES (?, ?, ?, ?)")
+_UPDATE = ("UPDATE country SET country_code = ?, name = ?, continent_id = ?, wikipedia_link = ? "
+           "WHERE country_id = ?")
+
+STATEMENTS = (*_SEARCHES.values(), *_PAGES.values(), _LOAD, _INSERT, _UPDATE, *_TEXT_STATEMENTS)
+TEMP_TABLES = (_TEXT_INDEX,)
+
+
+@manager
+class CountryManager(TableManager):
+    table = 'country'
+    id_column = 'country_id'
+    row_type = Country
+    text_columns = _TEXT_COLUMNS
+    columns = ('country_code', 'name', 'continent_id', 'wikipedia_link')
+
+    load_statement = _LOAD
+    insert_statement = _INSERT
+    update_statement = _UPDATE
+    page_statements = _PAGES
+
+    result_event = CountrySearchResultEvent
+    results_event = CountrySearchResultsEvent
+    more_results_event = MoreCountrySearchResultsEvent
+    no_more_results_event = NoMoreCountrySearchResultsEvent
+    saved_event = CountrySavedEvent
+    save_failed_event = SaveCountryFailedEvent
+
+    @handles(StartCountrySearchEvent, read_only=True)
     def start_country_search(self, event):
-        search_criteria = event.country_code(), event.name()
+        country_code, name = criteria = event.country_code(), event.name()
+        key = country_code is not None, name is not None
+        search_criteria = [value for value in criteria if value is not None]
 
-        if event.country_code() is None or event.name() is None:
-            query = "SELECT * FROM country WHERE country_code = ? OR name = ?"
+        if event.page_size() is not None:
+            yield from self._page(event, key, criteria, search_criteria)
         else:
-            query = "SELECT * FROM country WHERE country_code = ? AND name = ?"
+            countries = self._search(('equal', *criteria), _SEARCHES[key], search_criteria)
+            yield from self._results(event, countries)
 
-        cursor = self._conn.cursor()
-        cursor.execute(query, search_criteria)
-        _countries = cursor.fetchall()
-        cursor.close()
-        for country in _countries:
-            yield CountrySearchResultEvent(Country(*country))
+    @handles(StartCountryTextSearchEvent, read_only=True)
+    def start_country_text_search(self, event):
+        expression = match_expression(event.text(), event.prefix())
 
+        if expression is not None:
+            yield from self._results(event, self._text_search(expression))
+
+    @handles(LoadCountryEvent, read_only=True)
     def load_country(self, event):
-        country_id = event.country_id()
-        query = "SELECT * FROM country WHERE country_id = ?"
-        cursor = self._conn.cursor()
-        cursor.execute(query, (country_id,))
-        _country = cursor.fetchone()
-        cursor.close()
+        _country = self._lookup(event.country_id())
+
         if _country:
-            yield CountryLoadedEvent(Country(*_country))
+            yield CountryLoadedEvent(_country)
 
+    @handles(SaveNewCountryEvent)
     def save_new_country(self, event):
-        _country = event.country()
-        try:
-            query = "INSERT INTO country (country_code, name, continent_id, wikipedia_link) VALUES (?, ?, ?, ?)"
-            cursor = self._conn.cursor()
-            cursor.execute(query, (_country.country_code, _country.name,
-                                   _country.continent_id, _country.wikipedia_link))
-            self._conn.commit()
-            cursor.close()
-            yield CountrySavedEvent(_country)
-        except sqlite3.Error as e:
-            yield SaveCountryFailedEvent(str(e))
+        yield from self._save_new(event.country())
 
+    @handles(SaveCountryEvent)
     def save_country(self, event):
-        _country = event.country()
-        try:
-            query = ("UPDATE country SET country_code = ?, name = ?, continent_id = ?, wikipedia_link = ?"
-                     "WHERE country_id = ?")
-            cursor = self._conn.cursor()
-            cursor.execute(query, (_country.country_code, _country.name, _country.continent_id,
-                                   _country.wikipedia_link, _country.country_id))
-            self._conn.commit()
-            cursor.close()
-            yield CountrySavedEvent(_country)
-        except sqlite3.Error as e:
-            yield SaveCountryFailedEvent(str(e))
+        yield from self._save(event.country())
+
+    @handles(SaveCountryBatchEvent)
+    def save_country_batch(self, event):
+        yield from self._save_batch(event.countries())
@@ -3,24 +3,100 @@
 
 import sqlite3
 from p2app.events import *
+from .indexes import IndexAdvisor
+from .pool import ReaderPool, WriterConnection
+
+
+# Large enough to keep every statement in the managers' statement tables prepared
+# for the lifetime of the connection.
+_CACHED_STATEMENTS = 256
 
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, config):
+        self._config = config
         self._conn = None
+        self._readers = None
         self.path = None
 
     def open_database(self, event):
+        """Opens the database, then either creates the recommended indexes it lacks
+        (if so configured) or reports what creating them would cost.  Once it has
+        every recommended index, warns about any of the engine's queries that would
+        still scan a whole table; until then, the recommendation covers them."""
         try:
+            self.close_database()
             self.path = event.path()
-            self._conn = sqlite3.connect(self.path)
+            # The engine serializes its use of this connection itself, since in
+            # pooled mode events may arrive from more than one thread.
+            self._conn = sqlite3.connect(
+                self.path, cached_statements=_CACHED_STATEMENTS, check_same_thread=False,
+                factory=WriterConnection)
             self._conn.execute("PRAGMA foreign_keys = ON;")
-            yield DatabaseOpenedEvent(self.path)
+
+            if self._config.read_pool_size > 0:
+                self._open_readers()
+
+            advisor = IndexAdvisor(self._conn)
+
+            if self._config.create_recommended_indexes:
+                created = advisor.create_missing_indexes()
+                recommendation = None
+            else:
+                created = None
+                recommendation = advisor.recommendation()
+
+            if recommendation is None:
+                warnings = advisor.query_plan_warnings()
+            else:
+                warnings = []
         except sqlite3.Error as e:
+            self.close_database()
             yield DatabaseOpenFailedEvent(str(e))
+            return
+
+        yield DatabaseOpenedEvent(self.path)
+
+        if created is not None and created.index_names():
+            yield created
+
+        if recommendation is not None:
+            yield recommendation
+
+        yield from warnings
+
+    def _open_readers(self):
+        # Readers only run alongside the writer in WAL mode; a database that cannot
+        # use it (such as one in memory) keeps the single shared connection.
+        journal_mode = self._conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+
+        if journal_mode == 'wal':
+            # In WAL mode, NORMAL is still safe against corruption, and only syncs
+            # at checkpoints rather than on every commit.
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._readers = ReaderPool(
+                self._conn, self.path, self._config.read_pool_size, self._config, _CACHED_STATEMENTS)
+
+    def create_recommended_indexes(self):
+        yield IndexAdvisor(self._conn).create_missing_indexes()
+        yield from IndexAdvisor(self._conn).query_plan_warnings()
+
+    def close_database(self):
+        if self._readers is not None:
+            self._readers.close()
+            self._readers = None
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self.path = None
 
     def connection(self):
         return self._conn
 
+    def readers(self):
+        """Returns the ReaderPool of the open database, or None if it has none."""
+        return self._readers
+
     def database_path(self):
         return self.path
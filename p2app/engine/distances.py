@@ -0,0 +1,157 @@
+# distances.py
+#
+# Vectorized great-circle distances between airports.  NumPy is an optional
+# dependency: without it, the engine reports distance requests as failed.
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .geo import EARTH_RADIUS_KM
+
+
+_LOAD_ALL = "SELECT airport_id, latitude_deg, longitude_deg FROM airport ORDER BY airport_id"
+_LOAD = "SELECT latitude_deg, longitude_deg FROM airport WHERE airport_id = ?"
+
+STATEMENTS = (_LOAD_ALL, _LOAD)
+
+
+def is_available():
+    return numpy is not None
+
+
+def _haversine_block(latitudes1, longitudes1, cos1, latitudes2, longitudes2, cos2):
+    # Inputs are in radians, with the first three as columns and the last three as
+    # rows, so the result is a len(first) x len(second) block.
+    a = (numpy.sin((latitudes2 - latitudes1) / 2) ** 2
+         + cos1 * cos2 * numpy.sin((longitudes2 - longitudes1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+
+
+class DistanceCalculator:
+    """Airport coordinates held in contiguous NumPy arrays, sorted by airport id, for
+    computing distances in bulk.  They are loaded from the database on first use
+    and then kept current by the owning manager calling update() after each save."""
+
+    def __init__(self, connection, block_size):
+        # block_size is the most distances computed at once, which bounds the size
+        # of the temporary arrays (8 bytes per element for each of a handful).
+        self._conn = connection
+        self._block_size = block_size
+        self._ids = None
+        self._latitudes = None
+        self._longitudes = None
+        self._cosines = None
+
+    def _ensure_loaded(self):
+        if self._ids is None:
+            rows = self._conn.execute(_LOAD_ALL)
+            table = numpy.array(rows.fetchall(), dtype=numpy.float64).reshape(-1, 3)
+            self._set(table[:, 0].astype(numpy.int64), table[:, 1], table[:, 2])
+
+    def _set(self, ids, latitudes_deg, longitudes_deg):
+        self._ids = ids
+        self._latitudes = numpy.radians(latitudes_deg)
+        self._longitudes = numpy.radians(longitudes_deg)
+        self._cosines = numpy.cos(self._latitudes)
+
+    def _positions(self, airport_ids):
+        ids = numpy.asarray(airport_ids, dtype=numpy.int64)
+        positions = numpy.searchsorted(self._ids, ids)
+        found = positions < len(self._ids)
+        found[found] = self._ids[positions[found]] == ids[found]
+
+        if not found.all():
+            missing = ', '.join(str(i) for i in ids[~found][:10])
+            raise KeyError(f'Unknown airport ids: {missing}')
+
+        return positions
+
+    def matrix(self, airport_ids):
+        """Returns the matrix of distances in kilometers between every pair of the
+        given airports, computed a block of rows at a time."""
+        self._ensure_loaded()
+        positions = self._positions(airport_ids)
+        latitudes = self._latitudes[positions]
+        longitudes = self._longitudes[positions]
+        cosines = self._cosines[positions]
+        count = len(positions)
+        result = numpy.empty((count, count))
+        rows_per_block = max(1, self._block_size // max(count, 1))
+
+        for start in range(0, count, rows_per_block):
+            end = min(start + rows_per_block, count)
+            result[start:end] = _haversine_block(
+                latitudes[start:end, None], longitudes[start:end, None], cosines[start:end, None],
+                latitudes, longitudes, cosines)
+
+        return result
+
+    def pairs_within(self, max_distance_km, airport_ids=None):
+        """Yields lists of (airport_id, airport_id, distance_km) for every pair of the
+        given airports (all airports if None) at most max_distance_km apart, a block
+        at a time.  Airports are sorted by latitude so that each one is only compared
+        with the band of airports whose latitude is close enough to be in range."""
+        self._ensure_loaded()
+
+        if airport_ids is None:
+            positions = numpy.arange(len(self._ids))
+        else:
+            positions = self._positions(numpy.unique(airport_ids))
+
+        order = positions[numpy.argsort(self._latitudes[positions], kind='stable')]
+        ids = self._ids[order]
+        latitudes = self._latitudes[order]
+        longitudes = self._longitudes[order]
+        cosines = self._cosines[order]
+        band = max_distance_km / EARTH_RADIUS_KM
+        count = len(order)
+        rows_per_block = max(1, min(count, int(self._block_size ** 0.5)))
+
+        for row_start in range(0, count, rows_per_block):
+            row_end = min(row_start + rows_per_block, count)
+            band_end = numpy.searchsorted(latitudes, latitudes[row_end - 1] + band, side='right')
+            columns_per_block = max(1, self._block_size // (row_end - row_start))
+            pairs = []
+
+            # Only columns after the first row are compared, so each pair is found once.
+            for column_start in range(row_start + 1, band_end, columns_per_block):
+                column_end = min(column_start + columns_per_block, band_end)
+                distances = _haversine_block(
+                    latitudes[row_start:row_end, None], longitudes[row_start:row_end, None],
+                    cosines[row_start:row_end, None], latitudes[column_start:column_end],
+                    longitudes[column_start:column_end], cosines[column_start:column_end])
+
+                rows = numpy.arange(row_start, row_end)[:, None]
+                columns = numpy.arange(column_start, column_end)
+                block_rows, block_columns = numpy.nonzero(
+                    (distances <= max_distance_km) & (columns > rows))
+
+                pairs.extend(zip(
+                    ids[block_rows + row_start].tolist(), ids[block_columns + column_start].tolist(),
+                    distances[block_rows, block_columns].tolist()))
+
+            if pairs:
+                yield pairs
+
+    def update(self, airport_id):
+        """Reloads one airport's coordinates after it was inserted or updated."""
+        if self._ids is None:
+            return
+
+        row = self._conn.execute(_LOAD, (airport_id,)).fetchone()
+
+        if row is None:
+            return
+
+        position = numpy.searchsorted(self._ids, airport_id)
+
+        if position < len(self._ids) and self._ids[position] == airport_id:
+            self._latitudes[position], self._longitudes[position] = numpy.radians(row)
+            self._cosines[position] = numpy.cos(self._latitudes[position])
+        else:
+            self._set(numpy.insert(self._ids, position, airport_id),
+                      numpy.insert(numpy.degrees(self._latitudes), position, row[0]),
+                      numpy.insert(numpy.degrees(self._longitudes), position, row[1]))
@@ -0,0 +1,111 @@
+# exporter.py
+
+
+import csv
+import gzip
+import json
+import sqlite3
+from pathlib import Path
+from p2app.events import *
+from .registry import handles, manager
+
+
+_FORMATS = ('csv', 'jsonl')
+
+
+def _open_output(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    else:
+        return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _write_csv(file, columns, batches):
+    writer = csv.writer(file)
+    writer.writerow(columns)
+
+    for batch in batches:
+        writer.writerows(batch)
+        yield len(batch)
+
+
+def _write_jsonl(file, columns, batches):
+    for batch in batches:
+        file.writelines(json.dumps(dict(zip(columns, row))) + '\n' for row in batch)
+        yield len(batch)
+
+
+@manager
+class ExportManager:
+    """Streams a table, or the rows of it matching equality criteria, to a CSV or
+    JSON Lines file (optionally gzipped).  Rows are fetched and written in batches,
+    so memory use does not grow with the size of the table."""
+
+    def __init__(self, connection, config):
+        self._conn = connection
+        self._batch_size = config.export_batch_size
+
+    def close(self):
+        pass
+
+    @handles(StartExportEvent, read_only=True)
+    def start_export(self, event):
+        path = Path(event.path())
+        criteria = event.criteria() or {}
+
+        try:
+            query = self._export_statement(event.table(), criteria, event.format())
+        except ValueError as e:
+            yield ExportFailedEvent(str(e))
+            return
+
+        cursor = self._conn.cursor()
+        rows = 0
+        is_opened = False
+
+        try:
+            cursor.execute(query, list(criteria.values()))
+            columns = [description[0] for description in cursor.description]
+            batches = iter(lambda: cursor.fetchmany(self._batch_size), [])
+            write = _write_csv if event.format() == 'csv' else _write_jsonl
+
+            with _open_output(path, event.compress()) as file:
+                is_opened = True
+
+                for count in write(file, columns, batches):
+                    rows += count
+                    yield ExportProgressEvent(event.table(), rows)
+        except (sqlite3.Error, OSError) as e:
+            # Only a partly written file of this export is removed, never one that
+            # was already at the path before the export failed to open it.
+            if is_opened:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+            yield ExportFailedEvent(str(e))
+        else:
+            yield ExportCompletedEvent(path, rows)
+        finally:
+            cursor.close()
+
+    def _export_statement(self, table, criteria, format):
+        # Table and column names cannot be parameters, so they are checked against
+        # the schema before being placed in the query.
+        if format not in _FORMATS:
+            raise ValueError(f'Unknown export format: {format}')
+
+        columns = {row[1] for row in self._conn.execute(
+            "SELECT * FROM pragma_table_info(?)", (table,))}
+
+        if not columns:
+            raise ValueError(f'Unknown table: {table}')
+
+        unknown = [column for column in criteria if column not in columns]
+
+        if unknown:
+            raise ValueError(f'Unknown columns in {table}: {", ".join(unknown)}')
+
+        conditions = ' AND '.join(f'{column} = ?' for column in criteria)
+        return f"SELECT * FROM {table} WHERE {conditions}" if conditions else f"SELECT * FROM {table}"
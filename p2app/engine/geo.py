@@ -0,0 +1,59 @@
+# geo.py
+#
+# Great-circle geometry on a spherical Earth, shared by the engine's location
+# based searches.
+
+
+import math
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Half the Earth's circumference: no two points are farther apart than this.
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(latitude1, longitude1, latitude2, longitude2):
+    """Returns the great-circle distance in kilometers between two points given in
+    degrees."""
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(longitude2 - longitude1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def longitude_boxes(min_latitude, min_longitude, max_latitude, max_longitude):
+    """Splits a latitude/longitude box into at most two boxes that do not cross the
+    antimeridian, as (min_latitude, min_longitude, max_latitude, max_longitude)
+    tuples.  A box whose min_longitude exceeds its max_longitude is taken to cross
+    the antimeridian."""
+    if min_longitude <= max_longitude:
+        return [(min_latitude, min_longitude, max_latitude, max_longitude)]
+    else:
+        return [(min_latitude, min_longitude, max_latitude, 180.0),
+                (min_latitude, -180.0, max_latitude, max_longitude)]
+
+
+def radius_boxes(latitude, longitude, radius_km):
+    """Returns boxes, as longitude_boxes() does, that together contain every point
+    within radius_km of the given point."""
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    dlatitude = math.degrees(angular_radius)
+    min_latitude = latitude - dlatitude
+    max_latitude = latitude + dlatitude
+
+    if min_latitude <= -90.0 or max_latitude >= 90.0 or angular_radius >= math.pi / 2:
+        # The circle contains a pole, so it spans every longitude.
+        return [(max(min_latitude, -90.0), -180.0, min(max_latitude, 90.0), 180.0)]
+
+    dlongitude = math.degrees(math.asin(
+        min(1.0, math.sin(angular_radius) / math.cos(math.radians(latitude)))))
+
+    if dlongitude >= 180.0:
+        return [(min_latitude, -180.0, max_latitude, 180.0)]
+
+    west = (longitude - dlongitude + 180.0) % 360.0 - 180.0
+    east = (longitude + dlongitude + 180.0) % 360.0 - 180.0
+    return longitude_boxes(min_latitude, west, max_latitude, east)
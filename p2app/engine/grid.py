@@ -0,0 +1,70 @@
+# grid.py
+
+
+import math
+from .geo import haversine_km, radius_boxes
+
+
+class SpatialGrid:
+    """Points bucketed by latitude and longitude into square cells of a fixed
+    number of degrees, held in memory.  Finding the points near a location only
+    visits the cells that cover its surroundings, and points can be added, moved
+    and removed one at a time as the rows they stand for change."""
+
+    def __init__(self, cell_degrees):
+        self._cell_degrees = cell_degrees
+        self._positions = {}
+        self._cells = {}
+
+    def _cell(self, latitude, longitude):
+        return math.floor(latitude / self._cell_degrees), math.floor(longitude / self._cell_degrees)
+
+    def __contains__(self, point_id):
+        return point_id in self._positions
+
+    def __len__(self):
+        return len(self._positions)
+
+    def position(self, point_id):
+        return self._positions[point_id]
+
+    def add(self, point_id, latitude, longitude):
+        """Adds a point, or moves it if it is already in the grid."""
+        self.remove(point_id)
+        self._positions[point_id] = (latitude, longitude)
+        self._cells.setdefault(self._cell(latitude, longitude), []).append(point_id)
+
+    def remove(self, point_id):
+        position = self._positions.pop(point_id, None)
+
+        if position is not None:
+            cell = self._cell(*position)
+            self._cells[cell].remove(point_id)
+
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def candidates(self, latitude, longitude, radius_km):
+        """Yields the ids of the points in the cells that cover every point within
+        radius_km of the given location, which include some farther away."""
+        for min_latitude, min_longitude, max_latitude, max_longitude in radius_boxes(
+                latitude, longitude, radius_km):
+            min_row, min_column = self._cell(min_latitude, min_longitude)
+            max_row, max_column = self._cell(max_latitude, max_longitude)
+
+            for row in range(min_row, max_row + 1):
+                for column in range(min_column, max_column + 1):
+                    yield from self._cells.get((row, column), ())
+
+    def within(self, latitude, longitude, radius_km):
+        """Returns (distance_km, id) pairs for the points within radius_km of the
+        given location, in no particular order."""
+        within = []
+
+        for point_id in self.candidates(latitude, longitude, radius_km):
+            distance = haversine_km(latitude, longitude, *self._positions[point_id])
+
+            if distance <= radius_km:
+                within.append((distance, point_id))
+
+        return within
@@ -0,0 +1,306 @@
+# importer.py
+#
+# Bulk import of the OurAirports CSV files (https://ourairports.com/data/).
+#
+# Each table whose CSV file is present in the import directory is replaced by the
+# file's contents.  Files are streamed in chunks with executemany(), references
+# given as codes in the CSV files (continent, iso_country, iso_region, airport
+# ident) are resolved through in-memory code-to-id maps, and the whole import runs
+# as one transaction with secondary indexes dropped until the data is loaded.
+
+
+import csv
+import itertools
+import sqlite3
+from collections import Counter, namedtuple
+from pathlib import Path
+from p2app.events import *
+
+
+_CHUNK_SIZE = 20_000
+
+# OurAirports has no continents file; these are the codes its other files use.
+# A continents.csv (columns: code, name) in the import directory overrides them.
+_DEFAULT_CONTINENTS = [
+    ('AF', 'Africa'), ('AN', 'Antarctica'), ('AS', 'Asia'), ('EU', 'Europe'),
+    ('NA', 'North America'), ('OC', 'Oceania'), ('SA', 'South America')
+]
+
+_TUNING_PRAGMAS = {'synchronous': 'OFF', 'cache_size': '-65536', 'temp_store': 'MEMORY'}
+
+
+def _text(value):
+    return value if value != '' else None
+
+
+def _int(value):
+    return int(float(value)) if value != '' else None
+
+
+def _real(value):
+    return float(value) if value != '' else None
+
+
+def _flag(value):
+    return 1 if value in ('1', 'yes') else 0
+
+
+def _continent(record, maps):
+    return record['code'], record['name']
+
+
+def _country(record, maps):
+    continent_id = maps['continent'].get(record['continent'])
+
+    if continent_id is None:
+        return None
+
+    country_id = int(record['id'])
+    maps['country'][record['code']] = country_id
+    return (country_id, record['code'], record['name'], continent_id,
+            record['wikipedia_link'], _text(record['keywords']))
+
+
+def _region(record, maps):
+    continent_id = maps['continent'].get(record['continent'])
+    country_id = maps['country'].get(record['iso_country'])
+
+    if continent_id is None or country_id is None:
+        return None
+
+    region_id = int(record['id'])
+    maps['region'][record['code']] = region_id
+    return (region_id, record['code'], record['local_code'], record['name'], continent_id,
+            country_id, _text(record['wikipedia_link']), _text(record['keywords']))
+
+
+def _airport(record, maps):
+    continent_id = maps['continent'].get(record['continent'])
+    country_id = maps['country'].get(record['iso_country'])
+    region_id = maps['region'].get(record['iso_region'])
+
+    if continent_id is None or country_id is None or region_id is None:
+        return None
+
+    airport_id = int(record['id'])
+    maps['airport'][record['ident']] = airport_id
+    maps['airport_id'].add(airport_id)
+
+    # The schema declares airport.continent_id as TEXT.
+    return (airport_id, record['ident'], record['type'], record['name'],
+            float(record['latitude_deg']), float(record['longitude_deg']),
+            _int(record['elevation_ft']), str(continent_id), country_id, region_id,
+            _text(record['municipality']), _flag(record['scheduled_service']),
+            _text(record['gps_code']), _text(record['iata_code']), _text(record['local_code']),
+            _text(record['home_link']), _text(record['wikipedia_link']),
+            _text(record['keywords']))
+
+
+def _airport_reference(record, maps):
+    # Runways and frequencies refer to their airport by id rather than by code,
+    # but the airport may still have been skipped (or never imported).
+    airport_id = int(record['airport_ref'])
+    return airport_id if airport_id in maps['airport_id'] else None
+
+
+def _airport_frequency(record, maps):
+    airport_id = _airport_reference(record, maps)
+
+    if airport_id is None:
+        return None
+
+    return (int(record['id']), airport_id, record['type'],
+            _text(record['description']), float(record['frequency_mhz']))
+
+
+def _runway(record, maps):
+    airport_id = _airport_reference(record, maps)
+
+    if airport_id is None:
+        return None
+
+    return (int(record['id']), airport_id, _int(record['length_ft']),
+            _int(record['width_ft']), _text(record['surface']), _flag(record['lighted']),
+            _flag(record['closed']), _text(record['le_ident']), _real(record['le_latitude_deg']),
+            _real(record['le_longitude_deg']), _int(record['le_elevation_ft']),
+            _real(record['le_heading_degT']), _int(record['le_displaced_threshold_ft']),
+            _text(record['he_ident']), _real(record['he_latitude_deg']),
+            _real(record['he_longitude_deg']), _int(record['he_elevation_ft']),
+            _real(record['he_heading_degT']), _int(record['he_displaced_threshold_ft']))
+
+
+def _navigation_aid(record, maps):
+    associated_airport = record['associated_airport']
+    airport_id = maps['airport'].get(associated_airport) if associated_airport else None
+
+    return (int(record['id']), record['filename'], record['ident'], record['name'],
+            record['type'], _int(record['frequency_khz']), float(record['latitude_deg']),
+            float(record['longitude_deg']), _int(record['elevation_ft']), record['iso_country'],
+            _int(record['dme_frequency_khz']), _text(record['dme_channel']),
+            _real(record['dme_latitude_deg']), _real(record['dme_longitude_deg']),
+            _int(record['dme_elevation_ft']), _real(record['slaved_variation_deg']),
+            _real(record['magnetic_variation_deg']), _text(record['usageType']),
+            _text(record['power']), airport_id)
+
+
+_TableImport = namedtuple('_TableImport', ['table', 'file_name', 'insert', 'convert'])
+
+
+def _insert(table, column_count):
+    return f"INSERT INTO {table} VALUES ({', '.join('?' * column_count)})"
+
+
+# In dependency order, so every code-to-id map is filled before it is needed.
+_TABLE_IMPORTS = [
+    _TableImport('continent', 'continents.csv',
+                 "INSERT INTO continent (continent_code, name) VALUES (?, ?)", _continent),
+    _TableImport('country', 'countries.csv', _insert('country', 6), _country),
+    _TableImport('region', 'regions.csv', _insert('region', 8), _region),
+    _TableImport('airport', 'airports.csv', _insert('airport', 18), _airport),
+    _TableImport('airport_frequency', 'airport-frequencies.csv',
+                 _insert('airport_frequency', 5), _airport_frequency),
+    _TableImport('runway', 'runways.csv', _insert('runway', 19), _runway),
+    _TableImport('navigation_aid', 'navaids.csv', _insert('navigation_aid', 20), _navigation_aid)
+]
+
+
+def _load_maps(connection):
+    # Codes already in the database, so that a partial import (say, only
+    # airports.csv) can still resolve its references.
+    return {
+        'continent': dict(connection.execute("SELECT continent_code, continent_id FROM continent")),
+        'country': dict(connection.execute("SELECT country_code, country_id FROM country")),
+        'region': dict(connection.execute("SELECT region_code, region_id FROM region")),
+        'airport': dict(connection.execute("SELECT airport_ident, airport_id FROM airport")),
+        'airport_id': {row[0] for row in connection.execute("SELECT airport_id FROM airport")}
+    }
+
+
+def _secondary_indexes(connection):
+    tables = [table_import.table for table_import in _TABLE_IMPORTS]
+    return connection.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        f"AND tbl_name IN ({', '.join('?' * len(tables))})", tables).fetchall()
+
+
+def _import_table(connection, table_import, path, maps):
+    imported = 0
+    skipped = 0
+
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+
+        if header is None:
+            return imported, skipped
+
+        # Cheaper than csv.DictReader, which re-checks the row length for every row.
+        records = (dict(zip(header, row)) for row in reader)
+        rows = (table_import.convert(record, maps) for record in records)
+
+        while chunk := list(itertools.islice(rows, _CHUNK_SIZE)):
+            kept = [row for row in chunk if row is not None]
+            connection.executemany(table_import.insert, kept)
+            imported += len(kept)
+            skipped += len(chunk) - len(kept)
+            yield ImportProgressEvent(table_import.table, imported)
+
+    return imported, skipped
+
+
+def _import_all(connection, directory):
+    row_counts = {}
+    skipped_counts = {}
+    maps = _load_maps(connection)
+    indexes = _secondary_indexes(connection)
+
+    for name, _ in indexes:
+        connection.execute(f"DROP INDEX {name}")
+
+    for table_import in _TABLE_IMPORTS:
+        path = directory / table_import.file_name
+
+        if path.exists():
+            connection.execute(f"DELETE FROM {table_import.table}")
+
+            # The rows just deleted can no longer be referred to.
+            if table_import.table in maps:
+                maps[table_import.table] = {}
+
+            if table_import.table == 'airport':
+                maps['airport_id'] = set()
+
+            counts = yield from _import_table(connection, table_import, path, maps)
+            row_counts[table_import.table], skipped_counts[table_import.table] = counts
+        elif table_import.table == 'continent':
+            connection.executemany(
+                "INSERT OR IGNORE INTO continent (continent_code, name) VALUES (?, ?)",
+                _DEFAULT_CONTINENTS)
+
+        if table_import.table == 'continent':
+            maps['continent'] = dict(
+                connection.execute("SELECT continent_code, continent_id FROM continent"))
+
+    for _, sql in indexes:
+        connection.execute(sql)
+
+    return row_counts, skipped_counts
+
+
+def _dangling_references(connection):
+    # Rows (of any table, since a replaced table's dependents may not have been
+    # imported) referring to a row that no longer exists, counted by the table they
+    # are in and the table they refer to.
+    violations = connection.execute("PRAGMA foreign_key_check")
+    return Counter((table, parent) for table, _, parent, _ in violations)
+
+
+def _dangling_references_message(dangling):
+    references = ', '.join(
+        f"{count} {table} rows refer to missing {parent} rows"
+        for (table, parent), count in sorted(dangling.items()))
+
+    return f"The import would leave rows referring to missing rows ({references}); " \
+           "import the files of the tables that refer to them too"
+
+
+def import_directory(connection, directory):
+    """A generator function that replaces the contents of each table whose OurAirports
+    CSV file is in the given directory, yielding an ImportProgressEvent after every
+    chunk and finally an ImportCompletedEvent, or an ImportFailedEvent after rolling
+    back everything if any part of the import fails.  A partial import fails too if
+    it would leave rows of other tables referring to rows it replaced."""
+    connection.commit()
+    saved_pragmas = {
+        pragma: connection.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in _TUNING_PRAGMAS}
+    foreign_keys = connection.execute("PRAGMA foreign_keys").fetchone()[0]
+
+    # References are resolved (or the row skipped) while reading, so the per-row
+    # foreign key checks are redundant; pragmas can only change outside a transaction.
+    for pragma, value in _TUNING_PRAGMAS.items():
+        connection.execute(f"PRAGMA {pragma} = {value}")
+
+    connection.execute("PRAGMA foreign_keys = OFF")
+
+    try:
+        connection.execute("BEGIN")
+        row_counts, skipped_counts = yield from _import_all(connection, Path(directory))
+        dangling = _dangling_references(connection)
+
+        if dangling:
+            connection.rollback()
+            yield ImportFailedEvent(_dangling_references_message(dangling))
+        else:
+            connection.commit()
+            yield ImportCompletedEvent(row_counts, skipped_counts)
+    except (sqlite3.Error, OSError, csv.Error, KeyError, ValueError) as e:
+        connection.rollback()
+        yield ImportFailedEvent(f'{type(e).__name__}: {e}')
+    finally:
+        if connection.in_transaction:
+            connection.rollback()
+
+        for pragma, value in saved_pragmas.items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+
+        connection.execute(f"PRAGMA foreign_keys = {foreign_keys}")
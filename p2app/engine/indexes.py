@@ -0,0 +1,186 @@
+# indexes.py
+#
+# The secondary indexes the engine's queries want, which schema.sql doesn't
+# define: one for each column searched by equality that isn't already UNIQUE, and
+# one for each foreign key column, so lookups from a parent row don't scan the
+# child table.
+
+
+import re
+import sqlite3
+import sys
+import time
+from p2app.events import *
+from .registry import manager_types
+
+
+# (table, columns) pairs, in the order the indexes are created.
+RECOMMENDED_INDEXES = [
+    ('continent', ('name',)),
+    ('country', ('name',)),
+    ('country', ('continent_id',)),
+    ('region', ('local_code',)),
+    ('region', ('name',)),
+    ('region', ('continent_id',)),
+    ('region', ('country_id',)),
+    ('airport', ('continent_id',)),
+    ('airport', ('country_id',)),
+    ('airport', ('region_id',)),
+    ('airport_frequency', ('airport_id',)),
+    ('runway', ('airport_id',)),
+    ('runway', ('length_ft',)),
+    ('navigation_aid', ('navigation_aid_id',)),
+    ('navigation_aid', ('airport_id',))
+]
+
+# A step of a query plan that reads the whole table rather than searching an index.
+_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+# The name of the temp table that a statement in a module's TEMP_TABLES creates.
+_TEMP_TABLE = re.compile(r'^CREATE VIRTUAL TABLE temp\.(\w+)')
+
+
+def _index_name(table, columns):
+    return f"idx_{table}_{'_'.join(columns)}"
+
+
+def _create_statement(table, columns):
+    return f"CREATE INDEX IF NOT EXISTS {_index_name(table, columns)} ON {table} ({', '.join(columns)})"
+
+
+def _manager_modules():
+    return dict.fromkeys(sys.modules[manager_type.__module__] for manager_type in manager_types())
+
+
+def engine_statements():
+    """Returns every statement in the statement tables of the manager modules,
+    including those of the helpers (such as text indexes) that the managers use."""
+    return [statement for module in _manager_modules()
+            for statement in getattr(module, 'STATEMENTS', ())]
+
+
+def engine_temp_tables():
+    """Returns the statements creating the temp tables that the engine's statements
+    use, such as text indexes, which are otherwise only built on first use."""
+    return [statement for module in _manager_modules()
+            for statement in getattr(module, 'TEMP_TABLES', ())]
+
+
+class IndexAdvisor:
+    """Compares a database's indexes with RECOMMENDED_INDEXES, creates the missing
+    ones on request, and checks with EXPLAIN QUERY PLAN that the engine's queries
+    use them."""
+
+    def __init__(self, connection):
+        self._conn = connection
+        self._tables = {name for name, in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    def _indexed_columns(self, table):
+        # The leading columns of each existing index, including those SQLite makes
+        # for UNIQUE constraints; an index serves any prefix of its columns.
+        indexed = set()
+
+        for _, name, *_ in self._conn.execute("SELECT * FROM pragma_index_list(?)", (table,)):
+            columns = [row[2] for row in self._conn.execute(
+                "SELECT * FROM pragma_index_info(?) ORDER BY seqno", (name,))]
+
+            for length in range(1, len(columns) + 1):
+                indexed.add(tuple(columns[:length]))
+
+        return indexed
+
+    def missing_indexes(self):
+        """Returns the (table, columns) pairs of the recommended indexes that no
+        existing index covers."""
+        indexed = {}
+        missing = []
+
+        for table, columns in RECOMMENDED_INDEXES:
+            if table not in self._tables:
+                continue
+
+            if table not in indexed:
+                indexed[table] = self._indexed_columns(table)
+
+            if columns not in indexed[table]:
+                missing.append((table, columns))
+
+        return missing
+
+    def _estimated_rows(self, table):
+        # MAX(rowid) is a single b-tree descent, where COUNT(*) would read the table.
+        return self._conn.execute(f"SELECT IFNULL(MAX(rowid), 0) FROM {table}").fetchone()[0]
+
+    def recommendation(self):
+        """Returns an IndexRecommendationEvent for the missing indexes, or None if
+        there are none."""
+        missing = self.missing_indexes()
+
+        if not missing:
+            return None
+
+        return IndexRecommendationEvent(
+            [_create_statement(table, columns) for table, columns in missing],
+            sum(self._estimated_rows(table) for table, _ in missing))
+
+    def create_missing_indexes(self):
+        """Creates the missing recommended indexes in one transaction and returns a
+        RecommendedIndexesCreatedEvent."""
+        start = time.perf_counter()
+        missing = self.missing_indexes()
+
+        with self._conn:
+            for table, columns in missing:
+                self._conn.execute(_create_statement(table, columns))
+
+        # Lets SQLite gather the statistics the planner wants for the new indexes.
+        self._conn.execute("PRAGMA optimize")
+        return RecommendedIndexesCreatedEvent(
+            [_index_name(table, columns) for table, columns in missing], time.perf_counter() - start)
+
+    def query_plan_warnings(self):
+        """Returns a QueryPlanWarningEvent for each of the engine's statements with a
+        WHERE clause whose plan scans a whole table.  Statements that can't be planned
+        against this database (say, because it lacks one of their tables) are skipped.
+
+        Temp tables the statements use that don't exist yet are created, empty, for
+        as long as the check takes."""
+        created = self._create_temp_tables()
+
+        try:
+            return list(self._plan_warnings())
+        finally:
+            for name in created:
+                self._conn.execute(f"DROP TABLE temp.{name}")
+
+    def _create_temp_tables(self):
+        existing = {name for name, in self._conn.execute(
+            "SELECT name FROM sqlite_temp_master WHERE type = 'table'")}
+        created = []
+
+        for statement in engine_temp_tables():
+            name = _TEMP_TABLE.match(statement).group(1)
+
+            if name not in existing:
+                try:
+                    self._conn.execute(statement)
+                    created.append(name)
+                except sqlite3.OperationalError:
+                    pass
+
+        return created
+
+    def _plan_warnings(self):
+        for statement in engine_statements():
+            if ' WHERE ' not in statement:
+                continue
+
+            try:
+                plan = [row[3] for row in self._conn.execute(
+                    f"EXPLAIN QUERY PLAN {statement}", (None,) * statement.count('?'))]
+            except sqlite3.OperationalError:
+                continue
+
+            if any(_FULL_SCAN.match(detail) for detail in plan):
+                yield QueryPlanWarningEvent(statement, plan)
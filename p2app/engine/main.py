@@ -3,18 +3,18 @@
 # ICS 33 Spring 2024
 # Project 2: Learning to Fly
 #
-# An object that represents the engine of the application.
-#
-# This is the outermost layer of the part of the program that you'll need to build,
-# which means that YOU WILL DEFINITELY NEED TO MAKE CHANGES TO THIS FILE.
+# An object that represents the engine of the application, and the outermost
+# layer of it: it opens and closes databases and dispatches each event to the
+# handler registered for it.
 
 
-import sqlite3
+import contextlib
+import threading
 from p2app.events import *
+from .config import EngineConfig
 from .database import DatabaseManager
-from .continents import ContinentManager
-from .countries import CountryManager
-from .regions import RegionManager
+from .importer import import_directory
+from .registry import HandlerTable, handles, is_read_only, manager_types
 
 
 class Engine:
@@ -24,77 +24,129 @@ class Engine:
     unaware of any details of how the engine is implemented.
     """
 
-    def __init__(self):
-        """Initializes the engine"""
+    def __init__(self, config=None):
+        """Initializes the engine, optionally with an EngineConfig overriding the
+        default settings"""
+        self._config = config if config is not None else EngineConfig()
         self._conn = None
+        self._readers = None
         self.path = None
-        self._db_manager = DatabaseManager()
-        self._continent_manager = None
-        self._country_manager = None
-        self._region_manager = None
+        # Held while an event that may write is processed, so that events arriving
+        # from several threads take turns with the shared connection.  It is
+        # reentrant because a view may send an event while handling another's results.
+        self._write_lock = threading.RLock()
+        self._db_manager = DatabaseManager(self._config)
+        self._managers = []
+        self._handlers = HandlerTable()
+        self._handlers.register_all(self)
 
     def process_event(self, event):
         """A generator function that processes one event sent from the user interface,
-        yielding zero or more events in response."""
-
-        if isinstance(event, QuitInitiatedEvent):
-            yield EndApplicationEvent()
-
-        elif isinstance(event, OpenDatabaseEvent):
-            yield from self._db_manager.open_database(event)
-            self._conn = self._db_manager.connection()
-            self.path = self._db_manager.database_path()
-
-        elif isinstance(event, CloseDatabaseEvent):
-            yield DatabaseClosedEvent()
-
-        elif isinstance(event, StartContinentSearchEvent):
-            self._continent_manager = ContinentManager(self._conn)
-            yield from self._continent_manager.start_continent_search(event)
-
-        elif isinstance(event, LoadContinentEvent):
-            self._continent_manager = ContinentManager(self._conn)
-            yield from self._continent_manager.load_continent(event)
-
-        elif isinstance(event, SaveNewContinentEvent):
-            self._continent_manager = ContinentManager(self._conn)
-            yield from self._continent_manager.save_new_continent(event)
-
-        elif isinstance(event, SaveContinentEvent):
-            self._continent_manager = ContinentManager(self._conn)
-            yield from self._continent_manager.save_continent(event)
-
-        elif isinstance(event, StartCountrySearchEvent):
-            self._country_manager = CountryManager(self._conn)
-            yield from self._country_manager.start_country_search(event)
+        yielding zero or more events in response.
 
-        elif isinstance(event, LoadCountryEvent):
-            self._country_manager = CountryManager(self._conn)
-            yield from self._country_manager.load_country(event)
+        It may be called from several threads at once.  With a pool of readers (see
+        EngineConfig.read_pool_size), read-only events run in parallel on their own
+        snapshots of the database; all other events run one at a time."""
+        handler = self._handlers.lookup(type(event))
 
-        elif isinstance(event, SaveNewCountryEvent):
-            self._country_manager = CountryManager(self._conn)
-            yield from self._country_manager.save_new_country(event)
-
-        elif isinstance(event, SaveCountryEvent):
-            self._country_manager = CountryManager(self._conn)
-            yield from self._country_manager.save_country(event)
-
-        elif isinstance(event, StartRegionSearchEvent):
-            self._region_manager = RegionManager(self._conn)
-            yield from self._region_manager.start_region_search(event)
-
-        elif isinstance(event, LoadRegionEvent):
-            self._region_manager = RegionManager(self._conn)
-            yield from self._region_manager.load_region(event)
-
-        elif isinstance(event, SaveNewRegionEvent):
-            self._region_manager = RegionManager(self._conn)
-            yield from self._region_manager.save_new_region(event)
+        if handler is None:
+            yield ErrorEvent(f"ERROR: {event}")
+        elif self._readers is not None and is_read_only(handler):
+            yield from self._readers.process_event(event, self._process_on_writer)
+        else:
+            # Not a with statement, which costs twice as much as this in a generator.
+            self._write_lock.acquire()
+
+            try:
+                yield from handler(event)
+            finally:
+                self._write_lock.release()
+
+    def _process_on_writer(self, event):
+        # The readers' fallback when none of them is free.
+        with self._write_lock:
+            yield from self._handlers.lookup(type(event))(event)
+
+    def cache_statistics(self):
+        """Returns the size, hit and miss counts of each manager's entity cache for the
+        open database, as a list of dictionaries."""
+        return [manager.cache_statistics() for manager in self._managers
+                if hasattr(manager, 'cache_statistics')]
+
+    def query_cache_statistics(self):
+        """Returns the size, hit and miss counts of each manager's search result cache
+        for the open database, as a list of dictionaries."""
+        return [manager.query_cache_statistics() for manager in self._managers
+                if hasattr(manager, 'query_cache_statistics')]
+
+    @handles(QuitInitiatedEvent)
+    def _quit(self, event):
+        yield EndApplicationEvent()
+
+    @handles(OpenDatabaseEvent)
+    def _open_database(self, event):
+        # The database is ready before any of its events are yielded, since a view
+        # may answer one (such as an index recommendation) with an event of its own.
+        self._close_managers()
+        events = list(self._db_manager.open_database(event))
+        self._conn = self._db_manager.connection()
+        self._readers = self._db_manager.readers()
+        self.path = self._db_manager.database_path()
+        self._open_managers()
+        yield from events
+
+    @handles(CloseDatabaseEvent)
+    def _close_database(self, event):
+        self._close_managers()
+        self._db_manager.close_database()
+        self._conn = None
+        self._readers = None
+        self.path = None
+        yield DatabaseClosedEvent()
 
-        elif isinstance(event, SaveRegionEvent):
-            self._region_manager = RegionManager(self._conn)
-            yield from self._region_manager.save_region(event)
+    @handles(CreateRecommendedIndexesEvent)
+    def _create_recommended_indexes(self, event):
+        if self._conn is not None:
+            yield from self._db_manager.create_recommended_indexes()
 
+    @handles(StartImportEvent)
+    def _import(self, event):
+        if self._conn is None:
+            yield ImportFailedEvent('No database is open')
         else:
-            yield ErrorEvent(f"ERROR: {event}")
+            # Managers hold state derived from the data (such as text indexes), so
+            # they are rebuilt around an import rather than patched row by row.
+            self._close_managers()
+
+            # Readers rebuild their managers after an import rather than following
+            # each of its rows.
+            if self._readers is not None:
+                untracked = self._readers.untracked()
+            else:
+                untracked = contextlib.nullcontext()
+
+            try:
+                with untracked:
+                    yield from import_directory(self._conn, event.directory())
+            finally:
+                self._open_managers()
+
+    def _open_managers(self):
+        """Creates the long-lived managers for the newly opened database, which keep
+        their cursors and prepared statements until the database is closed, and
+        routes their events to them."""
+        if self._conn is not None:
+            self._managers = [manager_type(self._conn, self._config) for manager_type in manager_types()]
+
+            for manager in self._managers:
+                self._handlers.register_all(manager)
+
+    def _close_managers(self):
+        """Releases the managers (and their cursors) of the current database, if any,
+        leaving only the engine's own handlers in place."""
+        for manager in self._managers:
+            manager.close()
+
+        self._managers = []
+        self._handlers = HandlerTable()
+        self._handlers.register_all(self)
@@ -0,0 +1,140 @@
+# navigation_aids.py
+
+
+import sqlite3
+from p2app.events import *
+from .grid import SpatialGrid
+from .registry import handles, manager
+
+
+# Navigation aids are spread thinly enough that one-degree cells hold a handful
+# each, which keeps the cells visited for a radius of tens of kilometers few.
+_CELL_DEGREES = 1.0
+
+# The most airport ids bound into one statement, well under SQLite's limit.  It is
+# a power of two, as are the sizes of the statements for shorter lists of ids.
+_MAX_IDS_PER_STATEMENT = 512
+
+_COLUMNS = NavigationAid._fields
+
+# Statement table for the navigation aid manager; see continents.py.  The table's
+# id column is not its primary key, so new rows are given the next id by hand.
+_LOAD_ALL = "SELECT * FROM navigation_aid"
+_LOAD = "SELECT * FROM navigation_aid WHERE navigation_aid_id = ?"
+_NEXT_ID = "SELECT IFNULL(MAX(navigation_aid_id), 0) + 1 FROM navigation_aid"
+_INSERT = f"INSERT INTO navigation_aid ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+_UPDATE = (f"UPDATE navigation_aid SET {', '.join(f'{column} = ?' for column in _COLUMNS[1:])} "
+           f"WHERE navigation_aid_id = ?")
+
+
+# Keyed by how many ids each statement takes: every power of two up to
+# _MAX_IDS_PER_STATEMENT.  A list of ids is split into full chunks, and the rest
+# is padded with NULLs (which match no airport) up to the next size.
+_AIRPORT_POSITIONS = {
+    id_count: ("SELECT airport_id, latitude_deg, longitude_deg FROM airport "
+               f"WHERE airport_id IN ({', '.join('?' * id_count)})")
+    for id_count in (1 << power for power in range(_MAX_IDS_PER_STATEMENT.bit_length()))
+}
+
+STATEMENTS = (_LOAD_ALL, _LOAD, _NEXT_ID, _INSERT, _UPDATE, *_AIRPORT_POSITIONS.values())
+
+
+def _update_parameters(navigation_aid):
+    return (*navigation_aid[1:], navigation_aid.navigation_aid_id)
+
+
+@manager
+class NavigationAidManager:
+    def __init__(self, connection, config):
+        self._conn = connection
+        self._cursor = connection.cursor()
+        self._grid = None
+        self._navigation_aids = {}
+
+    def close(self):
+        self._cursor.close()
+
+    def refresh(self, table, row_ids):
+        """Brings the caches and indexes up to date with rows of the given table that
+        another connection changed."""
+        if table == 'navigation_aid' and self._grid is not None:
+            for navigation_aid_id in row_ids:
+                self._grid.remove(navigation_aid_id)
+                self._navigation_aids.pop(navigation_aid_id, None)
+                self._saved(navigation_aid_id)
+
+    def _ensure_loaded(self):
+        # Every navigation aid is held in memory alongside the grid: there are few
+        # enough of them, and it lets a batch of airports be answered without going
+        # back to the table for each aid found.
+        if self._grid is None:
+            self._grid = SpatialGrid(_CELL_DEGREES)
+
+            for row in self._conn.execute(_LOAD_ALL):
+                self._remember(NavigationAid(*row))
+
+    def _remember(self, navigation_aid):
+        self._navigation_aids[navigation_aid.navigation_aid_id] = navigation_aid
+        self._grid.add(navigation_aid.navigation_aid_id, navigation_aid.latitude_deg,
+                       navigation_aid.longitude_deg)
+
+    def _airport_positions(self, airport_ids):
+        positions = {}
+
+        for start in range(0, len(airport_ids), _MAX_IDS_PER_STATEMENT):
+            chunk = airport_ids[start:start + _MAX_IDS_PER_STATEMENT]
+            id_count = 1 << (len(chunk) - 1).bit_length()
+            query = _AIRPORT_POSITIONS[id_count]
+
+            for airport_id, latitude, longitude in self._conn.execute(
+                    query, chunk + [None] * (id_count - len(chunk))):
+                positions[airport_id] = (latitude, longitude)
+
+        return positions
+
+    @handles(FindNavigationAidsNearAirportsEvent, read_only=True)
+    def find_navigation_aids_near_airports(self, event):
+        self._ensure_loaded()
+        positions = self._airport_positions(list(dict.fromkeys(event.airport_ids())))
+
+        for airport_id in event.airport_ids():
+            if airport_id in positions:
+                within = sorted(self._grid.within(*positions[airport_id], event.radius_km()))
+                navigation_aids = [(distance, self._navigation_aids[navigation_aid_id])
+                                   for distance, navigation_aid_id in within]
+                yield NavigationAidsNearAirportEvent(airport_id, navigation_aids)
+
+    @handles(SaveNewNavigationAidEvent)
+    def save_new_navigation_aid(self, event):
+        navigation_aid = event.navigation_aid()
+        try:
+            if navigation_aid.navigation_aid_id is None:
+                self._cursor.execute(_NEXT_ID)
+                navigation_aid = navigation_aid._replace(navigation_aid_id=self._cursor.fetchone()[0])
+
+            self._cursor.execute(_INSERT, navigation_aid)
+            self._conn.commit()
+            self._saved(navigation_aid.navigation_aid_id)
+            yield NavigationAidSavedEvent(navigation_aid)
+        except sqlite3.Error as e:
+            yield SaveNavigationAidFailedEvent(str(e))
+
+    @handles(SaveNavigationAidEvent)
+    def save_navigation_aid(self, event):
+        navigation_aid = event.navigation_aid()
+        try:
+            self._cursor.execute(_UPDATE, _update_parameters(navigation_aid))
+            self._conn.commit()
+            self._saved(navigation_aid.navigation_aid_id)
+            yield NavigationAidSavedEvent(navigation_aid)
+        except sqlite3.Error as e:
+            yield SaveNavigationAidFailedEvent(str(e))
+
+    def _saved(self, navigation_aid_id):
+        # Moves the saved aid to its new cell, rather than rebuilding the grid.
+        if self._grid is not None:
+            self._cursor.execute(_LOAD, (navigation_aid_id,))
+            row = self._cursor.fetchone()
+
+            if row:
+                self._remember(NavigationAid(*row))
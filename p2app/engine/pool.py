@@ -0,0 +1,271 @@
+# pool.py
+#
+# Read-only connections that let events which only read the database run on
+# other threads at the same time as each other and as saves.  The database must
+# be in WAL mode, in which readers never block the writer or each other.
+#
+# Each reader has its own connection and its own set of managers, so managers
+# never need to be thread-safe.  Every event a reader processes sees a single
+# snapshot of the database, taken when the event starts: saves committed while it
+# runs are invisible to it, and are seen by the next event it processes.
+#
+# Temporary triggers on the writer's connection note the ids of the rows it
+# changes.  As they are committed, they are handed to every reader, which passes
+# them to its managers' refresh() methods before its next event, so that their
+# caches and indexes follow the saves without being rebuilt.
+
+
+import contextlib
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from .registry import HandlerTable, manager_types
+
+
+# The tables whose changes the managers follow, with the column identifying a
+# changed row to them.
+_TRACKED_TABLES = {
+    'continent': 'continent_id',
+    'country': 'country_id',
+    'region': 'region_id',
+    'airport': 'airport_id',
+    'runway': 'airport_id',
+    'navigation_aid': 'navigation_aid_id'
+}
+
+_TRIGGERED_OPERATIONS = (('INSERT', ('NEW',)), ('UPDATE', ('OLD', 'NEW')), ('DELETE', ('OLD',)))
+
+# Beyond this many changed rows (say, after an import), a reader rebuilds its
+# managers rather than refreshing them row by row.
+_MAX_REFRESHED_ROWS = 1000
+
+# How long an event waits for a busy reader before it is processed on the writer.
+_READER_WAIT_SECONDS = 1.0
+
+
+def _trigger_name(table, operation):
+    return f'p2app_{table}_{operation.lower()}'
+
+
+def _create_trigger_statements():
+    for table, column in _TRACKED_TABLES.items():
+        for operation, rows in _TRIGGERED_OPERATIONS:
+            notes = ' '.join(f"SELECT p2app_row_changed('{table}', {row}.{column});" for row in rows)
+            yield (f"CREATE TEMP TRIGGER IF NOT EXISTS {_trigger_name(table, operation)} "
+                   f"AFTER {operation} ON main.{table} BEGIN {notes} END")
+
+
+def _drop_trigger_statements():
+    for table in _TRACKED_TABLES:
+        for operation, _ in _TRIGGERED_OPERATIONS:
+            yield f"DROP TRIGGER IF EXISTS temp.{_trigger_name(table, operation)}"
+
+
+class WriterConnection(sqlite3.Connection):
+    """The connection through which a database with a ReaderPool is written, which
+    hands the rows each transaction changed to the pool as it commits."""
+
+    pool = None
+
+    def commit(self):
+        if self.pool is None:
+            super().commit()
+        else:
+            self.pool._commit(super().commit)
+
+
+class _SnapshotConnection(sqlite3.Connection):
+    """A connection that holds one read transaction open for the whole of an event.
+    Managers commit after building their temp-schema indexes; here that leaves the
+    transaction open, so the indexes are built from the same snapshot the event
+    goes on to read."""
+
+    def commit(self):
+        pass
+
+    def begin_snapshot(self):
+        self.execute("BEGIN")
+        # A read transaction takes its snapshot at its first read of the database.
+        self.execute("PRAGMA schema_version")
+
+    def end_snapshot(self):
+        super().commit()
+
+
+class _Reader:
+    def __init__(self, path, config, cached_statements, commit_lock):
+        uri = f'{Path(path).resolve().as_uri()}?mode=ro'
+        self._conn = sqlite3.connect(
+            uri, uri=True, factory=_SnapshotConnection, check_same_thread=False,
+            cached_statements=cached_statements)
+        self._config = config
+        self._managers = []
+        self._handlers = HandlerTable()
+        self._commit_lock = commit_lock
+        # The rows changed since the last event, by table, or None if the managers
+        # must be rebuilt instead.  Only changed while holding the commit lock.
+        self._changes = None
+
+    def note_changes(self, changes):
+        if self._changes is not None:
+            if changes is None:
+                self._changes = None
+                return
+
+            for table, row_ids in changes.items():
+                self._changes.setdefault(table, set()).update(row_ids)
+
+            if sum(len(row_ids) for row_ids in self._changes.values()) > _MAX_REFRESHED_ROWS:
+                self._changes = None
+
+    def process_event(self, event):
+        # No commit can happen between taking the snapshot and taking the changes,
+        # so the changes are exactly those visible in the snapshot that the managers
+        # have not yet seen.
+        with self._commit_lock:
+            self._conn.begin_snapshot()
+            changes, self._changes = self._changes, {}
+
+        try:
+            if changes is None:
+                self._open_managers()
+            else:
+                self._refresh_managers(changes)
+
+            yield from self._handlers.lookup(type(event))(event)
+        finally:
+            self._conn.end_snapshot()
+
+    def _open_managers(self):
+        self._close_managers()
+        self._managers = [manager_type(self._conn, self._config) for manager_type in manager_types()]
+
+        for manager in self._managers:
+            self._handlers.register_all(manager)
+
+    def _refresh_managers(self, changes):
+        for manager in self._managers:
+            if hasattr(manager, 'refresh'):
+                for table, row_ids in changes.items():
+                    manager.refresh(table, row_ids)
+
+    def _close_managers(self):
+        for manager in self._managers:
+            manager.close()
+
+        self._managers = []
+        self._handlers = HandlerTable()
+
+    def close(self):
+        self._close_managers()
+        self._conn.close()
+
+
+class ReaderPool:
+    """A fixed number of readers of the database that the given WriterConnection
+    has open.  An event is processed by whichever reader is idle, and keeps it until
+    the event's generator is exhausted or closed.  If all are busy, the event waits
+    a while for one, unless its thread is already holding a reader (such as when a
+    view sends an event while handling another's results), since that reader may
+    not be given back until this event is done; if none comes free, the event is
+    processed on the writer instead."""
+
+    def __init__(self, writer, path, size, config, cached_statements):
+        self._writer = writer
+        self._commit_lock = threading.Lock()
+        self._readers = [
+            _Reader(path, config, cached_statements, self._commit_lock) for _ in range(size)]
+        self._idle = queue.SimpleQueue()
+        self._held = threading.local()
+        self._lock = threading.Lock()
+        self._is_closed = False
+        self._is_tracking = True
+        self._pending_changes = {}
+
+        for reader in self._readers:
+            self._idle.put(reader)
+
+        writer.create_function('p2app_row_changed', 2, self._row_changed)
+        self._create_triggers()
+        writer.pool = self
+
+    def _create_triggers(self):
+        for statement in _create_trigger_statements():
+            self._writer.execute(statement)
+
+    def _row_changed(self, table, row_id):
+        self._pending_changes.setdefault(table, set()).add(row_id)
+
+    def _commit(self, commit):
+        # Changes of a transaction that was rolled back stay pending until the next
+        # commit; refreshing rows that didn't change is harmless.
+        with self._commit_lock:
+            commit()
+            changes = self._pending_changes if self._is_tracking else None
+            self._pending_changes = {}
+
+            for reader in self._readers:
+                reader.note_changes(changes)
+
+    @contextlib.contextmanager
+    def untracked(self):
+        """Stops noting changed rows while the body runs, for changes so large (such
+        as an import) that the readers will rebuild their managers anyway.  Without
+        the triggers, SQLite can also empty a table without visiting each row."""
+        for statement in _drop_trigger_statements():
+            self._writer.execute(statement)
+
+        self._is_tracking = False
+
+        try:
+            yield
+        finally:
+            self._is_tracking = True
+            self._create_triggers()
+
+            with self._commit_lock:
+                for reader in self._readers:
+                    reader.note_changes(None)
+
+    def _acquire(self):
+        try:
+            if getattr(self._held, 'count', 0) > 0:
+                return self._idle.get_nowait()
+            else:
+                return self._idle.get(timeout=_READER_WAIT_SECONDS)
+        except queue.Empty:
+            return None
+
+    def process_event(self, event, fallback):
+        """Processes the event on a reader, or (if none is free) by calling fallback
+        with it, which should process it on the writer."""
+        reader = self._acquire()
+
+        if reader is None:
+            yield from fallback(event)
+            return
+
+        self._held.count = getattr(self._held, 'count', 0) + 1
+
+        try:
+            yield from reader.process_event(event)
+        finally:
+            self._held.count -= 1
+
+            with self._lock:
+                if self._is_closed:
+                    reader.close()
+                else:
+                    self._idle.put(reader)
+
+    def close(self):
+        """Closes the idle readers; busy ones are closed when their events finish."""
+        with self._lock:
+            self._is_closed = True
+
+            try:
+                while True:
+                    self._idle.get_nowait().close()
+            except queue.Empty:
+                pass
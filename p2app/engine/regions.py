@@ -1,75 +1,116 @@
 # regions.py
 
 
-import sqlite3
+import itertools
 from p2app.events import *
+from .registry import handles, manager
+from .streaming import page_statement
+from .tables import TableManager
+from .text_search import match_expression, text_index_statements
 
 
-class RegionManager:
-    def __init__(self, connection):
-        self._conn = connection
+_SEARCH_COLUMNS = ('region_code', 'local_code', 'name')
 
+
+def _search_condition(key):
+    conditions = [f"{column} = ?" for column, used in zip(_SEARCH_COLUMNS, key) if used]
+    return ' AND '.join(conditions) if conditions else None
+
+
+def _build_search_statements():
+    # One statement per combination of supplied criteria, keyed by a tuple of
+    # booleans in _SEARCH_COLUMNS order, so a search never formats SQL at runtime.
+    statements = {}
+
+    for key in itertools.product((False, True), repeat=len(_SEARCH_COLUMNS)):
+        condition = _search_condition(key)
+
+        if condition:
+            statements[key] = f"SELECT * FROM region WHERE {condition}"
+        else:
+            statements[key] = "SELECT * FROM region"
+
+    return statements
+
+
+def _build_page_statements():
+    # Keyed like _SEARCHES, plus whether the page continues from an earlier one.
+    return {
+        (key, is_continued): page_statement('region', 'region_id', _search_condition(key), is_continued)
+        for key in itertools.product((False, True), repeat=len(_SEARCH_COLUMNS))
+        for is_continued in (False, True)
+    }
+
+
+# Statement table for the region manager; see continents.py.
+_SEARCHES = _build_search_statements()
+_PAGES = _build_page_statements()
+_TEXT_COLUMNS = ('name', 'keywords')
+_TEXT_INDEX, _TEXT_STATEMENTS = text_index_statements('region', 'region_id', _TEXT_COLUMNS)
+_LOAD = "SELECT * FROM region WHERE region_id = ?"
+_INSERT = ("INSERT INTO region (region_code, local_code, name, continent_id, country_id) "
+           "VALUES (?, ?, ?, ?, ?)")
+_UPDATE = ("UPDATE region SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ? "
+           "WHERE region_id = ?")
+
+STATEMENTS = (*_SEARCHES.values(), *_PAGES.values(), _LOAD, _INSERT, _UPDATE, *_TEXT_STATEMENTS)
+TEMP_TABLES = (_TEXT_INDEX,)
+
+
+@manager
+class RegionManager(TableManager):
+    table = 'region'
+    id_column = 'region_id'
+    row_type = Region
+    text_columns = _TEXT_COLUMNS
+    columns = ('region_code', 'local_code', 'name', 'continent_id', 'country_id')
+
+    load_statement = _LOAD
+    insert_statement = _INSERT
+    update_statement = _UPDATE
+    page_statements = _PAGES
+
+    result_event = RegionSearchResultEvent
+    results_event = RegionSearchResultsEvent
+    more_results_event = MoreRegionSearchResultsEvent
+    no_more_results_event = NoMoreRegionSearchResultsEvent
+    saved_event = RegionSavedEvent
+    save_failed_event = SaveRegionFailedEvent
+
+    @handles(StartRegionSearchEvent, read_only=True)
     def start_region_search(self, event):
-        search_criteria = []
-        conditions = []
-
-        if event.region_code() is not None:
-            search_criteria.append(event.region_code())
-            conditions.append("region_code = ?")
-        if event.local_code() is not None:
-            search_criteria.append(event.local_code())
-            conditions.append("local_code = ?")
-        if event.name() is not None:
-            search_criteria.append(event.name())
-            conditions.append("name = ?")
-
-        where_clause = " AND ".join(conditions)
-        if where_clause:
-            query = f"SELECT * FROM region WHERE {where_clause}"
+        region_code, local_code, name = criteria = event.region_code(), event.local_code(), event.name()
+        key = region_code is not None, local_code is not None, name is not None
+        search_criteria = [value for value in criteria if value is not None]
+
+        if event.page_size() is not None:
+            yield from self._page(event, key, criteria, search_criteria)
         else:
-            query = "SELECT * FROM region"
+            regions = self._search(('equal', *criteria), _SEARCHES[key], search_criteria)
+            yield from self._results(event, regions)
+
+    @handles(StartRegionTextSearchEvent, read_only=True)
+    def start_region_text_search(self, event):
+        expression = match_expression(event.text(), event.prefix())
 
-        cursor = self._conn.cursor()
-        cursor.execute(query, search_criteria)
-        _regions = cursor.fetchall()
-        cursor.close()
-        for region in _regions:
-            yield RegionSearchResultEvent(Region(*region))
+        if expression is not None:
+            yield from self._results(event, self._text_search(expression))
 
+    @handles(LoadRegionEvent, read_only=True)
     def load_region(self, event):
-        region_id = event.region_id()
-        query = "SELECT * FROM region WHERE region_id = ?"
-        cursor = self._conn.cursor()
-        cursor.execute(query, (region_id,))
-        _regions = cursor.fetchall()
-        cursor.close()
-        for _region in _regions:
-            yield RegionLoadedEvent(Region(*_region))
+        _region = self._lookup(event.region_id())
 
+        if _region:
+            yield RegionLoadedEvent(_region)
+
+    @handles(SaveNewRegionEvent)
     def save_new_region(self, event):
-        _region = event.region()
-        try:
-            query = ("INSERT INTO region (region_code, local_code, name, continent_id, country_id)"
-                     "VALUES (?, ?, ?, ?, ?)")
-            cursor = self._conn.cursor()
-            cursor.execute(query, (_region.region_code, _region.local_code, _region.name,
-                                   _region.continent_id, _region.country_id))
-            self._conn.commit()
-            cursor.close()
-            yield RegionSavedEvent(_region)
-        except sqlite3.Error as e:
-            yield SaveRegionFailedEvent(str(e))
+        yield from self._save_new(event.region())
 
+    @handles(SaveRegionEvent)
     def save_region(self, event):
-        _region = event.region()
-        try:
-            query = ("UPDATE region SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?"
-                     "WHERE region_id = ?")
-            cursor = self._conn.cursor()
-            cursor.execute(query, (_region.region_code, _region.local_code, _region.name, _region.continent_id,
-                                   _region.country_id, _region.region_id))
-            self._conn.commit()
-            cursor.close()
-            yield RegionSavedEvent(_region)
-        except sqlite3.Error as e:
-            yield SaveRegionFailedEvent(str(e))
+        yield from self._save(event.region())
+
+    @handles(SaveRegionBatchEvent)
+    def save_region_batch(self, event):
+        yield from self._save_batch(event.regions())
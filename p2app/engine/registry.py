@@ -0,0 +1,78 @@
+# registry.py
+#
+# Type-keyed dispatch of events to the engine's handlers.
+#
+# Handlers are generator methods marked with @handles(SomeEvent).  Classes that
+# handle events against an open database are marked with @manager; the engine
+# creates one instance of each whenever a database is opened, so support for
+# another table only requires a new manager module imported by the package.
+
+
+_MANAGER_TYPES = []
+
+
+def handles(*event_types, read_only=False):
+    """Marks a generator method as the handler for the given event types.  Handlers
+    that never write to the database are marked read_only, which lets the engine run
+    them on a pooled read-only connection when it has one."""
+    def decorate(function):
+        function._handled_event_types = event_types
+        function._is_read_only = read_only
+        return function
+
+    return decorate
+
+
+def is_read_only(handler):
+    return getattr(handler, '_is_read_only', False)
+
+
+def manager(cls):
+    """Registers a class whose instances are created, with the database connection
+    and the engine's EngineConfig, each time a database is opened."""
+    _MANAGER_TYPES.append(cls)
+    return cls
+
+
+def manager_types():
+    return tuple(_MANAGER_TYPES)
+
+
+class _ResolvedHandlers(dict):
+    # The handler of each event class looked up so far, found along its MRO the
+    # first time it is missing.
+    def __init__(self, handlers):
+        super().__init__()
+        self._handlers = handlers
+
+    def __missing__(self, event_type):
+        handler = next(
+            (self._handlers[base] for base in event_type.__mro__ if base in self._handlers),
+            None)
+
+        self[event_type] = handler
+        return handler
+
+
+class HandlerTable:
+    """Maps event classes to bound handler methods.  Lookups are a single dictionary
+    access; event classes without a handler of their own are resolved once along
+    their MRO and the answer is cached."""
+
+    def __init__(self):
+        self._handlers = {}
+        self._resolved = _ResolvedHandlers(self._handlers)
+        # The dictionary's own method, so that a lookup runs no Python code at all
+        # once the event class has been resolved.
+        self.lookup = self._resolved.__getitem__
+
+    def register(self, event_type, handler):
+        self._handlers[event_type] = handler
+        self._resolved.clear()
+
+    def register_all(self, owner):
+        for name in dir(type(owner)):
+            function = getattr(type(owner), name)
+
+            for event_type in getattr(function, '_handled_event_types', ()):
+                self.register(event_type, getattr(owner, name))
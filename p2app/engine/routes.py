@@ -0,0 +1,135 @@
+# routes.py
+#
+# Multi-hop routes between airports for an aircraft with a limited range that
+# needs a runway of some minimum length at every stop.
+
+
+import heapq
+import math
+from collections import OrderedDict
+from .geo import EARTH_RADIUS_KM, haversine_km
+from .grid import SpatialGrid
+
+
+# Grid cells are as tall as the aircraft's range, but no smaller than this, so
+# short ranges don't spread the airports over millions of nearly empty cells.
+_MIN_CELL_DEGREES = 0.25
+
+# Airports that can be a stop on a route are those with an open runway at least
+# the required length.  The subquery is written with IN, which SQLite evaluates
+# once (searching the recommended index on runway.length_ft, if the database has
+# it), rather than as an EXISTS checked for every airport.
+_QUALIFYING_AIRPORTS = (
+    "SELECT airport_id, latitude_deg, longitude_deg FROM airport WHERE airport_id IN "
+    "(SELECT airport_id FROM runway WHERE length_ft >= ? AND closed = 0)")
+
+STATEMENTS = (_QUALIFYING_AIRPORTS,)
+
+
+class RouteGraph:
+    """The airports with a qualifying runway, in a SpatialGrid whose cells are
+    about as tall as the aircraft's range.  An airport's neighbors, the airports
+    within range of it, are found by checking only the cells that cover its
+    range, and are remembered once found, so the graph's edges are built up by the
+    searches that need them."""
+
+    def __init__(self, connection, max_range_km, min_runway_length_ft):
+        self._max_range_km = max_range_km
+        self._grid = SpatialGrid(max(math.degrees(max_range_km / EARTH_RADIUS_KM), _MIN_CELL_DEGREES))
+        self._neighbors = {}
+
+        for airport_id, latitude, longitude in connection.execute(
+                _QUALIFYING_AIRPORTS, (min_runway_length_ft,)):
+            self._grid.add(airport_id, latitude, longitude)
+
+    def __contains__(self, airport_id):
+        return airport_id in self._grid
+
+    def __len__(self):
+        return len(self._grid)
+
+    def distance_km(self, airport_id1, airport_id2):
+        return haversine_km(*self._grid.position(airport_id1), *self._grid.position(airport_id2))
+
+    def neighbors(self, airport_id):
+        """Returns (distance_km, airport_id) pairs for every other airport in the
+        graph within range of the given one."""
+        neighbors = self._neighbors.get(airport_id)
+
+        if neighbors is None:
+            within = self._grid.within(*self._grid.position(airport_id), self._max_range_km)
+            neighbors = [(distance, other_id) for distance, other_id in within if other_id != airport_id]
+            self._neighbors[airport_id] = neighbors
+
+        return neighbors
+
+    def shortest_path(self, start_id, goal_id):
+        """Returns the airport ids along the shortest route from start_id to goal_id,
+        or None if there is none.  This is an A* search whose heuristic, the
+        great-circle distance to the goal, never overestimates the remaining
+        distance, so the first time the goal is reached is along a shortest route."""
+        goal_position = self._grid.position(goal_id)
+
+        def remaining(airport_id):
+            return haversine_km(*self._grid.position(airport_id), *goal_position)
+
+        distances = {start_id: 0.0}
+        previous = {}
+        visited = set()
+        frontier = [(remaining(start_id), 0.0, start_id)]
+
+        while frontier:
+            _, distance, airport_id = heapq.heappop(frontier)
+
+            if airport_id == goal_id:
+                path = [goal_id]
+
+                while path[-1] != start_id:
+                    path.append(previous[path[-1]])
+
+                return path[::-1]
+
+            if airport_id in visited:
+                continue
+
+            visited.add(airport_id)
+
+            for leg, neighbor_id in self.neighbors(airport_id):
+                neighbor_distance = distance + leg
+
+                if neighbor_distance < distances.get(neighbor_id, math.inf):
+                    distances[neighbor_id] = neighbor_distance
+                    previous[neighbor_id] = airport_id
+                    heapq.heappush(
+                        frontier, (neighbor_distance + remaining(neighbor_id), neighbor_distance, neighbor_id))
+
+        return None
+
+
+class RoutePlanner:
+    """A least-recently-used cache of route graphs, one for each combination of
+    range and runway length asked about since the database was opened."""
+
+    def __init__(self, connection, capacity):
+        self._conn = connection
+        self._capacity = capacity
+        self._graphs = OrderedDict()
+
+    def graph(self, max_range_km, min_runway_length_ft):
+        key = (max_range_km, min_runway_length_ft)
+        graph = self._graphs.get(key)
+
+        if graph is None:
+            graph = RouteGraph(self._conn, max_range_km, min_runway_length_ft)
+            self._graphs[key] = graph
+
+            if len(self._graphs) > self._capacity:
+                self._graphs.popitem(last=False)
+        else:
+            self._graphs.move_to_end(key)
+
+        return graph
+
+    def invalidate(self):
+        """Discards every graph, after an airport was inserted or moved."""
+        self._graphs.clear()
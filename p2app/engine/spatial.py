@@ -0,0 +1,130 @@
+# spatial.py
+
+
+import heapq
+import math
+from collections import namedtuple
+from .geo import EARTH_RADIUS_KM, MAX_DISTANCE_KM, haversine_km, longitude_boxes, radius_boxes
+
+
+# How much nearest() grows its search radius when the radius holds too few points,
+# and the smallest radius it starts from.
+_RADIUS_GROWTH = 2.0
+_MIN_RADIUS_KM = 1.0
+
+
+_Statements = namedtuple(
+    '_Statements', ['drop', 'create', 'fill', 'delete', 'insert', 'search', 'positions'])
+
+
+def _statements(table, id_column):
+    index_table = f'{table}_rtree'
+    fill = (f"INSERT INTO temp.{index_table} "
+            f"SELECT {id_column}, latitude_deg, latitude_deg, longitude_deg, longitude_deg "
+            f"FROM main.{table}")
+    box_condition = ("WHERE r.min_latitude <= ? AND r.max_latitude >= ? "
+                     "AND r.min_longitude <= ? AND r.max_longitude >= ?")
+
+    return _Statements(
+        drop=f"DROP TABLE IF EXISTS temp.{index_table}",
+        create=(f"CREATE VIRTUAL TABLE temp.{index_table} "
+                f"USING rtree(id, min_latitude, max_latitude, min_longitude, max_longitude)"),
+        fill=fill,
+        delete=f"DELETE FROM temp.{index_table} WHERE id = ?",
+        insert=f"{fill} WHERE {id_column} = ?",
+        search=(f"SELECT t.* FROM temp.{index_table} AS r "
+                f"JOIN main.{table} AS t ON t.{id_column} = r.id {box_condition}"),
+        positions=(f"SELECT t.{id_column}, t.latitude_deg, t.longitude_deg "
+                   f"FROM temp.{index_table} AS r "
+                   f"JOIN main.{table} AS t ON t.{id_column} = r.id {box_condition}"))
+
+
+def spatial_index_statements(table, id_column):
+    """Returns the statement that creates the spatial index over a table, and the
+    statements that use the index, for the index advisor to check."""
+    statements = _statements(table, id_column)
+    return statements.create, (statements.delete, statements.insert, statements.search,
+                               statements.positions)
+
+
+class SpatialIndex:
+    """An R*Tree over the latitude and longitude of each row of one table.  Like
+    TextIndex, it lives in the connection's temp schema, is built on first use and
+    is kept current by the owning manager calling update() whenever it saves a row.
+
+    The R*Tree stores 32-bit coordinates, so it only narrows the search down to
+    candidates; exact coordinates from the table decide the final answer."""
+
+    def __init__(self, connection, table, id_column):
+        self._conn = connection
+        self._statements = _statements(table, id_column)
+        self._is_built = False
+        self._row_count = 0
+
+    def _ensure_built(self):
+        if not self._is_built:
+            self._conn.execute(self._statements.drop)
+            self._conn.execute(self._statements.create)
+            self._row_count = self._conn.execute(self._statements.fill).rowcount
+            self._conn.commit()
+            self._is_built = True
+
+    def box_queries(self, min_latitude, min_longitude, max_latitude, max_longitude):
+        """Returns (statement, parameters) pairs whose rows together are the candidates
+        inside the box, which crosses the antimeridian if min_longitude exceeds
+        max_longitude.  Builds the index if this is its first use."""
+        self._ensure_built()
+
+        return [self._box_query(box) for box in longitude_boxes(
+            min_latitude, min_longitude, max_latitude, max_longitude)]
+
+    def _box_parameters(self, box):
+        min_latitude, min_longitude, max_latitude, max_longitude = box
+        return max_latitude, min_latitude, max_longitude, min_longitude
+
+    def _box_query(self, box):
+        return self._statements.search, self._box_parameters(box)
+
+    def nearest(self, latitude, longitude, count):
+        """Returns (distance_km, id) pairs for the count rows nearest the given point,
+        nearest first.
+
+        Searches a growing radius until it holds at least count rows: every row within
+        the radius is inside the boxes searched, so the nearest count of them are the
+        nearest overall."""
+        self._ensure_built()
+        radius = self._initial_radius(count)
+
+        while True:
+            within = []
+
+            for box in radius_boxes(latitude, longitude, radius):
+                positions = self._conn.execute(self._statements.positions, self._box_parameters(box))
+
+                for row_id, row_latitude, row_longitude in positions:
+                    distance = haversine_km(latitude, longitude, row_latitude, row_longitude)
+
+                    if distance <= radius:
+                        within.append((distance, row_id))
+
+            if len(within) >= count or radius >= MAX_DISTANCE_KM:
+                return heapq.nsmallest(count, within, key=lambda pair: pair[0])
+
+            radius = min(radius * _RADIUS_GROWTH, MAX_DISTANCE_KM)
+
+    def _initial_radius(self, count):
+        # The radius of a circle expected to hold count points if the rows were
+        # spread evenly over the Earth.  Real data is clustered, so this errs both
+        # ways, but it saves most of the growth steps a fixed start would take.
+        area_per_row = 4 * math.pi * EARTH_RADIUS_KM ** 2 / max(self._row_count, 1)
+        return min(max(math.sqrt(count * area_per_row / math.pi), _MIN_RADIUS_KM), MAX_DISTANCE_KM)
+
+    def update(self, row_id):
+        """Reindexes one row after it was inserted or updated, in the caller's
+        transaction."""
+        if self._is_built:
+            self._conn.execute(self._statements.delete, (row_id,))
+            self._conn.execute(self._statements.insert, (row_id,))
+
+    def invalidate(self):
+        self._is_built = False
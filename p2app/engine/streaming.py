@@ -0,0 +1,104 @@
+# streaming.py
+
+
+def batched(items, size):
+    """Yields the items in lists of up to size, as soon as each list is full."""
+    batch = []
+
+    for item in items:
+        batch.append(item)
+
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+class SearchStream:
+    """Runs the searches of one manager, yielding rows as they arrive in batches of
+    fetchmany() rather than materializing the whole result first.  Starting a new
+    search supersedes the one in progress, which stops at its next row.
+
+    Since only one search is ever in progress, they all share one cursor, which a
+    new search takes over from the one it supersedes."""
+
+    def __init__(self, connection, batch_size):
+        self._conn = connection
+        self._cursor = connection.cursor()
+        self._batch_size = batch_size
+        self._generation = 0
+        self._fetched = []
+
+    def rows(self, query, parameters, on_complete=None):
+        """Runs the query, returning an iterator of its rows.  If the search runs to the
+        end without being superseded, on_complete (if given) is called after the last
+        row."""
+        self._generation += 1
+        self._fetched.clear()
+        self._cursor.execute(query, parameters)
+        batch = self._cursor.fetchmany(self._batch_size)
+
+        if len(batch) < self._batch_size and on_complete is None:
+            # Every row has arrived, so there is nothing left to stream and no need for
+            # a generator to watch for a newer search, which empties the list instead.
+            self._fetched = batch
+            return iter(batch)
+        else:
+            return self._stream(self._generation, batch, on_complete)
+
+    def _stream(self, generation, batch, on_complete):
+        is_finished = False
+
+        try:
+            while batch:
+                for row in batch:
+                    if generation != self._generation:
+                        return
+
+                    yield row
+
+                # A short batch is the last, so there is no need to ask for another.
+                if len(batch) < self._batch_size:
+                    break
+                elif generation != self._generation:
+                    return
+
+                batch = self._cursor.fetchmany(self._batch_size)
+
+            is_finished = True
+        finally:
+            # A search abandoned part way through would otherwise keep its statement
+            # (and the read lock it holds) until the next search.
+            if not is_finished and generation == self._generation:
+                self._cursor.close()
+                self._cursor = self._conn.cursor()
+
+        if on_complete is not None and generation == self._generation:
+            on_complete()
+
+    def cancel(self):
+        """Stops the search in progress, if any."""
+        self._generation += 1
+        self._fetched.clear()
+
+    def close(self):
+        """Stops the search in progress, if any, and releases the cursor."""
+        self.cancel()
+        self._cursor.close()
+
+
+def page_statement(table, id_column, condition, is_continued):
+    """Returns the statement for one page of a keyset-paginated search: the rows of
+    the table matching the condition (or every row, if it is None), in id order,
+    limited by a last parameter.  If is_continued, only rows whose id is greater
+    than the parameter before it are included, so each page continues from the
+    last id of the one before without counting off the rows in between."""
+    conditions = [f"({condition})"] if condition is not None else []
+
+    if is_continued:
+        conditions.append(f"{id_column} > ?")
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT * FROM {table}{where} ORDER BY {id_column} LIMIT ?"
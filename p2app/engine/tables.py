@@ -0,0 +1,229 @@
+# tables.py
+#
+# What the continent, country and region managers have in common: each keeps an
+# entity cache, a query cache and a text index over one table, and searches,
+# pages through, loads and saves its rows in the same way.  A manager subclasses
+# TableManager, fills in the class attributes naming its table, row type,
+# statements and events, and keeps only the handlers, which are what differ.
+
+
+import sqlite3
+from functools import partial
+from operator import attrgetter
+from .batches import save_batch
+from .cache import EntityCache, QueryCache
+from .streaming import SearchStream, batched
+from .text_search import TextIndex
+
+
+_REQUIRED_ATTRIBUTES = (
+    'table', 'id_column', 'row_type', 'columns',
+    'load_statement', 'insert_statement', 'update_statement', 'page_statements',
+    'result_event', 'results_event', 'more_results_event', 'no_more_results_event',
+    'saved_event', 'save_failed_event')
+
+
+class TableManager:
+    """A base class for the manager of one table of searchable rows.  It is not a
+    manager itself; subclasses are marked with @manager and must set:
+
+    - table, id_column, row_type and text_columns (those in the text index);
+    - columns, the row's fields in the order the insert statement takes them,
+      which the update statement takes too, followed by the id;
+    - the load, insert and update statements, and the page statements, keyed by
+      (shape, is_continued), where the shape is whatever the subclass uses to
+      tell its queries apart;
+    - the result, results, more_results, no_more_results, saved and save_failed
+      event classes.
+
+    Defining a subclass that leaves any of them unset raises a TypeError."""
+
+    table = None
+    id_column = None
+    row_type = None
+    text_columns = ('name',)
+    columns = None
+
+    load_statement = None
+    insert_statement = None
+    update_statement = None
+    page_statements = None
+
+    result_event = None
+    results_event = None
+    more_results_event = None
+    no_more_results_event = None
+    saved_event = None
+    save_failed_event = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        unset = [name for name in _REQUIRED_ATTRIBUTES if getattr(cls, name) is None]
+
+        if unset:
+            raise TypeError(f"{cls.__name__} does not set {', '.join(unset)}")
+
+        cls._id = staticmethod(attrgetter(cls.id_column))
+        cls._insert_parameters = staticmethod(attrgetter(*cls.columns))
+        cls._update_parameters = staticmethod(attrgetter(*cls.columns, cls.id_column))
+
+    def __init__(self, connection, config):
+        self._conn = connection
+        self._cursor = connection.cursor()
+        self._searches = SearchStream(connection, config.search_batch_size)
+        self._batch_size = config.search_batch_size
+        self._cache = EntityCache(self.table, config.entity_cache_size)
+        self._queries = QueryCache(self.table, config.query_cache_size, config.entity_cache_size)
+
+        # Without the caches, rows and searches skip the steps that would fill them.
+        if config.entity_cache_size == 0:
+            # What namedtuple's _make() does, less its length check, without a frame.
+            self._remember = partial(tuple.__new__, self.row_type)
+            self._lookup = self._load
+
+        if config.query_cache_size == 0:
+            self._search = self._run_search
+
+        self._text_index = TextIndex(connection, self.table, self.id_column, self.text_columns)
+
+    def close(self):
+        self._searches.close()
+        self._cursor.close()
+
+    def refresh(self, table, row_ids):
+        """Brings the caches and indexes up to date with rows of the given table that
+        another connection changed."""
+        if table == self.table:
+            self._queries.bump()
+
+            for row_id in row_ids:
+                self._cache.invalidate(row_id)
+                self._text_index.update(row_id)
+
+    def cache_statistics(self):
+        return self._cache.statistics()
+
+    def query_cache_statistics(self):
+        return self._queries.statistics()
+
+    def _remember(self, row):
+        entity = self.row_type(*row)
+        self._cache.put(self._id(entity), entity)
+        return entity
+
+    def _lookup(self, row_id):
+        entity = self._cache.get(row_id)
+
+        if entity is None:
+            entity = self._load(row_id)
+
+        return entity
+
+    def _load(self, row_id):
+        self._cursor.execute(self.load_statement, (row_id,))
+        row = self._cursor.fetchone()
+        return self._remember(row) if row else None
+
+    def _search(self, key, query, parameters):
+        # Answers a repeated search from the query and entity caches; otherwise runs
+        # it, caching the ids found if no save or newer search interrupts it.
+        ids = self._queries.get(key)
+
+        if ids is not None:
+            return filter(None, map(self._lookup, ids))
+        else:
+            return self._search_and_cache(key, query, parameters)
+
+    def _run_search(self, key, query, parameters):
+        return map(self._remember, self._searches.rows(query, parameters))
+
+    def _search_and_cache(self, key, query, parameters):
+        found = []
+        generation = self._queries.generation()
+
+        def complete():
+            self._queries.put(key, generation, found)
+
+        for row in self._searches.rows(query, parameters, complete):
+            entity = self._remember(row)
+            found.append(self._id(entity))
+            yield entity
+
+    def _text_search(self, expression):
+        query = self._text_index.search_statement()
+        return self._search(('text', expression.casefold()), query, (expression,))
+
+    def _results(self, event, entities):
+        # An iterator rather than a generator, which would add a frame to every search
+        # and a step through it to every result.
+        if event.batch_results():
+            return map(self.results_event, batched(entities, self._batch_size))
+        else:
+            return map(self.result_event, entities)
+
+    def _page(self, event, shape, criteria, parameters):
+        # Fetches one row past the page, only to learn whether there are more.
+        page_size = max(event.page_size(), 1)
+        is_continued = event.after_id() is not None
+        query = self.page_statements[shape, is_continued]
+        parameters = [*parameters, *([event.after_id()] if is_continued else []), page_size + 1]
+
+        entities = list(self._search(
+            ('page', *criteria, event.after_id(), page_size), query, parameters))
+        yield from self._results(event, entities[:page_size])
+
+        if len(entities) > page_size:
+            yield self.more_results_event(self._id(entities[page_size - 1]))
+        else:
+            yield self.no_more_results_event()
+
+    def _save_new(self, entity):
+        try:
+            self._cursor.execute(self.insert_statement, self._insert_parameters(entity))
+            self._text_index.update(self._cursor.lastrowid)
+            self._conn.commit()
+            self._queries.bump()
+            yield self.saved_event(entity)
+        except sqlite3.Error as e:
+            yield self.save_failed_event(str(e))
+
+    def _save(self, entity):
+        try:
+            self._cursor.execute(self.update_statement, self._update_parameters(entity))
+            self._text_index.update(self._id(entity))
+            self._conn.commit()
+            self._queries.bump()
+            self._cache.invalidate(self._id(entity))
+            yield self.saved_event(entity)
+        except sqlite3.Error as e:
+            yield self.save_failed_event(str(e))
+
+    def _save_batch(self, entities):
+        inserts = []
+        updates = []
+
+        for position, entity in enumerate(entities):
+            if self._id(entity) is None:
+                inserts.append((position, self._insert_parameters(entity)))
+            else:
+                updates.append((position, self._update_parameters(entity)))
+
+        failures = save_batch(
+            self._conn, [(self.insert_statement, inserts), (self.update_statement, updates)])
+
+        if failures:
+            for position, reason in failures:
+                if position is None:
+                    # No row failed on its own, but none of them was kept either.
+                    for row in range(len(entities)):
+                        yield self.save_failed_event(f"Row {row}: batch not saved: {reason}")
+                else:
+                    yield self.save_failed_event(f"Row {position}: {reason}")
+        else:
+            self._queries.bump()
+            self._text_index.invalidate()
+
+            for entity in entities:
+                self._cache.invalidate(self._id(entity))
+                yield self.saved_event(entity)
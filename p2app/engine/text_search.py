@@ -0,0 +1,90 @@
+# text_search.py
+
+
+import re
+from collections import namedtuple
+
+
+_TOKEN = re.compile(r'\w+')
+_NAME_WEIGHT = 10.0
+_OTHER_WEIGHT = 1.0
+
+
+def match_expression(text, prefix):
+    """Turns free text typed by a user into an FTS5 MATCH expression requiring every
+    word, each quoted so that FTS5 operators in the input are taken literally.
+    Returns None if the text contains no words."""
+    tokens = _TOKEN.findall(text)
+
+    if not tokens:
+        return None
+
+    suffix = '*' if prefix else ''
+    return ' '.join(f'"{token}"{suffix}' for token in tokens)
+
+
+_Statements = namedtuple('_Statements', ['drop', 'create', 'fill', 'delete', 'insert', 'search'])
+
+
+def _statements(table, id_column, columns):
+    index_table = f'{table}_fts'
+    column_list = ', '.join(columns)
+    weights = ', '.join(
+        str(_NAME_WEIGHT if column == 'name' else _OTHER_WEIGHT) for column in columns)
+    fill = (f"INSERT INTO temp.{index_table} (rowid, {column_list}) "
+            f"SELECT {id_column}, {column_list} FROM main.{table}")
+
+    return _Statements(
+        drop=f"DROP TABLE IF EXISTS temp.{index_table}",
+        create=(f"CREATE VIRTUAL TABLE temp.{index_table} "
+                f"USING fts5({column_list}, tokenize = 'unicode61 remove_diacritics 2')"),
+        fill=fill,
+        delete=f"DELETE FROM temp.{index_table} WHERE rowid = ?",
+        insert=f"{fill} WHERE {id_column} = ?",
+        search=(f"SELECT t.* FROM temp.{index_table} AS f "
+                f"JOIN main.{table} AS t ON t.{id_column} = f.rowid "
+                f"WHERE f.{index_table} MATCH ? "
+                f"ORDER BY bm25(f.{index_table}, {weights})"))
+
+
+def text_index_statements(table, id_column, columns):
+    """Returns the statement that creates the text index over the given columns of a
+    table, and the statements that use the index, for the index advisor to check."""
+    statements = _statements(table, id_column, columns)
+    return statements.create, (statements.delete, statements.insert, statements.search)
+
+
+class TextIndex:
+    """An FTS5 index over some text columns of one table, for token, prefix and ranked
+    matching.  The index lives in the connection's temp schema, so the database file
+    is never modified; it is built on first use and then kept current by the owning
+    manager calling update() whenever it saves a row."""
+
+    def __init__(self, connection, table, id_column, columns):
+        self._conn = connection
+        self._statements = _statements(table, id_column, columns)
+        self._is_built = False
+
+    def search_statement(self):
+        """Returns the query that finds the rows matching a match_expression(), best
+        match first, building the index if this is its first use."""
+        if not self._is_built:
+            self._conn.execute(self._statements.drop)
+            self._conn.execute(self._statements.create)
+            self._conn.execute(self._statements.fill)
+            self._conn.commit()
+            self._is_built = True
+
+        return self._statements.search
+
+    def update(self, row_id):
+        """Reindexes one row after it was inserted or updated.  Runs in the caller's
+        transaction, so the index commits or rolls back along with the row."""
+        if self._is_built:
+            self._conn.execute(self._statements.delete, (row_id,))
+            self._conn.execute(self._statements.insert, (row_id,))
+
+    def invalidate(self):
+        """Discards the index after a change too broad for update(), such as a batch
+        save; it is rebuilt on its next use."""
+        self._is_built = False
@@ -0,0 +1,233 @@
+# p2app/events/airports.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Events that are either related to searching for, creating, or editing airports
+# in the database, including searches by location.
+
+from collections import namedtuple
+
+
+
+Airport = namedtuple(
+    'Airport',
+    ['airport_id', 'airport_ident', 'type', 'name', 'latitude_deg', 'longitude_deg',
+     'elevation_ft', 'continent_id', 'country_id', 'region_id', 'municipality',
+     'scheduled_service', 'gps_code', 'iata_code', 'local_code', 'home_link',
+     'wikipedia_link', 'keywords'])
+
+Airport.__annotations__ = {
+    'airport_id': int | None,
+    'airport_ident': str | None,
+    'type': str | None,
+    'name': str | None,
+    'latitude_deg': float | None,
+    'longitude_deg': float | None,
+    'elevation_ft': int | None,
+    'continent_id': str | None,
+    'country_id': int | None,
+    'region_id': int | None,
+    'municipality': str | None,
+    'scheduled_service': int | None,
+    'gps_code': str | None,
+    'iata_code': str | None,
+    'local_code': str | None,
+    'home_link': str | None,
+    'wikipedia_link': str | None,
+    'keywords': str | None
+}
+
+
+
+class StartAirportTextSearchEvent:
+    def __init__(self, text: str, prefix: bool = True):
+        self._text = text
+        self._prefix = prefix
+
+
+    def text(self) -> str:
+        return self._text
+
+
+    def prefix(self) -> bool:
+        return self._prefix
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: text = {repr(self._text)}, prefix = {repr(self._prefix)}'
+
+
+
+class StartAirportBoxSearchEvent:
+    def __init__(
+            self, min_latitude: float, min_longitude: float,
+            max_latitude: float, max_longitude: float):
+        self._min_latitude = min_latitude
+        self._min_longitude = min_longitude
+        self._max_latitude = max_latitude
+        self._max_longitude = max_longitude
+
+
+    def min_latitude(self) -> float:
+        return self._min_latitude
+
+
+    def min_longitude(self) -> float:
+        return self._min_longitude
+
+
+    def max_latitude(self) -> float:
+        return self._max_latitude
+
+
+    def max_longitude(self) -> float:
+        return self._max_longitude
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: min_latitude = {repr(self._min_latitude)}, ' + \
+               f'min_longitude = {repr(self._min_longitude)}, ' + \
+               f'max_latitude = {repr(self._max_latitude)}, max_longitude = {repr(self._max_longitude)}'
+
+
+
+class StartNearestAirportsSearchEvent:
+    def __init__(self, latitude: float, longitude: float, count: int):
+        self._latitude = latitude
+        self._longitude = longitude
+        self._count = count
+
+
+    def latitude(self) -> float:
+        return self._latitude
+
+
+    def longitude(self) -> float:
+        return self._longitude
+
+
+    def count(self) -> int:
+        return self._count
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: latitude = {repr(self._latitude)}, ' + \
+               f'longitude = {repr(self._longitude)}, count = {repr(self._count)}'
+
+
+
+class AirportSearchResultEvent:
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class NearestAirportResultEvent:
+    def __init__(self, airport: Airport, distance_km: float):
+        self._airport = airport
+        self._distance_km = distance_km
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def distance_km(self) -> float:
+        return self._distance_km
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}, distance_km = {repr(self._distance_km)}'
+
+
+
+class LoadAirportEvent:
+    def __init__(self, airport_id: int):
+        self._airport_id = airport_id
+
+
+    def airport_id(self) -> int:
+        return self._airport_id
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_id = {repr(self._airport_id)}'
+
+
+
+class AirportLoadedEvent:
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class SaveNewAirportEvent:
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class SaveAirportEvent:
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class AirportSavedEvent:
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class SaveAirportFailedEvent:
+    def __init__(self, reason: str):
+        self._reason = reason
+
+
+    def reason(self) -> str:
+        return self._reason
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: reason = {repr(self._reason)}'
@@ -7,8 +7,6 @@
 # in the database.
 #
 # See the project write-up for details on when these events are sent and by whom.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 from collections import namedtuple
 
@@ -25,9 +23,14 @@ Continent.__annotations__ = {
 
 
 class StartContinentSearchEvent:
-    def __init__(self, continent_code: str, name: str):
+    def __init__(
+            self, continent_code: str, name: str, batch_results: bool = False,
+            page_size: int | None = None, after_id: int | None = None):
         self._continent_code = continent_code
         self._name = name
+        self._batch_results = batch_results
+        self._page_size = page_size
+        self._after_id = after_id
 
 
     def continent_code(self) -> str:
@@ -38,8 +41,57 @@ class StartContinentSearchEvent:
         return self._name
 
 
+    def batch_results(self) -> bool:
+        """Whether the results are wanted in lists of rows, as ContinentSearchResultsEvents,
+        rather than as one ContinentSearchResultEvent per row."""
+        return self._batch_results
+
+
+    def page_size(self) -> int | None:
+        """If not None, the most results wanted.  They come in continent_id order, followed
+        by a MoreContinentSearchResultsEvent if there are more or a
+        NoMoreContinentSearchResultsEvent if not."""
+        return self._page_size
+
+
+    def after_id(self) -> int | None:
+        """When a page_size is given, the continent_id the results start after: None for
+        the first page, or the after_id of the MoreContinentSearchResultsEvent that
+        ended the previous page."""
+        return self._after_id
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: continent_code = {repr(self._continent_code)}, ' + \
+               f'name = {repr(self._name)}, batch_results = {repr(self._batch_results)}, ' + \
+               f'page_size = {repr(self._page_size)}, after_id = {repr(self._after_id)}'
+
+
+
+class StartContinentTextSearchEvent:
+    def __init__(self, text: str, prefix: bool = True, batch_results: bool = False):
+        self._text = text
+        self._prefix = prefix
+        self._batch_results = batch_results
+
+
+    def text(self) -> str:
+        return self._text
+
+
+    def prefix(self) -> bool:
+        return self._prefix
+
+
+    def batch_results(self) -> bool:
+        """Whether the results are wanted in lists of rows, as ContinentSearchResultsEvents,
+        rather than as one ContinentSearchResultEvent per row."""
+        return self._batch_results
+
+
     def __repr__(self) -> str:
-        return f'{type(self).__name__}: continent_code = {repr(self._continent_code)}, name = {repr(self._name)}'
+        return f'{type(self).__name__}: text = {repr(self._text)}, prefix = {repr(self._prefix)}, ' + \
+               f'batch_results = {repr(self._batch_results)}'
 
 
 
@@ -57,6 +109,41 @@ class ContinentSearchResultEvent:
 
 
 
+class ContinentSearchResultsEvent:
+    def __init__(self, continents: list[Continent]):
+        self._continents = continents
+
+
+    def continents(self) -> list[Continent]:
+        return self._continents
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: continents = {len(self._continents)} rows'
+
+
+
+class MoreContinentSearchResultsEvent:
+    def __init__(self, after_id: int):
+        self._after_id = after_id
+
+
+    def after_id(self) -> int:
+        """The after_id that asks for the next page of the same search."""
+        return self._after_id
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: after_id = {repr(self._after_id)}'
+
+
+
+class NoMoreContinentSearchResultsEvent:
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}'
+
+
+
 class LoadContinentEvent:
     def __init__(self, continent_id: int):
         self._continent_id = continent_id
@@ -113,6 +200,20 @@ class SaveContinentEvent:
 
 
 
+class SaveContinentBatchEvent:
+    def __init__(self, continents: list[Continent]):
+        self._continents = continents
+
+
+    def continents(self) -> list[Continent]:
+        return self._continents
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: continents = {len(self._continents)} rows'
+
+
+
 class ContinentSavedEvent:
     def __init__(self, continent: Continent):
         self._continent = continent
@@ -7,8 +7,6 @@
 # in the database.
 #
 # See the project write-up for details on when these events are sent and by whom.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 from collections import namedtuple
 
@@ -30,9 +28,14 @@ Country.__annotations__ = {
 
 
 class StartCountrySearchEvent:
-    def __init__(self, country_code: str, name: str):
+    def __init__(
+            self, country_code: str, name: str, batch_results: bool = False,
+            page_size: int | None = None, after_id: int | None = None):
         self._country_code = country_code
         self._name = name
+        self._batch_results = batch_results
+        self._page_size = page_size
+        self._after_id = after_id
 
 
     def country_code(self) -> str:
@@ -43,8 +46,57 @@ class StartCountrySearchEvent:
         return self._name
 
 
+    def batch_results(self) -> bool:
+        """Whether the results are wanted in lists of rows, as CountrySearchResultsEvents,
+        rather than as one CountrySearchResultEvent per row."""
+        return self._batch_results
+
+
+    def page_size(self) -> int | None:
+        """If not None, the most results wanted.  They come in country_id order, followed
+        by a MoreCountrySearchResultsEvent if there are more or a
+        NoMoreCountrySearchResultsEvent if not."""
+        return self._page_size
+
+
+    def after_id(self) -> int | None:
+        """When a page_size is given, the country_id the results start after: None for
+        the first page, or the after_id of the MoreCountrySearchResultsEvent that
+        ended the previous page."""
+        return self._after_id
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: country_code = {repr(self._country_code)}, ' + \
+               f'name = {repr(self._name)}, batch_results = {repr(self._batch_results)}, ' + \
+               f'page_size = {repr(self._page_size)}, after_id = {repr(self._after_id)}'
+
+
+
+class StartCountryTextSearchEvent:
+    def __init__(self, text: str, prefix: bool = True, batch_results: bool = False):
+        self._text = text
+        self._prefix = prefix
+        self._batch_results = batch_results
+
+
+    def text(self) -> str:
+        return self._text
+
+
+    def prefix(self) -> bool:
+        return self._prefix
+
+
+    def batch_results(self) -> bool:
+        """Whether the results are wanted in lists of rows, as CountrySearchResultsEvents,
+        rather than as one CountrySearchResultEvent per row."""
+        return self._batch_results
+
+
     def __repr__(self) -> str:
-        return f'{type(self).__name__}: country_code = {repr(self._country_code)}, name = {repr(self._name)}'
+        return f'{type(self).__name__}: text = {repr(self._text)}, prefix = {repr(self._prefix)}, ' + \
+               f'batch_results = {repr(self._batch_results)}'
 
 
 
@@ -62,6 +114,41 @@ class CountrySearchResultEvent:
 
 
 
+class CountrySearchResultsEvent:
+    def __init__(self, countries: list[Country]):
+        self._countries = countries
+
+
+    def countries(self) -> list[Country]:
+        return self._countries
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: countries = {len(self._countries)} rows'
+
+
+
+class MoreCountrySearchResultsEvent:
+    def __init__(self, after_id: int):
+        self._after_id = after_id
+
+
+    def after_id(self) -> int:
+        """The after_id that asks for the next page of the same search."""
+        return self._after_id
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: after_id = {repr(self._after_id)}'
+
+
+
+class NoMoreCountrySearchResultsEvent:
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}'
+
+
+
 class LoadCountryEvent:
     def __init__(self, country_id: int):
         self._country_id = country_id
@@ -118,6 +205,20 @@ class SaveCountryEvent:
 
 
 
+class SaveCountryBatchEvent:
+    def __init__(self, countries: list[Country]):
+        self._countries = countries
+
+
+    def countries(self) -> list[Country]:
+        return self._countries
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: countries = {len(self._countries)} rows'
+
+
+
 class CountrySavedEvent:
     def __init__(self, country: Country):
         self._country = country
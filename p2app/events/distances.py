@@ -0,0 +1,91 @@
+# p2app/events/distances.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Events related to calculating great-circle distances between airports.  The
+# engine needs NumPy installed to handle them.
+
+
+
+class CalculateDistanceMatrixEvent:
+    def __init__(self, airport_ids: list[int]):
+        self._airport_ids = airport_ids
+
+
+    def airport_ids(self) -> list[int]:
+        return self._airport_ids
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_ids = {repr(self._airport_ids)}'
+
+
+
+class DistanceMatrixCalculatedEvent:
+    def __init__(self, airport_ids: list[int], distances_km):
+        self._airport_ids = airport_ids
+        self._distances_km = distances_km
+
+
+    def airport_ids(self) -> list[int]:
+        return self._airport_ids
+
+
+    def distances_km(self):
+        """A NumPy array whose [i, j] element is the distance between the i-th and j-th
+        airports in airport_ids()."""
+        return self._distances_km
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_ids = {repr(self._airport_ids)}, ' + \
+               f'distances_km = {len(self._airport_ids)}x{len(self._airport_ids)} matrix'
+
+
+
+class FindAirportPairsWithinEvent:
+    def __init__(self, max_distance_km: float, airport_ids: list[int] | None = None):
+        self._max_distance_km = max_distance_km
+        self._airport_ids = airport_ids
+
+
+    def max_distance_km(self) -> float:
+        return self._max_distance_km
+
+
+    def airport_ids(self) -> list[int] | None:
+        return self._airport_ids
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: max_distance_km = {repr(self._max_distance_km)}, ' + \
+               f'airport_ids = {repr(self._airport_ids)}'
+
+
+
+class AirportPairsFoundEvent:
+    def __init__(self, pairs: list[tuple[int, int, float]]):
+        self._pairs = pairs
+
+
+    def pairs(self) -> list[tuple[int, int, float]]:
+        return self._pairs
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: pairs = {len(self._pairs)} pairs'
+
+
+
+class DistanceCalculationFailedEvent:
+    def __init__(self, reason: str):
+        self._reason = reason
+
+
+    def reason(self) -> str:
+        return self._reason
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: reason = {repr(self._reason)}'
@@ -0,0 +1,157 @@
+# p2app/events/event_log.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# A bounded, in-memory log of the events passing through the event bus, used by
+# its debug mode.  Recording an event only appends a small tuple to a ring
+# buffer; turning events into text and writing them to a file both happen later,
+# on a background thread, so that debug mode costs the user interface almost
+# nothing even while a search delivers thousands of results.
+
+import collections
+import itertools
+import logging
+import logging.handlers
+import threading
+import time
+
+
+
+_DEFAULT_CAPACITY = 10_000
+_DEFAULT_MAX_FILE_BYTES = 10 * 1024 * 1024
+_DEFAULT_FILE_BACKUP_COUNT = 3
+_FLUSH_INTERVAL_SECONDS = 0.5
+
+
+
+EventRecord = collections.namedtuple(
+    'EventRecord', ['sequence_number', 'timestamp', 'source', 'event'])
+
+EventRecord.__annotations__ = {
+    'sequence_number': int,
+    'timestamp': float,
+    'source': str,
+    'event': object
+}
+
+
+
+def format_record(record: EventRecord) -> str:
+    timestamp = time.strftime('%H:%M:%S', time.localtime(record.timestamp))
+    milliseconds = int(record.timestamp % 1 * 1000)
+    return f'{timestamp}.{milliseconds:03} Sent by {record.source:6}: {record.event}'
+
+
+
+class EventLog:
+    """Keeps the most recent events sent by the view and the engine in a ring buffer
+    of the given capacity, for the event log window and, if a path is given, for a
+    background thread that appends them to a log file rotated at max_file_bytes.
+
+    Every event sent by the view is recorded, but only one in sample_every of the
+    engine's results are, since those are where the volume is."""
+
+    def __init__(
+            self, capacity: int = _DEFAULT_CAPACITY, path = None, sample_every: int = 1,
+            max_file_bytes: int = _DEFAULT_MAX_FILE_BYTES,
+            file_backup_count: int = _DEFAULT_FILE_BACKUP_COUNT):
+        self._records = collections.deque(maxlen = capacity)
+        self._sequence_numbers = itertools.count(1)
+        self._sample_every = sample_every
+        self._unsampled_results = 0
+        self._path = path
+        self._max_file_bytes = max_file_bytes
+        self._file_backup_count = file_backup_count
+        self._writer = None
+        self._stop_writing = threading.Event()
+        self._last_written = 0
+
+
+    # Records are kept as plain tuples, which are several times cheaper to build
+    # than EventRecords; they become EventRecords only when they are read.
+    def record_view_event(self, event):
+        self._records.append((next(self._sequence_numbers), time.time(), 'view', event))
+
+
+    def record_engine_event(self, event):
+        self._unsampled_results += 1
+
+        if self._unsampled_results >= self._sample_every:
+            self._unsampled_results = 0
+            self._records.append((next(self._sequence_numbers), time.time(), 'engine', event))
+
+
+    def records_after(self, sequence_number: int) -> list[EventRecord]:
+        """Returns the records still in the buffer whose sequence numbers are greater
+        than the given one, oldest first."""
+        # Copying the deque is a single step as far as other threads can tell, so it
+        # is safe while the bus keeps appending.  Sequence numbers are only given to
+        # recorded events, so those in the buffer are consecutive.
+        records = list(self._records)
+
+        if not records:
+            return []
+
+        first = max(sequence_number - records[0][0] + 1, 0)
+        return [EventRecord._make(record) for record in records[first:]]
+
+
+    def clear(self):
+        """Forgets the records in the buffer.  Sequence numbers carry on from where
+        they were, so readers of records_after() only ever see newer records."""
+        self._records.clear()
+        self._unsampled_results = 0
+
+
+    def start_writing(self):
+        """Starts the thread that writes the log file, if there is a path and it is
+        not already running."""
+        if self._path is not None and self._writer is None:
+            self._stop_writing.clear()
+            self._writer = threading.Thread(
+                target = self._write, name = 'event-log-writer', daemon = True)
+            self._writer.start()
+
+
+    def stop_writing(self):
+        """Stops the writing thread after it has written everything recorded so far."""
+        if self._writer is not None:
+            self._stop_writing.set()
+            self._writer.join()
+            self._writer = None
+
+
+    def _write(self):
+        handler = logging.handlers.RotatingFileHandler(
+            self._path, maxBytes = self._max_file_bytes, backupCount = self._file_backup_count,
+            encoding = 'utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        try:
+            while True:
+                is_stopping = self._stop_writing.wait(_FLUSH_INTERVAL_SECONDS)
+                self._write_records(handler)
+
+                if is_stopping:
+                    break
+        finally:
+            handler.close()
+
+
+    def _write_records(self, handler):
+        records = self.records_after(self._last_written)
+
+        if not records:
+            return
+
+        if self._last_written > 0 and records[0].sequence_number > self._last_written + 1:
+            # The buffer wrapped around before the writer caught up.
+            dropped = records[0].sequence_number - self._last_written - 1
+            handler.emit(logging.makeLogRecord({'msg': f'... {dropped} events not written ...'}))
+
+        for record in records:
+            handler.emit(logging.makeLogRecord({'msg': format_record(record)}))
+
+        handler.flush()
+        self._last_written = records[-1].sequence_number
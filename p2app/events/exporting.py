@@ -0,0 +1,99 @@
+# p2app/events/exporting.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Events related to exporting a table, or the rows of a table matching some
+# criteria, to a CSV or JSON Lines file.
+
+from pathlib import Path
+
+
+
+class StartExportEvent:
+    def __init__(
+            self, table: str, path: Path, format: str = 'csv',
+            criteria: dict[str, object] | None = None, compress: bool = False):
+        self._table = table
+        self._path = path
+        self._format = format
+        self._criteria = criteria
+        self._compress = compress
+
+
+    def table(self) -> str:
+        return self._table
+
+
+    def path(self) -> Path:
+        return self._path
+
+
+    def format(self) -> str:
+        return self._format
+
+
+    def criteria(self) -> dict[str, object] | None:
+        return self._criteria
+
+
+    def compress(self) -> bool:
+        return self._compress
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: table = {repr(self._table)}, path = {repr(self._path)}, ' + \
+               f'format = {repr(self._format)}, criteria = {repr(self._criteria)}, ' + \
+               f'compress = {repr(self._compress)}'
+
+
+
+class ExportProgressEvent:
+    def __init__(self, table: str, rows: int):
+        self._table = table
+        self._rows = rows
+
+
+    def table(self) -> str:
+        return self._table
+
+
+    def rows(self) -> int:
+        return self._rows
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: table = {repr(self._table)}, rows = {repr(self._rows)}'
+
+
+
+class ExportCompletedEvent:
+    def __init__(self, path: Path, rows: int):
+        self._path = path
+        self._rows = rows
+
+
+    def path(self) -> Path:
+        return self._path
+
+
+    def rows(self) -> int:
+        return self._rows
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: path = {repr(self._path)}, rows = {repr(self._rows)}'
+
+
+
+class ExportFailedEvent:
+    def __init__(self, reason: str):
+        self._reason = reason
+
+
+    def reason(self) -> str:
+        return self._reason
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: reason = {repr(self._reason)}'
@@ -0,0 +1,75 @@
+# p2app/events/importing.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Events related to bulk importing the OurAirports CSV files into the database.
+
+from pathlib import Path
+
+
+
+class StartImportEvent:
+    def __init__(self, directory: Path):
+        self._directory = directory
+
+
+    def directory(self) -> Path:
+        return self._directory
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: directory = {repr(self._directory)}'
+
+
+
+class ImportProgressEvent:
+    def __init__(self, table: str, rows: int):
+        self._table = table
+        self._rows = rows
+
+
+    def table(self) -> str:
+        return self._table
+
+
+    def rows(self) -> int:
+        return self._rows
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: table = {repr(self._table)}, rows = {repr(self._rows)}'
+
+
+
+class ImportCompletedEvent:
+    def __init__(self, row_counts: dict[str, int], skipped_counts: dict[str, int]):
+        self._row_counts = row_counts
+        self._skipped_counts = skipped_counts
+
+
+    def row_counts(self) -> dict[str, int]:
+        return self._row_counts
+
+
+    def skipped_counts(self) -> dict[str, int]:
+        return self._skipped_counts
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: row_counts = {repr(self._row_counts)}, ' + \
+               f'skipped_counts = {repr(self._skipped_counts)}'
+
+
+
+class ImportFailedEvent:
+    def __init__(self, reason: str):
+        self._reason = reason
+
+
+    def reason(self) -> str:
+        return self._reason
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: reason = {repr(self._reason)}'
@@ -0,0 +1,155 @@
+# p2app/events/instrumentation.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Per-event-class statistics kept by the event bus when instrumentation is
+# enabled: how many events of each class were processed, how many result events
+# each one fanned out to, and histograms of how long the engine took to produce
+# the first and the last of those results.
+
+import json
+import threading
+import time
+
+
+
+# Latencies are counted in power-of-two buckets of microseconds: bucket k holds
+# those below 2 ** k microseconds (and at least 2 ** (k - 1)), so a few dozen
+# buckets span everything from a cache hit to a full import.
+_BUCKET_COUNT = 40
+
+
+
+class _Histogram:
+    def __init__(self):
+        self._buckets = [0] * _BUCKET_COUNT
+        self._max_ns = 0
+
+
+    def add(self, elapsed_ns: int):
+        self._buckets[min((elapsed_ns // 1000).bit_length(), _BUCKET_COUNT - 1)] += 1
+        self._max_ns = max(self._max_ns, elapsed_ns)
+
+
+    def _percentile_us(self, fraction: float) -> int | None:
+        # The upper bound of the bucket holding the percentile, so it errs high by
+        # at most a factor of two.
+        total = sum(self._buckets)
+
+        if total == 0:
+            return None
+
+        remaining = fraction * total
+
+        for bucket, count in enumerate(self._buckets):
+            remaining -= count
+
+            if remaining <= 0:
+                return 2 ** bucket
+
+        return 2 ** (_BUCKET_COUNT - 1)
+
+
+    def summary(self) -> dict:
+        return {
+            'p50_us': self._percentile_us(0.50),
+            'p95_us': self._percentile_us(0.95),
+            'p99_us': self._percentile_us(0.99),
+            'max_us': self._max_ns / 1000 if any(self._buckets) else None,
+            'histogram': {f'<{2 ** bucket}us': count
+                          for bucket, count in enumerate(self._buckets) if count}
+        }
+
+
+
+class _EventClassStatistics:
+    def __init__(self):
+        self.count = 0
+        self.result_count = 0
+        self.max_result_count = 0
+        self.time_to_first_result = _Histogram()
+        self.time_to_last_result = _Histogram()
+
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'results': self.result_count,
+            'mean_results': self.result_count / self.count,
+            'max_results': self.max_result_count,
+            'time_to_first_result': self.time_to_first_result.summary(),
+            'time_to_last_result': self.time_to_last_result.summary()
+        }
+
+
+
+class EventStatistics:
+    """Statistics about the events processed by the engine, grouped by event class.
+    Latencies count only the time spent inside the engine's handler, not the time
+    the user interface spends handling each result in between.
+
+    Events may be measured on the engine's worker thread while the statistics are
+    read on the user interface's, so both sides take a lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_class = {}
+
+
+    def measure(self, event, results):
+        """A generator that yields the result events of the engine's generator,
+        recording how long they took once it is exhausted or closed."""
+        elapsed_ns = 0
+        first_result_ns = None
+        result_count = 0
+
+        try:
+            while True:
+                start_ns = time.perf_counter_ns()
+
+                try:
+                    result = next(results)
+                finally:
+                    elapsed_ns += time.perf_counter_ns() - start_ns
+
+                if first_result_ns is None:
+                    first_result_ns = elapsed_ns
+
+                result_count += 1
+                yield result
+        except StopIteration:
+            pass
+        finally:
+            results.close()
+            self._record(type(event).__name__, first_result_ns, elapsed_ns, result_count)
+
+
+    def _record(self, event_class_name, first_result_ns, last_result_ns, result_count):
+        with self._lock:
+            statistics = self._by_class.get(event_class_name)
+
+            if statistics is None:
+                statistics = self._by_class[event_class_name] = _EventClassStatistics()
+
+            statistics.count += 1
+            statistics.result_count += result_count
+            statistics.max_result_count = max(statistics.max_result_count, result_count)
+
+            if first_result_ns is not None:
+                statistics.time_to_first_result.add(first_result_ns)
+
+            statistics.time_to_last_result.add(last_result_ns)
+
+
+    def summary(self) -> dict:
+        """Returns the statistics as a dictionary keyed by event class name, in a form
+        that can be written as JSON."""
+        with self._lock:
+            return {name: statistics.summary() for name, statistics in sorted(self._by_class.items())}
+
+
+    def dump(self, path):
+        """Writes the summary to the given path as JSON."""
+        with open(path, 'w', encoding = 'utf-8') as file:
+            json.dump(self.summary(), file, indent = 2)
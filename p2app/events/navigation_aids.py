@@ -0,0 +1,138 @@
+# p2app/events/navigation_aids.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Events that are related to navigation aids, including finding the ones near
+# a batch of airports.
+
+from collections import namedtuple
+
+
+
+NavigationAid = namedtuple(
+    'NavigationAid',
+    ['navigation_aid_id', 'filename', 'ident', 'name', 'type', 'frequency_khz',
+     'latitude_deg', 'longitude_deg', 'elevation_ft', 'iso_country', 'dme_frequency_khz',
+     'dme_channel', 'dme_latitude_deg', 'dme_longitude_deg', 'dme_elevation_ft',
+     'adjusted_variation_deg', 'magnetic_variation_deg', 'usage_type', 'power', 'airport_id'])
+
+NavigationAid.__annotations__ = {
+    'navigation_aid_id': int | None,
+    'filename': str | None,
+    'ident': str | None,
+    'name': str | None,
+    'type': str | None,
+    'frequency_khz': int | None,
+    'latitude_deg': float | None,
+    'longitude_deg': float | None,
+    'elevation_ft': int | None,
+    'iso_country': str | None,
+    'dme_frequency_khz': int | None,
+    'dme_channel': str | None,
+    'dme_latitude_deg': float | None,
+    'dme_longitude_deg': float | None,
+    'dme_elevation_ft': int | None,
+    'adjusted_variation_deg': float | None,
+    'magnetic_variation_deg': float | None,
+    'usage_type': str | None,
+    'power': str | None,
+    'airport_id': int | None
+}
+
+
+
+class FindNavigationAidsNearAirportsEvent:
+    def __init__(self, airport_ids: list[int], radius_km: float):
+        self._airport_ids = airport_ids
+        self._radius_km = radius_km
+
+
+    def airport_ids(self) -> list[int]:
+        return self._airport_ids
+
+
+    def radius_km(self) -> float:
+        return self._radius_km
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_ids = {repr(self._airport_ids)}, ' + \
+               f'radius_km = {repr(self._radius_km)}'
+
+
+
+class NavigationAidsNearAirportEvent:
+    def __init__(self, airport_id: int, navigation_aids: list[tuple[float, NavigationAid]]):
+        self._airport_id = airport_id
+        self._navigation_aids = navigation_aids
+
+
+    def airport_id(self) -> int:
+        return self._airport_id
+
+
+    def navigation_aids(self) -> list[tuple[float, NavigationAid]]:
+        """(distance_km, navigation aid) pairs, nearest first."""
+        return self._navigation_aids
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_id = {repr(self._airport_id)}, ' + \
+               f'navigation_aids = {len(self._navigation_aids)} navigation aids'
+
+
+
+class SaveNewNavigationAidEvent:
+    def __init__(self, navigation_aid: NavigationAid):
+        self._navigation_aid = navigation_aid
+
+
+    def navigation_aid(self) -> NavigationAid:
+        return self._navigation_aid
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: navigation_aid = {repr(self._navigation_aid)}'
+
+
+
+class SaveNavigationAidEvent:
+    def __init__(self, navigation_aid: NavigationAid):
+        self._navigation_aid = navigation_aid
+
+
+    def navigation_aid(self) -> NavigationAid:
+        return self._navigation_aid
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: navigation_aid = {repr(self._navigation_aid)}'
+
+
+
+class NavigationAidSavedEvent:
+    def __init__(self, navigation_aid: NavigationAid):
+        self._navigation_aid = navigation_aid
+
+
+    def navigation_aid(self) -> NavigationAid:
+        return self._navigation_aid
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: navigation_aid = {repr(self._navigation_aid)}'
+
+
+
+class SaveNavigationAidFailedEvent:
+    def __init__(self, reason: str):
+        self._reason = reason
+
+
+    def reason(self) -> str:
+        return self._reason
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: reason = {repr(self._reason)}'
@@ -0,0 +1,86 @@
+# p2app/events/recording.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Records the events the user interface sends to the engine, so that a session
+# can later be replayed against a database (see benchmarks.replay) as a
+# repeatable performance test.
+#
+# A recording is a text file that is only ever appended to.  Each recording
+# session starts with a header line, followed by one line per event: a JSON
+# array of the seconds since the session started and the event, in the format of
+# p2app.events.serialization, e.g.
+#
+#     {"$recording":1,"started":1718000000.123}
+#     [0.000412,{"$type":"OpenDatabaseEvent","path":"airports.db"}]
+#     [3.171802,{"$type":"StartRegionSearchEvent","region_code":null,"local_code":"CA","name":null}]
+
+import collections
+import json
+import time
+from .serialization import event_from_json, event_to_json
+
+
+
+_FORMAT_VERSION = 1
+_HEADER_KEY = '$recording'
+
+
+
+RecordedEvent = collections.namedtuple('RecordedEvent', ['session', 'offset', 'event'])
+
+RecordedEvent.__annotations__ = {
+    'session': int,
+    'offset': float,
+    'event': object
+}
+
+
+
+class EventRecorder:
+    """Appends the events it is given to a recording file, each with the time since
+    the recorder was created.  Writes are buffered; close() flushes them."""
+
+    def __init__(self, path):
+        self._file = open(path, 'a', encoding = 'utf-8')
+        self._start = time.perf_counter()
+        self._file.write(json.dumps(
+            {_HEADER_KEY: _FORMAT_VERSION, 'started': round(time.time(), 3)},
+            separators = (',', ':')))
+        self._file.write('\n')
+
+
+    def record(self, event):
+        offset = time.perf_counter() - self._start
+        self._file.write(f'[{offset:.6f},{event_to_json(event)}]\n')
+
+
+    def close(self):
+        self._file.close()
+
+
+
+def read_recording(path):
+    """Generates a RecordedEvent for each event in a recording, numbering its
+    sessions from 1.  Raises a ValueError for a line it cannot read."""
+    session = 0
+
+    with open(path, encoding = 'utf-8') as file:
+        for line_number, line in enumerate(file, start = 1):
+            if not line.strip():
+                continue
+
+            try:
+                if line.startswith('{'):
+                    header = json.loads(line)
+
+                    if header.get(_HEADER_KEY) != _FORMAT_VERSION:
+                        raise ValueError(f'Unsupported recording format: {header.get(_HEADER_KEY)}')
+
+                    session += 1
+                else:
+                    offset, encoded = line.rstrip()[1:-1].split(',', 1)
+                    yield RecordedEvent(session, float(offset), event_from_json(encoded))
+            except ValueError as e:
+                raise ValueError(f'{path}, line {line_number}: {e}') from e
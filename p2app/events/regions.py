@@ -7,8 +7,6 @@
 # in the database.
 #
 # See the project write-up for details on when these events are sent and by whom.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 from collections import namedtuple
 
@@ -33,10 +31,15 @@ Region.__annotations__ = {
 
 
 class StartRegionSearchEvent:
-    def __init__(self, region_code: str, local_code: str, name: str):
+    def __init__(
+            self, region_code: str, local_code: str, name: str, batch_results: bool = False,
+            page_size: int | None = None, after_id: int | None = None):
         self._region_code = region_code
         self._local_code = local_code
         self._name = name
+        self._batch_results = batch_results
+        self._page_size = page_size
+        self._after_id = after_id
 
 
     def region_code(self) -> str:
@@ -51,9 +54,58 @@ class StartRegionSearchEvent:
         return self._name
 
 
+    def batch_results(self) -> bool:
+        """Whether the results are wanted in lists of rows, as RegionSearchResultsEvents,
+        rather than as one RegionSearchResultEvent per row."""
+        return self._batch_results
+
+
+    def page_size(self) -> int | None:
+        """If not None, the most results wanted.  They come in region_id order, followed
+        by a MoreRegionSearchResultsEvent if there are more or a
+        NoMoreRegionSearchResultsEvent if not."""
+        return self._page_size
+
+
+    def after_id(self) -> int | None:
+        """When a page_size is given, the region_id the results start after: None for
+        the first page, or the after_id of the MoreRegionSearchResultsEvent that
+        ended the previous page."""
+        return self._after_id
+
+
     def __repr__(self) -> str:
         return f'{type(self).__name__}: region_code = {repr(self._region_code)}, ' + \
-               f'local_name = {repr(self._local_code)}, name = {repr(self._name)}'
+               f'local_name = {repr(self._local_code)}, name = {repr(self._name)}, ' + \
+               f'batch_results = {repr(self._batch_results)}, page_size = {repr(self._page_size)}, ' + \
+               f'after_id = {repr(self._after_id)}'
+
+
+
+class StartRegionTextSearchEvent:
+    def __init__(self, text: str, prefix: bool = True, batch_results: bool = False):
+        self._text = text
+        self._prefix = prefix
+        self._batch_results = batch_results
+
+
+    def text(self) -> str:
+        return self._text
+
+
+    def prefix(self) -> bool:
+        return self._prefix
+
+
+    def batch_results(self) -> bool:
+        """Whether the results are wanted in lists of rows, as RegionSearchResultsEvents,
+        rather than as one RegionSearchResultEvent per row."""
+        return self._batch_results
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: text = {repr(self._text)}, prefix = {repr(self._prefix)}, ' + \
+               f'batch_results = {repr(self._batch_results)}'
 
 
 
@@ -71,6 +123,41 @@ class RegionSearchResultEvent:
 
 
 
+class RegionSearchResultsEvent:
+    def __init__(self, regions: list[Region]):
+        self._regions = regions
+
+
+    def regions(self) -> list[Region]:
+        return self._regions
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: regions = {len(self._regions)} rows'
+
+
+
+class MoreRegionSearchResultsEvent:
+    def __init__(self, after_id: int):
+        self._after_id = after_id
+
+
+    def after_id(self) -> int:
+        """The after_id that asks for the next page of the same search."""
+        return self._after_id
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: after_id = {repr(self._after_id)}'
+
+
+
+class NoMoreRegionSearchResultsEvent:
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}'
+
+
+
 class LoadRegionEvent:
     def __init__(self, region_id: int):
         self._region_id = region_id
@@ -127,6 +214,20 @@ class SaveRegionEvent:
 
 
 
+class SaveRegionBatchEvent:
+    def __init__(self, regions: list[Region]):
+        self._regions = regions
+
+
+    def regions(self) -> list[Region]:
+        return self._regions
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: regions = {len(self._regions)} rows'
+
+
+
 class RegionSavedEvent:
     def __init__(self, region: Region):
         self._region = region
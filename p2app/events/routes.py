@@ -0,0 +1,83 @@
+# p2app/events/routes.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Events related to finding multi-hop routes between airports for an aircraft
+# with a limited range that needs a runway of some minimum length at each stop.
+
+from .airports import Airport
+
+
+
+class FindRouteEvent:
+    def __init__(self, from_airport_id: int, to_airport_id: int, max_range_km: float,
+                 min_runway_length_ft: int = 0):
+        self._from_airport_id = from_airport_id
+        self._to_airport_id = to_airport_id
+        self._max_range_km = max_range_km
+        self._min_runway_length_ft = min_runway_length_ft
+
+
+    def from_airport_id(self) -> int:
+        return self._from_airport_id
+
+
+    def to_airport_id(self) -> int:
+        return self._to_airport_id
+
+
+    def max_range_km(self) -> float:
+        return self._max_range_km
+
+
+    def min_runway_length_ft(self) -> int:
+        return self._min_runway_length_ft
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: from_airport_id = {repr(self._from_airport_id)}, ' + \
+               f'to_airport_id = {repr(self._to_airport_id)}, ' + \
+               f'max_range_km = {repr(self._max_range_km)}, ' + \
+               f'min_runway_length_ft = {repr(self._min_runway_length_ft)}'
+
+
+
+class RouteFoundEvent:
+    def __init__(self, airports: list[Airport], leg_distances_km: list[float]):
+        self._airports = airports
+        self._leg_distances_km = leg_distances_km
+
+
+    def airports(self) -> list[Airport]:
+        """The airports along the route, from the first to the last."""
+        return self._airports
+
+
+    def leg_distances_km(self) -> list[float]:
+        """The distance of each leg, so there is one fewer than there are airports."""
+        return self._leg_distances_km
+
+
+    def distance_km(self) -> float:
+        return sum(self._leg_distances_km)
+
+
+    def __repr__(self) -> str:
+        idents = [airport.airport_ident for airport in self._airports]
+        return f'{type(self).__name__}: airports = {repr(idents)}, ' + \
+               f'distance_km = {self.distance_km():.1f}'
+
+
+
+class RouteNotFoundEvent:
+    def __init__(self, reason: str):
+        self._reason = reason
+
+
+    def reason(self) -> str:
+        return self._reason
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: reason = {repr(self._reason)}'
@@ -0,0 +1,125 @@
+# p2app/events/serialization.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# Converts events to and from JSON, so they can be read from and written to files
+# by programs that drive the engine without the user interface.
+#
+# An event becomes an object whose "$type" is the name of its class and whose
+# other properties are the arguments its constructor was given.  Rows (such as a
+# Region) inside an event are written the same way, with their fields as the
+# properties.  Paths become strings, and NumPy arrays become lists.
+
+import inspect
+import json
+from pathlib import Path
+from . import airports, app, continents, countries, database, distances, exporting
+from . import importing, navigation_aids, regions, routes
+
+
+
+_TYPE_KEY = '$type'
+
+_MODULES = (
+    airports, app, continents, countries, database, distances, exporting,
+    importing, navigation_aids, regions, routes)
+
+# Every event and row class defined in the event modules, by name.
+_TYPES = {
+    name: value
+    for module in _MODULES
+    for name, value in vars(module).items()
+    if isinstance(value, type) and value.__module__ == module.__name__
+}
+
+
+
+def _is_row(value) -> bool:
+    return isinstance(value, tuple) and hasattr(value, '_fields')
+
+
+
+def _encode(value):
+    if _is_row(value):
+        return {_TYPE_KEY: type(value).__name__} | \
+               {field: _encode(field_value) for field, field_value in zip(value._fields, value)}
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        return [_encode(item) for item in value]
+    elif isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    elif isinstance(value, Path):
+        return str(value)
+    elif hasattr(value, 'tolist'):
+        # NumPy arrays and scalars
+        return value.tolist()
+    else:
+        return value
+
+
+
+def encode_event(event) -> dict:
+    """Returns a dictionary that json can write, from which decode_event() rebuilds
+    an equivalent event."""
+    encoded = {_TYPE_KEY: type(event).__name__}
+
+    for name, value in vars(event).items():
+        encoded[name.removeprefix('_')] = _encode(value)
+
+    return encoded
+
+
+
+def _decode(value, annotation = None):
+    if isinstance(value, dict) and _TYPE_KEY in value:
+        return decode_event(value)
+    elif isinstance(value, list):
+        return [_decode(item) for item in value]
+    elif isinstance(value, dict):
+        return {key: _decode(item) for key, item in value.items()}
+    elif annotation is Path and isinstance(value, str):
+        return Path(value)
+    else:
+        return value
+
+
+
+def decode_event(encoded: dict):
+    """Rebuilds an event (or a row) from a dictionary like those encode_event()
+    returns, raising a ValueError if it doesn't describe one."""
+    type_name = encoded.get(_TYPE_KEY)
+    cls = _TYPES.get(type_name)
+
+    if cls is None:
+        raise ValueError(f'Unknown event type: {type_name}')
+
+    arguments = {name: value for name, value in encoded.items() if name != _TYPE_KEY}
+
+    try:
+        if issubclass(cls, tuple):
+            return cls(**{name: _decode(value) for name, value in arguments.items()})
+
+        parameters = inspect.signature(cls).parameters if '__init__' in vars(cls) else {}
+        return cls(**{
+            name: _decode(value, parameters[name].annotation if name in parameters else None)
+            for name, value in arguments.items()
+        })
+    except TypeError as e:
+        raise ValueError(f'Invalid arguments for {type_name}: {e}') from e
+
+
+
+def event_to_json(event) -> str:
+    return json.dumps(encode_event(event), separators = (',', ':'), ensure_ascii = False)
+
+
+
+def event_from_json(text: str):
+    """Rebuilds an event from a line written by event_to_json(), raising a ValueError
+    if the line isn't valid JSON or doesn't describe an event."""
+    encoded = json.loads(text)
+
+    if not isinstance(encoded, dict):
+        raise ValueError('An event must be a JSON object')
+
+    return decode_event(encoded)
@@ -0,0 +1,85 @@
+# p2app/events/worker.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# A thread that runs the engine on behalf of the event bus, so that slow queries
+# never block the user interface's main loop.  The worker calls the engine (and so
+# the database connection is opened on the worker's thread) through the function
+# the bus gives it; the bus hands it requests and collects the result events from
+# a queue.
+
+import queue
+import threading
+import traceback
+from .app import ErrorEvent
+
+
+
+class EngineRequest:
+    def __init__(self, event):
+        self._event = event
+        self._is_cancelled = False
+
+
+    def event(self):
+        return self._event
+
+
+    def cancel(self):
+        self._is_cancelled = True
+
+
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
+
+
+class EngineWorker(threading.Thread):
+    def __init__(self, process_event):
+        super().__init__(name = 'engine-worker', daemon = True)
+        self._process_event = process_event
+        self._requests = queue.SimpleQueue()
+        self._results = queue.SimpleQueue()
+
+
+    def submit(self, event) -> EngineRequest:
+        request = EngineRequest(event)
+        self._requests.put(request)
+        return request
+
+
+    def stop(self):
+        self._requests.put(None)
+
+
+    def results(self):
+        """Returns the (request, result event) pairs produced so far, in order, without
+        waiting for more."""
+        try:
+            while True:
+                yield self._results.get_nowait()
+        except queue.Empty:
+            pass
+
+
+    def run(self):
+        while (request := self._requests.get()) is not None:
+            if request.is_cancelled():
+                continue
+
+            results = self._process_event(request.event())
+
+            try:
+                for result in results:
+                    if request.is_cancelled():
+                        break
+
+                    self._results.put((request, result))
+            except Exception as e:
+                # Keep the worker alive; in synchronous mode Tk would likewise report
+                # the exception and carry on.
+                traceback.print_exc()
+                self._results.put((request, ErrorEvent(f'ERROR: {e}')))
+            finally:
+                results.close()
@@ -5,18 +5,22 @@
 #
 # This is the portion of the user interface that is displayed when the
 # Edit / Continents menu item is selected.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 import tkinter
 import tkinter.messagebox
 from p2app.events import *
 from .event_handling import EventHandler
 from .events import *
+from .search_results import SearchResultList
+
+
 
+class ContinentsView(EventHandler, tkinter.Frame):
+    handled_events = (
+        SaveContinentFailedEvent, DiscardContinentEvent, NewContinentEvent,
+        StartEditingContinentEvent, ContinentLoadedEvent, ContinentSavedEvent)
 
 
-class ContinentsView(tkinter.Frame, EventHandler):
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -58,7 +62,17 @@ class ContinentsView(tkinter.Frame, EventHandler):
             self._edit_view.grid(row = 1, column = 0, padx = 5, pady = 5, sticky = tkinter.NSEW)
 
 
-class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
+def _search_row(continent):
+    return continent.continent_id, f'{continent.continent_code} - {continent.name}'
+
+
+
+class _ContinentsSearchView(EventHandler, tkinter.LabelFrame):
+    handled_events = (
+        ClearContinentsSearchListEvent, ContinentSearchResultEvent, ContinentSearchResultsEvent,
+        MoreContinentSearchResultsEvent, NoMoreContinentSearchResultsEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent, text = 'Continent Search')
 
@@ -89,16 +103,14 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
         empty_area = tkinter.Label(self, text = '')
         empty_area.grid(row = 3, column = 1, sticky = tkinter.NSEW, padx = 5, pady = 5)
 
-        self._search_list = tkinter.Listbox(
-            self, height = 4,
-            activestyle = tkinter.NONE, selectmode = tkinter.SINGLE)
+        self._search_list = SearchResultList(
+            self, self._request_search_page, self._on_search_selection_changed, height = 4)
 
-        self._search_list.bind('<<ListboxSelect>>', self._on_search_selection_changed)
         self._search_list.grid(
             row = 0, column = 2, rowspan = 4, columnspan = 1, sticky = tkinter.NSEW,
             padx = 5, pady = 5)
 
-        self._search_continent_ids = []
+        self._search_criteria = None
 
         button_frame = tkinter.Frame(self)
         button_frame.grid(row = 4, column = 2, sticky = tkinter.E, padx = 5, pady = 5)
@@ -127,7 +139,13 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
 
     def _on_search_button_clicked(self):
         self.initiate_event(ClearContinentsSearchListEvent())
-        self.initiate_event(StartContinentSearchEvent(self._get_search_code(), self._get_search_name()))
+        self._search_criteria = self._get_search_code(), self._get_search_name()
+        self._search_list.start()
+
+
+    def _request_search_page(self, after_id, page_size):
+        self.initiate_event(StartContinentSearchEvent(
+            *self._search_criteria, batch_results = True, page_size = page_size, after_id = after_id))
 
 
     def _get_search_code(self):
@@ -141,8 +159,7 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
 
 
     def _get_selected_search_continent_id(self):
-        selection, *_ = self._search_list.curselection()
-        return self._search_continent_ids[selection]
+        return self._search_list.selected_id()
 
 
     def _on_search_changed(self, *args):
@@ -155,8 +172,8 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
         return True
 
 
-    def _on_search_selection_changed(self, event):
-        if event.widget.curselection():
+    def _on_search_selection_changed(self):
+        if self._search_list.selected_id() is not None:
             new_state = tkinter.NORMAL
         else:
             new_state = tkinter.DISABLED
@@ -177,17 +194,20 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
 
     def on_event(self, event):
         if isinstance(event, ClearContinentsSearchListEvent):
-            self._search_list.delete(0, tkinter.END)
-            self._search_continent_ids = []
+            self._search_list.clear()
             self._edit_button['state'] = tkinter.DISABLED
         elif isinstance(event, ContinentSearchResultEvent):
-            display_name = f'{event.continent().continent_code} - {event.continent().name}'
-            self._search_list.insert(tkinter.END, display_name)
-            self._search_continent_ids.append(event.continent().continent_id)
+            self._search_list.add_rows([_search_row(event.continent())])
+        elif isinstance(event, ContinentSearchResultsEvent):
+            self._search_list.add_rows(map(_search_row, event.continents()))
+        elif isinstance(event, MoreContinentSearchResultsEvent):
+            self._search_list.end_page(event.after_id())
+        elif isinstance(event, NoMoreContinentSearchResultsEvent):
+            self._search_list.end_page(None)
 
 
 
-class _ContinentEditorLoadingView(tkinter.LabelFrame, EventHandler):
+class _ContinentEditorLoadingView(EventHandler, tkinter.LabelFrame):
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -196,7 +216,7 @@ class _ContinentEditorLoadingView(tkinter.LabelFrame, EventHandler):
 
 
 
-class _ContinentEditorView(tkinter.LabelFrame, EventHandler):
+class _ContinentEditorView(EventHandler, tkinter.LabelFrame):
     def __init__(self, parent, is_new, is_editable, continent):
         if is_new:
             frame_text = 'New Continent'
@@ -5,18 +5,22 @@
 #
 # This is the portion of the user interface that is displayed when the
 # Edit / Countries menu item is selected.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 import tkinter
 import tkinter.messagebox
 from p2app.events import *
 from .event_handling import EventHandler
 from .events import *
+from .search_results import SearchResultList
+
+
 
+class CountriesView(EventHandler, tkinter.Frame):
+    handled_events = (
+        SaveCountryFailedEvent, DiscardCountryEvent, NewCountryEvent,
+        StartEditingCountryEvent, CountryLoadedEvent, CountrySavedEvent)
 
 
-class CountriesView(tkinter.Frame, EventHandler):
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -59,7 +63,17 @@ class CountriesView(tkinter.Frame, EventHandler):
 
 
 
-class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
+def _search_row(country):
+    return country.country_id, f'{country.country_code} - {country.name}'
+
+
+
+class _CountriesSearchView(EventHandler, tkinter.LabelFrame):
+    handled_events = (
+        ClearCountriesSearchListEvent, CountrySearchResultEvent, CountrySearchResultsEvent,
+        MoreCountrySearchResultsEvent, NoMoreCountrySearchResultsEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent, text = 'Country Search')
 
@@ -90,16 +104,14 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
         empty_area = tkinter.Label(self, text = '')
         empty_area.grid(row = 3, column = 1, sticky = tkinter.NSEW, padx = 5, pady = 5)
 
-        self._search_list = tkinter.Listbox(
-            self, height = 4,
-            activestyle = tkinter.NONE, selectmode = tkinter.SINGLE)
+        self._search_list = SearchResultList(
+            self, self._request_search_page, self._on_search_selection_changed, height = 4)
 
-        self._search_list.bind('<<ListboxSelect>>', self._on_search_selection_changed)
         self._search_list.grid(
             row = 0, column = 2, rowspan = 4, columnspan = 1, sticky = tkinter.NSEW,
             padx = 5, pady = 5)
 
-        self._search_country_ids = []
+        self._search_criteria = None
 
         button_frame = tkinter.Frame(self)
         button_frame.grid(row = 4, column = 2, sticky = tkinter.E, padx = 5, pady = 5)
@@ -128,7 +140,13 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
 
     def _on_search_button_clicked(self):
         self.initiate_event(ClearCountriesSearchListEvent())
-        self.initiate_event(StartCountrySearchEvent(self._get_search_code(), self._get_search_name()))
+        self._search_criteria = self._get_search_code(), self._get_search_name()
+        self._search_list.start()
+
+
+    def _request_search_page(self, after_id, page_size):
+        self.initiate_event(StartCountrySearchEvent(
+            *self._search_criteria, batch_results = True, page_size = page_size, after_id = after_id))
 
 
     def _get_search_code(self):
@@ -142,8 +160,7 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
 
 
     def _get_selected_search_country_id(self):
-        selection, *_ = self._search_list.curselection()
-        return self._search_country_ids[selection]
+        return self._search_list.selected_id()
 
 
     def _on_search_changed(self, *args):
@@ -156,8 +173,8 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
         return True
 
 
-    def _on_search_selection_changed(self, event):
-        if event.widget.curselection():
+    def _on_search_selection_changed(self):
+        if self._search_list.selected_id() is not None:
             new_state = tkinter.NORMAL
         else:
             new_state = tkinter.DISABLED
@@ -178,17 +195,20 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
 
     def on_event(self, event):
         if isinstance(event, ClearCountriesSearchListEvent):
-            self._search_list.delete(0, tkinter.END)
-            self._search_country_ids = []
+            self._search_list.clear()
             self._edit_button['state'] = tkinter.DISABLED
         elif isinstance(event, CountrySearchResultEvent):
-            display_name = f'{event.country().country_code} - {event.country().name}'
-            self._search_list.insert(tkinter.END, display_name)
-            self._search_country_ids.append(event.country().country_id)
+            self._search_list.add_rows([_search_row(event.country())])
+        elif isinstance(event, CountrySearchResultsEvent):
+            self._search_list.add_rows(map(_search_row, event.countries()))
+        elif isinstance(event, MoreCountrySearchResultsEvent):
+            self._search_list.end_page(event.after_id())
+        elif isinstance(event, NoMoreCountrySearchResultsEvent):
+            self._search_list.end_page(None)
 
 
 
-class _CountryEditorLoadingView(tkinter.LabelFrame, EventHandler):
+class _CountryEditorLoadingView(EventHandler, tkinter.LabelFrame):
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -197,7 +217,7 @@ class _CountryEditorLoadingView(tkinter.LabelFrame, EventHandler):
 
 
 
-class _CountryEditorView(tkinter.LabelFrame, EventHandler):
+class _CountryEditorView(EventHandler, tkinter.LabelFrame):
     def __init__(self, parent, is_new, is_editable, country):
         if is_new:
             frame_text = 'New Country'
@@ -7,13 +7,37 @@
 # (e.g., the events returned from the p2app.engine package, or events that are
 # internal to the user interface).
 #
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
+# An event handler declares the event classes it handles in handled_events, and
+# an event is delivered only to the handlers that handle it, so that (say) each
+# row of a large search result isn't offered to every widget in the window.  The
+# order is the same as if the event visited every handler in the widget tree:
+# a handler's on_event before those of the handlers within it, and its
+# on_event_post after theirs.
+#
+# So that the routes can be kept up to date, EventHandler must come before the
+# tkinter class among a handler's base classes.
 
 import tkinter
 
 
 
 class EventHandler:
+    # The event classes whose events this handler's on_event and on_event_post
+    # methods are called with.  None means every event, for handlers that don't
+    # say; a handler that overrides neither method is never called either way.
+    handled_events = None
+
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._event_router().invalidate()
+
+
+    def destroy(self):
+        self._event_router().invalidate()
+        super().destroy()
+
+
     def initiate_event(self, event):
         widget = self
 
@@ -28,17 +52,7 @@ class EventHandler:
 
 
     def handle_event(self, event):
-        self.on_event(event)
-
-        if isinstance(self, tkinter.Tk) or isinstance(self, tkinter.Widget):
-            for child in self.winfo_children():
-                if not child.winfo_exists():
-                    continue
-
-                if isinstance(child, EventHandler):
-                    child.handle_event(event)
-
-        self.on_event_post(event)
+        self._event_router().deliver(self, event)
 
 
     def on_event(self, event):
@@ -47,3 +61,95 @@ class EventHandler:
 
     def on_event_post(self, event):
         pass
+
+
+    def _event_router(self):
+        widget = self
+
+        while widget.master is not None:
+            widget = widget.master
+
+        if not hasattr(widget, '_p2app_event_router'):
+            widget._p2app_event_router = _EventRouter()
+
+        return widget._p2app_event_router
+
+
+
+class _EventRouter:
+    """The routes events take through one window's event handlers.  For each event
+    class, it remembers which handlers handle it and, for each handler, which of
+    the handlers within it an event should be passed on to.  Creating or destroying
+    a handler forgets the routes, which are then found again as events arrive."""
+
+    def __init__(self):
+        self._handles = {}
+        self._routes = {}
+
+
+    def invalidate(self):
+        self._handles.clear()
+        self._routes.clear()
+
+
+    def deliver(self, handler, event):
+        event_type = type(event)
+        is_handled = self._is_handled(handler, event_type)
+
+        if is_handled:
+            handler.on_event(event)
+
+        # The next handlers are found after on_event, since it may have created
+        # some (such as a new view) that should also receive the event.
+        for next_handler in self._next_handlers(handler, event_type):
+            if next_handler.winfo_exists():
+                self.deliver(next_handler, event)
+
+        if is_handled:
+            handler.on_event_post(event)
+
+
+    def _is_handled(self, handler, event_type):
+        key = (type(handler), event_type)
+
+        if key not in self._handles:
+            self._handles[key] = _handles(type(handler), event_type)
+
+        return self._handles[key]
+
+
+    def _next_handlers(self, handler, event_type):
+        key = (handler, event_type)
+
+        if key not in self._routes:
+            self._routes[key] = list(self._find_next_handlers(handler, event_type))
+
+        return self._routes[key]
+
+
+    def _find_next_handlers(self, widget, event_type):
+        # The nearest handlers within the widget that handle the event type, looking
+        # past those that don't (but, as always, not into widgets that aren't event
+        # handlers at all).
+        if not isinstance(widget, (tkinter.Tk, tkinter.Widget)):
+            return
+
+        for child in widget.winfo_children():
+            if not child.winfo_exists() or not isinstance(child, EventHandler):
+                continue
+
+            if self._is_handled(child, event_type):
+                yield child
+            else:
+                yield from self._find_next_handlers(child, event_type)
+
+
+
+def _handles(handler_type, event_type) -> bool:
+    if handler_type.on_event is EventHandler.on_event and \
+            handler_type.on_event_post is EventHandler.on_event_post:
+        return False
+    elif handler_type.handled_events is None:
+        return True
+    else:
+        return issubclass(event_type, handler_type.handled_events)
@@ -0,0 +1,74 @@
+# p2app/views/event_log.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# A window showing the most recent events in the event bus' event log, which is
+# filled while Debug / Show Events is checked.  The window polls the log rather
+# than being told about each event, so an open window doesn't slow the bus down.
+
+import tkinter
+from p2app.events.event_log import format_record
+
+
+
+_REFRESH_INTERVAL_MS = 500
+_MAX_VISIBLE_RECORDS = 2000
+_INITIAL_WINDOW_WIDTH = 900
+_INITIAL_WINDOW_HEIGHT = 400
+
+
+
+class EventLogWindow(tkinter.Toplevel):
+    def __init__(self, parent, event_log):
+        super().__init__(parent)
+        self.title('Event Log')
+        self.geometry(f'{_INITIAL_WINDOW_WIDTH}x{_INITIAL_WINDOW_HEIGHT}')
+
+        self._event_log = event_log
+        self._last_shown = 0
+
+        self._record_list = tkinter.Listbox(self, activestyle = tkinter.NONE, font = 'TkFixedFont')
+        self._record_list.grid(row = 0, column = 0, sticky = tkinter.NSEW)
+
+        scrollbar = tkinter.Scrollbar(self, command = self._record_list.yview)
+        scrollbar.grid(row = 0, column = 1, sticky = tkinter.NS)
+        self._record_list.config(yscrollcommand = scrollbar.set)
+
+        self.rowconfigure(0, weight = 1)
+        self.columnconfigure(0, weight = 1)
+
+        # Closing the window goes through destroy(), so that the refresh stops too.
+        self.protocol('WM_DELETE_WINDOW', self.destroy)
+
+        self._scheduled_refresh = None
+        self._refresh()
+
+
+    def destroy(self):
+        if self._scheduled_refresh is not None:
+            self.after_cancel(self._scheduled_refresh)
+            self._scheduled_refresh = None
+
+        super().destroy()
+
+
+    def _refresh(self):
+        records = self._event_log.records_after(self._last_shown)[-_MAX_VISIBLE_RECORDS:]
+
+        if records:
+            # Only follow the newest records if the user hasn't scrolled away from them.
+            is_following = self._record_list.yview()[1] >= 1.0
+
+            self._record_list.insert(tkinter.END, *(format_record(record) for record in records))
+            excess = self._record_list.size() - _MAX_VISIBLE_RECORDS
+
+            if excess > 0:
+                self._record_list.delete(0, excess - 1)
+
+            if is_following:
+                self._record_list.see(tkinter.END)
+
+            self._last_shown = records[-1].sequence_number
+
+        self._scheduled_refresh = self.after(_REFRESH_INTERVAL_MS, self._refresh)
@@ -4,8 +4,6 @@
 # Project 2: Learning to Fly
 #
 # The outermost shell of the user interface.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 import tkinter
 import tkinter.messagebox
@@ -13,6 +11,7 @@ from p2app.events import *
 from .continents import ContinentsView
 from .countries import CountriesView
 from .empty import EmptyView
+from .event_log import EventLogWindow
 from .events import *
 from .event_handling import EventHandler
 from .menus import MainMenu
@@ -25,15 +24,31 @@ _INITIAL_WINDOW_HEIGHT = 600
 _PROJECT_NAME = 'ICS 33 - Project 2'
 _MISSING_DATABASE_NAME = '[no database open]'
 
+# The most query plan warnings listed in the dialog that reports them.
+_MAX_LISTED_WARNINGS = 5
+
+
+
+class MainView(EventHandler, tkinter.Tk):
+    handled_events = (
+        ShowEditContinentsViewEvent, ShowEditCountriesViewEvent, ShowEditRegionsViewEvent,
+        DatabaseOpenedEvent, DatabaseClosedEvent, DatabaseOpenFailedEvent, IndexRecommendationEvent,
+        RecommendedIndexesCreatedEvent, QueryPlanWarningEvent,
+        EnableDebugModeEvent, DisableDebugModeEvent, ShowEventLogEvent,
+        EnableInstrumentationEvent, DisableInstrumentationEvent, SaveEventStatisticsEvent,
+        StartRecordingEventsEvent, StopRecordingEventsEvent, EndApplicationEvent, ErrorEvent)
 
 
-class MainView(tkinter.Tk, EventHandler):
     def __init__(self, event_bus):
         super().__init__()
         self.geometry(f'{_INITIAL_WINDOW_WIDTH}x{_INITIAL_WINDOW_HEIGHT}')
         self.config(menu = MainMenu(self))
         self._event_bus = event_bus
         self._current_view = None
+        self._database_path = None
+        self._index_offered_paths = set()
+        self._query_plan_warnings = []
+        self._warned_paths = set()
         self.rowconfigure(0, weight = 1)
         self.columnconfigure(0, weight = 1)
 
@@ -67,10 +82,28 @@ class MainView(tkinter.Tk, EventHandler):
             self._update_database_path(None)
             self._switch_view(EmptyView(self))
             tkinter.messagebox.showerror('Could Not Open Database', event.reason())
+        elif isinstance(event, IndexRecommendationEvent):
+            self._offer_recommended_indexes(event)
+        elif isinstance(event, RecommendedIndexesCreatedEvent):
+            self._report_created_indexes(event)
+        elif isinstance(event, QueryPlanWarningEvent):
+            self._add_query_plan_warning(event)
         elif isinstance(event, EnableDebugModeEvent):
             self._event_bus.enable_debug_mode()
         elif isinstance(event, DisableDebugModeEvent):
             self._event_bus.disable_debug_mode()
+        elif isinstance(event, ShowEventLogEvent):
+            EventLogWindow(self, self._event_bus.event_log())
+        elif isinstance(event, EnableInstrumentationEvent):
+            self._event_bus.enable_instrumentation()
+        elif isinstance(event, DisableInstrumentationEvent):
+            self._event_bus.disable_instrumentation()
+        elif isinstance(event, SaveEventStatisticsEvent):
+            self._save_event_statistics(event.path())
+        elif isinstance(event, StartRecordingEventsEvent):
+            self._start_recording_events(event.path())
+        elif isinstance(event, StopRecordingEventsEvent):
+            self._event_bus.stop_recording()
 
 
     def on_event_post(self, event):
@@ -80,6 +113,78 @@ class MainView(tkinter.Tk, EventHandler):
             tkinter.messagebox.showerror('Error', event.message())
 
 
+    def _offer_recommended_indexes(self, event):
+        # Whatever the answer, the question is asked only once per database while
+        # the application runs, rather than every time the database is opened.
+        if self._database_path in self._index_offered_paths:
+            return
+
+        self._index_offered_paths.add(self._database_path)
+        index_count = len(event.index_statements())
+        message = f'This database lacks {index_count} indexes that would speed up searching.  ' + \
+                  f'Creating them means reading about {event.estimated_rows():,} rows, ' + \
+                  'which happens only once.  Create them now?'
+
+        if tkinter.messagebox.askyesno('Create Indexes?', message):
+            self.initiate_event(CreateRecommendedIndexesEvent())
+
+
+    def _report_created_indexes(self, event):
+        index_count = len(event.index_names())
+
+        if index_count > 0:
+            tkinter.messagebox.showinfo(
+                'Indexes Created', f'Created {index_count} indexes in {event.seconds():.1f} seconds.')
+
+
+    def _add_query_plan_warning(self, event):
+        # A database's warnings arrive one after another, so they are gathered and
+        # shown in one dialog once Tk is idle, and (like the offer of indexes) only
+        # once per database while the application runs.
+        if self._database_path in self._warned_paths:
+            return
+
+        if not self._query_plan_warnings:
+            self.after_idle(self._show_query_plan_warnings)
+
+        self._query_plan_warnings.append(event)
+
+
+    def _show_query_plan_warnings(self):
+        warnings = self._query_plan_warnings
+        self._query_plan_warnings = []
+        self._warned_paths.add(self._database_path)
+
+        listed = '\n\n'.join(
+            f'{warning.statement()}\n({"; ".join(warning.plan())})'
+            for warning in warnings[:_MAX_LISTED_WARNINGS])
+
+        if len(warnings) > _MAX_LISTED_WARNINGS:
+            listed += f'\n\n...and {len(warnings) - _MAX_LISTED_WARNINGS} more.'
+
+        tkinter.messagebox.showwarning(
+            'Slow Queries',
+            f'{len(warnings)} of the queries used on this database read a whole table, '
+            f'which is slow for large tables:\n\n{listed}')
+
+
+    def _save_event_statistics(self, path):
+        statistics = self._event_bus.statistics()
+
+        if statistics is not None:
+            try:
+                statistics.dump(path)
+            except OSError as e:
+                tkinter.messagebox.showerror('Could Not Save Event Statistics', str(e))
+
+
+    def _start_recording_events(self, path):
+        try:
+            self._event_bus.start_recording(path)
+        except OSError as e:
+            tkinter.messagebox.showerror('Could Not Record Events', str(e))
+
+
     def _switch_view(self, view):
         if self._current_view:
             self._current_view.destroy()
@@ -89,6 +194,8 @@ class MainView(tkinter.Tk, EventHandler):
 
 
     def _update_database_path(self, path):
+        self._database_path = path
+
         if path:
             visible_name = path.name
         else:
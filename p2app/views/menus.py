@@ -4,8 +4,6 @@
 # Project 2: Learning to Fly
 #
 # An implementation of the application's menus.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 import tkinter
 import tkinter.filedialog
@@ -16,16 +14,21 @@ from .event_handling import EventHandler
 
 
 _OPEN_DATABASE_DIALOG_TITLE = 'Open Database'
+_SAVE_STATISTICS_DIALOG_TITLE = 'Save Event Statistics'
+_RECORD_EVENTS_DIALOG_TITLE = 'Record Events'
 
 
 
-class BaseMenu(tkinter.Menu, EventHandler):
+class BaseMenu(EventHandler, tkinter.Menu):
     def __init__(self, parent):
         super().__init__(parent, tearoff = 0)
 
 
 
 class MainMenu(BaseMenu):
+    handled_events = (DatabaseOpenedEvent, DatabaseClosedEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent)
         self.add_cascade(label = 'File', menu = FileMenu(self))
@@ -41,6 +44,9 @@ class MainMenu(BaseMenu):
 
 
 class FileMenu(BaseMenu):
+    handled_events = (DatabaseOpenedEvent, DatabaseClosedEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent)
         self.add_command(label = 'Open', state = tkinter.NORMAL, command = self._on_open)
@@ -106,9 +112,70 @@ class DebugMenu(BaseMenu):
             label = 'Show Events', variable = self._is_debug_mode,
             command = self._on_change_show_events)
 
+        self.add_command(label = 'Event Log...', command = self._on_show_event_log)
+
+        self._is_recording_statistics = tkinter.IntVar(self, 0)
+
+        self.add_checkbutton(
+            label = 'Record Event Statistics', variable = self._is_recording_statistics,
+            command = self._on_change_record_statistics)
+
+        self.add_command(
+            label = 'Save Event Statistics...', state = tkinter.DISABLED,
+            command = self._on_save_statistics)
+
+        self.add_separator()
+        self.add_command(label = 'Record Events...', command = self._on_start_recording)
+
+        self.add_command(
+            label = 'Stop Recording Events', state = tkinter.DISABLED,
+            command = self._on_stop_recording)
+
 
     def _on_change_show_events(self):
         if self._is_debug_mode.get():
             self.initiate_event(EnableDebugModeEvent())
         else:
             self.initiate_event(DisableDebugModeEvent())
+
+
+    def _on_show_event_log(self):
+        self.initiate_event(ShowEventLogEvent())
+
+
+    def _on_change_record_statistics(self):
+        if self._is_recording_statistics.get():
+            self.initiate_event(EnableInstrumentationEvent())
+            self.entryconfig('Save Event Statistics...', state = tkinter.NORMAL)
+        else:
+            self.initiate_event(DisableInstrumentationEvent())
+            self.entryconfig('Save Event Statistics...', state = tkinter.DISABLED)
+
+
+    def _on_save_statistics(self):
+        save_path = tkinter.filedialog.asksaveasfilename(
+            title = _SAVE_STATISTICS_DIALOG_TITLE,
+            initialdir = Path.cwd(),
+            defaultextension = '.json',
+            filetypes = [('JSON files', '*.json')])
+
+        if save_path:
+            self.initiate_event(SaveEventStatisticsEvent(Path(save_path)))
+
+
+    def _on_start_recording(self):
+        record_path = tkinter.filedialog.asksaveasfilename(
+            title = _RECORD_EVENTS_DIALOG_TITLE,
+            initialdir = Path.cwd(),
+            defaultextension = '.events',
+            confirmoverwrite = False,
+            filetypes = [('Event recordings', '*.events')])
+
+        if record_path:
+            self.initiate_event(StartRecordingEventsEvent(Path(record_path)))
+            self.entryconfig('Stop Recording Events', state = tkinter.NORMAL)
+
+
+    def _on_stop_recording(self):
+        self.initiate_event(StopRecordingEventsEvent())
+        self.entryconfig('Stop Recording Events', state = tkinter.DISABLED)
@@ -5,18 +5,22 @@
 #
 # This is the portion of the user interface that is displayed when the
 # Edit / Regions menu item is selected.
-#
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
 
 import tkinter
 import tkinter.messagebox
 from p2app.events import *
 from .event_handling import EventHandler
 from .events import *
+from .search_results import SearchResultList
+
+
 
+class RegionsView(EventHandler, tkinter.Frame):
+    handled_events = (
+        SaveRegionFailedEvent, DiscardRegionEvent, NewRegionEvent,
+        StartEditingRegionEvent, RegionLoadedEvent, RegionSavedEvent)
 
 
-class RegionsView(tkinter.Frame, EventHandler):
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -59,7 +63,17 @@ class RegionsView(tkinter.Frame, EventHandler):
 
 
 
-class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
+def _search_row(region):
+    return region.region_id, f'{region.region_code} - {region.name}'
+
+
+
+class _RegionsSearchView(EventHandler, tkinter.LabelFrame):
+    handled_events = (
+        ClearRegionsSearchListEvent, RegionSearchResultEvent, RegionSearchResultsEvent,
+        MoreRegionSearchResultsEvent, NoMoreRegionSearchResultsEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent, text = 'Region Search')
 
@@ -99,16 +113,14 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
         empty_area = tkinter.Label(self, text = '')
         empty_area.grid(row = 4, column = 1, sticky = tkinter.NSEW, padx = 5, pady = 5)
 
-        self._search_list = tkinter.Listbox(
-            self, height = 4,
-            activestyle = tkinter.NONE, selectmode = tkinter.SINGLE)
+        self._search_list = SearchResultList(
+            self, self._request_search_page, self._on_search_selection_changed, height = 4)
 
-        self._search_list.bind('<<ListboxSelect>>', self._on_search_selection_changed)
         self._search_list.grid(
             row = 0, column = 2, rowspan = 4, columnspan = 1, sticky = tkinter.NSEW,
             padx = 5, pady = 5)
 
-        self._search_region_ids = []
+        self._search_criteria = None
 
         button_frame = tkinter.Frame(self)
         button_frame.grid(row = 5, column = 2, sticky = tkinter.E, padx = 5, pady = 5)
@@ -138,9 +150,13 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
 
     def _on_search_button_clicked(self):
         self.initiate_event(ClearRegionsSearchListEvent())
+        self._search_criteria = self._get_search_region_code(), self._get_search_local_code(), self._get_search_name()
+        self._search_list.start()
+
+
+    def _request_search_page(self, after_id, page_size):
         self.initiate_event(StartRegionSearchEvent(
-            self._get_search_region_code(), self._get_search_local_code(),
-            self._get_search_name()))
+            *self._search_criteria, batch_results = True, page_size = page_size, after_id = after_id))
 
 
     def _get_search_region_code(self):
@@ -159,8 +175,7 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
 
 
     def _get_selected_search_region_id(self):
-        selection, *_ = self._search_list.curselection()
-        return self._search_region_ids[selection]
+        return self._search_list.selected_id()
 
 
     def _on_search_changed(self, *args):
@@ -175,8 +190,8 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
         return True
 
 
-    def _on_search_selection_changed(self, event):
-        if event.widget.curselection():
+    def _on_search_selection_changed(self):
+        if self._search_list.selected_id() is not None:
             new_state = tkinter.NORMAL
         else:
             new_state = tkinter.DISABLED
@@ -197,17 +212,20 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
 
     def on_event(self, event):
         if isinstance(event, ClearRegionsSearchListEvent):
-            self._search_list.delete(0, tkinter.END)
-            self._search_region_ids = []
+            self._search_list.clear()
             self._edit_button['state'] = tkinter.DISABLED
         elif isinstance(event, RegionSearchResultEvent):
-            display_name = f'{event.region().region_code} - {event.region().name}'
-            self._search_list.insert(tkinter.END, display_name)
-            self._search_region_ids.append(event.region().region_id)
+            self._search_list.add_rows([_search_row(event.region())])
+        elif isinstance(event, RegionSearchResultsEvent):
+            self._search_list.add_rows(map(_search_row, event.regions()))
+        elif isinstance(event, MoreRegionSearchResultsEvent):
+            self._search_list.end_page(event.after_id())
+        elif isinstance(event, NoMoreRegionSearchResultsEvent):
+            self._search_list.end_page(None)
 
 
 
-class _RegionEditorLoadingView(tkinter.LabelFrame, EventHandler):
+class _RegionEditorLoadingView(EventHandler, tkinter.LabelFrame):
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -216,7 +234,7 @@ class _RegionEditorLoadingView(tkinter.LabelFrame, EventHandler):
 
 
 
-class _RegionEditorView(tkinter.LabelFrame, EventHandler):
+class _RegionEditorView(EventHandler, tkinter.LabelFrame):
     def __init__(self, parent, is_new, is_editable, region):
         if is_new:
             frame_text = 'New Region'
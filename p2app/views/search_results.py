@@ -0,0 +1,253 @@
+# p2app/views/search_results.py
+#
+# ICS 33 Spring 2024
+# Project 2: Learning to Fly
+#
+# A list of search results that holds only the rows around those that are
+# visible, fetching them from the engine a page at a time as it is scrolled.
+
+import tkinter
+
+
+
+_PAGE_SIZE = 50
+
+# How many rows beyond those visible are kept (and, when the list is scrolled,
+# fetched ahead of time) in each direction.
+_PREFETCH_ROWS = 25
+
+
+
+class SearchResultList(tkinter.Frame):
+    """A scrolling list of search results, which holds the visible rows and a margin
+    of rows on either side of them, rather than every result of the search.  When
+    it is scrolled near either end of the rows it holds, it asks for the next or
+    previous page of results, and drops the pages that have moved out of view.
+
+    A page is asked for by calling request_page(after_id, page_size), which should
+    start a paged search whose results are then given to add_rows() and whose end
+    is reported to end_page().  To come back to a page that was dropped, the list
+    remembers the after_id that starts each page (one id per page, not per row).
+    Rows given to add_rows() outside of a page are simply appended, so results
+    that aren't paged are shown too, though all of them are held."""
+
+    def __init__(self, parent, request_page, on_selection_changed, height, page_size = _PAGE_SIZE):
+        super().__init__(parent)
+
+        self._request_page = request_page
+        self._on_selection_changed = on_selection_changed
+        self._page_size = page_size
+
+        self._list = tkinter.Listbox(
+            self, height = height,
+            activestyle = tkinter.NONE, selectmode = tkinter.SINGLE)
+
+        self._list.bind('<<ListboxSelect>>', self._on_select)
+        self._list.grid(row = 0, column = 0, sticky = tkinter.NSEW)
+
+        scrollbar = tkinter.Scrollbar(self, orient = tkinter.VERTICAL, command = self._list.yview)
+        scrollbar.grid(row = 0, column = 1, sticky = tkinter.NS)
+
+        self._scrollbar = scrollbar
+        self._list['yscrollcommand'] = self._on_scrolled
+
+        self.rowconfigure(0, weight = 1)
+        self.columnconfigure(0, weight = 1)
+
+        self._scheduled_fetch = None
+        self._reset()
+
+
+    def destroy(self):
+        if self._scheduled_fetch is not None:
+            self.after_cancel(self._scheduled_fetch)
+
+        super().destroy()
+
+
+    def _reset(self):
+        # The after_id that starts each page of the search found so far.
+        self._page_starts = []
+
+        # The ids of the rows of the pages held, which are the pages numbered from
+        # self._first_page on.
+        self._pages = []
+        self._first_page = 0
+
+        # While a page is being fetched: its number, and its rows so far.
+        self._pending_page = None
+        self._pending_ids = []
+        self._pending_texts = []
+
+
+    def clear(self):
+        """Removes every row, and forgets the search they came from."""
+        self._list.delete(0, tkinter.END)
+        self._reset()
+
+
+    def start(self):
+        """Asks for the first page of a new search."""
+        self.clear()
+        self._page_starts.append(None)
+        self._fetch(0)
+
+
+    def add_rows(self, rows):
+        """Adds rows, each an (id, text) pair, to the page being fetched.  Rows that
+        arrive when no page is being fetched, such as those of a search that isn't
+        paged, are added to the end of the list and are never dropped."""
+        if self._pending_page is not None:
+            for row_id, text in rows:
+                self._pending_ids.append(row_id)
+                self._pending_texts.append(text)
+        else:
+            ids = []
+            texts = []
+
+            for row_id, text in rows:
+                ids.append(row_id)
+                texts.append(text)
+
+            if texts:
+                if not self._pages:
+                    self._pages.append([])
+
+                self._pages[-1].extend(ids)
+                self._list.insert(tkinter.END, *texts)
+
+
+    def end_page(self, after_id):
+        """Ends the page being fetched, given the after_id that starts the next page,
+        or None if it was the last."""
+        if self._pending_page is None:
+            return
+
+        page, ids, texts = self._pending_page, self._pending_ids, self._pending_texts
+        self._pending_page = None
+        self._pending_ids = []
+        self._pending_texts = []
+
+        if after_id is not None and page + 1 == len(self._page_starts):
+            self._page_starts.append(after_id)
+
+        top = self._top_row()
+
+        if page < self._first_page:
+            self._list.insert(0, *texts)
+            self._pages.insert(0, ids)
+            self._first_page = page
+            top += len(ids)
+        else:
+            self._list.insert(tkinter.END, *texts)
+            self._pages.append(ids)
+
+        top = self._drop_distant_pages(top)
+        self._list.yview(top)
+        self._schedule_fetch()
+
+
+    def selected_id(self):
+        """Returns the id of the selected row, or None if no row is selected."""
+        selection = self._list.curselection()
+
+        if not selection:
+            return None
+
+        row = selection[0]
+
+        for ids in self._pages:
+            if row < len(ids):
+                return ids[row]
+
+            row -= len(ids)
+
+        return None
+
+
+    def row_count(self) -> int:
+        """Returns how many rows the list holds."""
+        return self._list.size()
+
+
+    def yview(self, *args):
+        return self._list.yview(*args)
+
+
+    def _fetch(self, page):
+        self._pending_page = page
+        self._request_page(self._page_starts[page], self._page_size)
+
+
+    def _top_row(self):
+        return self._list.nearest(0) if self._list.size() else 0
+
+
+    def _visible_rows(self):
+        # The first visible row and the one after the last.
+        size = self._list.size()
+        first, last = self._list.yview()
+        return round(first * size), round(last * size)
+
+
+    def _drop_distant_pages(self, top):
+        # Drops whole pages that are further from the visible rows than the prefetch
+        # margin, returning what was the top row's index afterward.
+        first, last = self._visible_rows()
+        bottom = top + (last - first)
+        is_selection_dropped = False
+
+        while len(self._pages) > 1 and len(self._pages[0]) <= top - _PREFETCH_ROWS:
+            ids = self._pages.pop(0)
+            is_selection_dropped |= self._is_selected(0, len(ids))
+            self._list.delete(0, len(ids) - 1)
+            self._first_page += 1
+            top -= len(ids)
+            bottom -= len(ids)
+
+        while len(self._pages) > 1 and \
+                self._list.size() - len(self._pages[-1]) >= bottom + _PREFETCH_ROWS:
+            ids = self._pages.pop()
+            size = self._list.size()
+            is_selection_dropped |= self._is_selected(size - len(ids), size)
+            self._list.delete(size - len(ids), tkinter.END)
+
+        if is_selection_dropped:
+            self._on_selection_changed()
+
+        return top
+
+
+    def _is_selected(self, start, end):
+        return any(start <= row < end for row in self._list.curselection())
+
+
+    def _on_scrolled(self, first, last):
+        self._scrollbar.set(first, last)
+        self._schedule_fetch()
+
+
+    def _schedule_fetch(self):
+        # Fetching waits until Tk is idle, since the list is still being changed
+        # when it reports that it was scrolled.
+        if self._scheduled_fetch is None:
+            self._scheduled_fetch = self.after_idle(self._fetch_if_near_end)
+
+
+    def _fetch_if_near_end(self):
+        self._scheduled_fetch = None
+
+        if self._pending_page is not None or not self._pages:
+            return
+
+        first, last = self._visible_rows()
+        next_page = self._first_page + len(self._pages)
+
+        if self._list.size() - last < _PREFETCH_ROWS and next_page < len(self._page_starts):
+            self._fetch(next_page)
+        elif first < _PREFETCH_ROWS and self._first_page > 0:
+            self._fetch(self._first_page - 1)
+
+
+    def _on_select(self, event):
+        self._on_selection_changed()
@@ -5,20 +5,51 @@
 #
 # This is the main module that runs the entire program.
 #
-# YOU WILL NOT NEED TO MODIFY THIS FILE AT ALL
+# Pass --background to run the engine on a worker thread, so that slow database
+# operations never freeze the window, and --event-log to also write the events
+# recorded in debug mode to a (rotating) log file.  Pass --record to append every
+# event sent to the engine to a recording, which benchmarks.replay can replay.
 
+import argparse
 from p2app import EventBus
 from p2app import Engine
 from p2app import MainView
+from p2app.events.event_log import EventLog
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description = 'Runs the Project 2 application.')
+    parser.add_argument(
+        '--background', action = 'store_true',
+        help = 'process events on a worker thread instead of the user interface thread')
+    parser.add_argument(
+        '--event-log', metavar = 'PATH',
+        help = 'write the events recorded in debug mode to this file')
+    parser.add_argument(
+        '--event-log-sampling', metavar = 'N', type = int, default = 1,
+        help = "record only one in every N of the engine's result events in debug mode")
+    parser.add_argument(
+        '--record', metavar = 'PATH',
+        help = 'append the events sent to the engine to this recording')
+    return parser.parse_args()
 
 
 def main():
+    arguments = _parse_arguments()
     event_bus = EventBus()
     engine = Engine()
     main_view = MainView(event_bus)
 
     event_bus.register_engine(engine)
     event_bus.register_view(main_view)
+    event_bus.set_event_log(
+        EventLog(path = arguments.event_log, sample_every = arguments.event_log_sampling))
+
+    if arguments.record:
+        event_bus.start_recording(arguments.record)
+
+    if arguments.background:
+        event_bus.enable_background_mode()
 
     main_view.run()
 
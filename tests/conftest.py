@@ -0,0 +1,28 @@
+# conftest.py
+#
+# Fixtures shared by the engine's tests.
+
+import sqlite3
+from pathlib import Path
+import pytest
+
+
+_SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'schema.sql'
+
+
+@pytest.fixture
+def database(tmp_path):
+    """The path of a new database with one continent, one country and three regions
+    sharing the name 'Same'."""
+    path = tmp_path / 'test.db'
+    connection = sqlite3.connect(path)
+    connection.executescript(_SCHEMA_PATH.read_text())
+    connection.execute("INSERT INTO continent VALUES (1, 'NA', 'North America')")
+    connection.execute(
+        "INSERT INTO country VALUES (1, 'US', 'United States', 1, 'https://example.org', NULL)")
+    connection.executemany(
+        "INSERT INTO region VALUES (?, ?, ?, 'Same', 1, 1, NULL, NULL)",
+        [(i, f'US-{i}', str(i)) for i in range(1, 4)])
+    connection.commit()
+    connection.close()
+    return path
@@ -0,0 +1,158 @@
+# test_cache.py
+#
+# Tests of the entity and query caches, and of the engine keeping them in step
+# with its saves.
+
+import pytest
+from p2app.engine import Engine, EngineConfig
+from p2app.engine.cache import EntityCache, QueryCache
+from p2app.events import *
+
+
+_NEW_REGION = Region(None, 'US-4', '4', 'Same', 1, 1, None, None)
+
+
+def test_query_cache_answers_a_repeated_search():
+    queries = QueryCache('region', 4, 10)
+    queries.put('key', queries.generation(), [1, 2])
+
+    assert queries.get('key') == [1, 2]
+    assert queries.get('other') is None
+    assert queries.statistics() == {'table': 'region', 'size': 1, 'hits': 1, 'misses': 1}
+
+
+def test_query_cache_bump_makes_earlier_entries_stale():
+    queries = QueryCache('region', 4, 10)
+    queries.put('key', queries.generation(), [1, 2])
+    queries.bump()
+
+    assert queries.get('key') is None
+
+
+def test_query_cache_drops_a_search_that_started_before_a_bump():
+    queries = QueryCache('region', 4, 10)
+    generation = queries.generation()
+    queries.bump()
+    queries.put('key', generation, [1, 2])
+
+    assert queries.get('key') is None
+    assert queries.statistics()['size'] == 0
+
+
+def test_query_cache_drops_results_longer_than_the_entity_cache():
+    queries = QueryCache('region', 4, 2)
+    queries.put('key', queries.generation(), [1, 2, 3])
+
+    assert queries.get('key') is None
+
+
+def test_query_cache_evicts_the_least_recently_used():
+    queries = QueryCache('region', 2, 10)
+    queries.put('a', 0, [1])
+    queries.put('b', 0, [2])
+    queries.get('a')
+    queries.put('c', 0, [3])
+
+    assert queries.get('a') == [1]
+    assert queries.get('b') is None
+    assert queries.get('c') == [3]
+
+
+def test_entity_cache_evicts_the_least_recently_used():
+    entities = EntityCache('region', 2)
+    entities.put(1, 'one')
+    entities.put(2, 'two')
+    entities.get(1)
+    entities.put(3, 'three')
+
+    assert entities.get(1) == 'one'
+    assert entities.get(2) is None
+    assert entities.get(3) == 'three'
+
+
+def test_entity_cache_forgets_an_invalidated_entity():
+    entities = EntityCache('region', 2)
+    entities.put(1, 'one')
+    entities.invalidate(1)
+
+    assert entities.get(1) is None
+
+
+def test_entity_cache_of_no_capacity_keeps_nothing():
+    entities = EntityCache('region', 0)
+    entities.put(1, 'one')
+
+    assert entities.get(1) is None
+    assert entities.statistics()['size'] == 0
+
+
+@pytest.fixture
+def engine(database):
+    # One row per batch, so that a search can be interrupted part way through.
+    engine = Engine(EngineConfig(search_batch_size=1))
+    list(engine.process_event(OpenDatabaseEvent(database)))
+    yield engine
+    list(engine.process_event(CloseDatabaseEvent()))
+
+
+def _region_ids(events):
+    return [event.region().region_id for event in events]
+
+
+def _region_query_statistics(engine):
+    [statistics] = [
+        statistics for statistics in engine.query_cache_statistics()
+        if statistics['table'] == 'region']
+    return statistics
+
+
+def test_repeated_search_is_answered_from_the_cache(engine):
+    search = StartRegionSearchEvent(None, None, 'Same')
+
+    assert _region_ids(engine.process_event(search)) == [1, 2, 3]
+    assert _region_ids(engine.process_event(search)) == [1, 2, 3]
+    assert _region_query_statistics(engine)['hits'] == 1
+
+
+def test_save_makes_cached_searches_stale(engine):
+    search = StartRegionSearchEvent(None, None, 'Same')
+    list(engine.process_event(search))
+
+    list(engine.process_event(SaveNewRegionEvent(_NEW_REGION)))
+
+    assert _region_ids(engine.process_event(search)) == [1, 2, 3, 4]
+    assert _region_query_statistics(engine)['hits'] == 0
+
+
+def test_save_makes_a_cached_entity_stale(engine):
+    [loaded] = engine.process_event(LoadRegionEvent(1))
+    renamed = loaded.region()._replace(name='Renamed')
+
+    list(engine.process_event(SaveRegionEvent(renamed)))
+
+    [loaded] = engine.process_event(LoadRegionEvent(1))
+    assert loaded.region() == renamed
+
+
+def test_search_interrupted_by_a_save_is_not_cached(engine):
+    search = StartRegionSearchEvent(None, None, 'Same')
+    interrupted = engine.process_event(search)
+    next(interrupted)
+
+    list(engine.process_event(SaveNewRegionEvent(_NEW_REGION)))
+    list(interrupted)
+
+    assert _region_ids(engine.process_event(search)) == [1, 2, 3, 4]
+    assert _region_query_statistics(engine)['hits'] == 0
+
+
+def test_superseded_search_is_not_cached(engine):
+    search = StartRegionSearchEvent(None, None, 'Same')
+    superseded = engine.process_event(search)
+    next(superseded)
+
+    list(engine.process_event(StartRegionSearchEvent('US-1', None, None)))
+    list(superseded)
+
+    list(engine.process_event(search))
+    assert _region_query_statistics(engine)['hits'] == 0
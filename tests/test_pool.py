@@ -0,0 +1,145 @@
+# test_pool.py
+#
+# Tests of the pool of read-only connections: that each event sees one snapshot,
+# that readers follow the writer's saves, and that an event falls back to the
+# writer when no reader comes free.
+
+import sqlite3
+import threading
+import time
+import pytest
+from p2app.engine import Engine, EngineConfig, pool
+from p2app.engine.pool import ReaderPool, WriterConnection
+from p2app.events import *
+
+
+_NEW_REGION = Region(None, 'US-4', '4', 'Same', 1, 1, None, None)
+
+
+def _open_engine(path, **settings):
+    engine = Engine(EngineConfig(read_pool_size=1, **settings))
+    list(engine.process_event(OpenDatabaseEvent(path)))
+    return engine
+
+
+def _region_ids(events):
+    return [event.region().region_id for event in events]
+
+
+@pytest.fixture
+def engine(database):
+    # One row per batch, so that a search reads the database as it is iterated.
+    engine = _open_engine(database, search_batch_size=1)
+    yield engine
+    list(engine.process_event(CloseDatabaseEvent()))
+
+
+@pytest.fixture
+def reader_pool(database):
+    writer = sqlite3.connect(database, factory=WriterConnection, check_same_thread=False)
+    writer.execute("PRAGMA journal_mode = WAL")
+    reader_pool = ReaderPool(writer, database, 1, EngineConfig(), 16)
+    yield reader_pool
+    reader_pool.close()
+    writer.close()
+
+
+def test_pool_is_used_in_wal_mode(engine, database):
+    connection = sqlite3.connect(database)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    connection.close()
+
+
+def test_event_sees_the_snapshot_taken_when_it_started(engine):
+    search = engine.process_event(StartRegionSearchEvent(None, None, 'Same'))
+    first = next(search)
+
+    saved = list(engine.process_event(SaveNewRegionEvent(_NEW_REGION)))
+    assert [type(event) for event in saved] == [RegionSavedEvent]
+
+    assert _region_ids([first, *search]) == [1, 2, 3]
+
+
+def test_next_event_sees_rows_saved_since_the_last(engine):
+    search = StartRegionSearchEvent(None, None, 'Same')
+    assert _region_ids(engine.process_event(search)) == [1, 2, 3]
+
+    list(engine.process_event(SaveNewRegionEvent(_NEW_REGION)))
+
+    assert _region_ids(engine.process_event(search)) == [1, 2, 3, 4]
+
+
+def test_next_event_sees_rows_changed_since_the_last(engine):
+    [loaded] = engine.process_event(LoadRegionEvent(1))
+    renamed = loaded.region()._replace(name='Renamed')
+
+    list(engine.process_event(SaveRegionEvent(renamed)))
+
+    [loaded] = engine.process_event(LoadRegionEvent(1))
+    assert loaded.region() == renamed
+    assert _region_ids(engine.process_event(StartRegionSearchEvent(None, None, 'Same'))) == [2, 3]
+
+
+def _recording_fallback(calls):
+    def fallback(event):
+        calls.append(event)
+        yield 'writer'
+
+    return fallback
+
+
+def _process_in_thread(reader_pool, event, fallback):
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.extend(reader_pool.process_event(event, fallback)))
+    thread.start()
+    return thread, results
+
+
+def test_busy_pool_falls_back_to_the_writer_after_waiting(reader_pool, monkeypatch):
+    monkeypatch.setattr(pool, '_READER_WAIT_SECONDS', 0.2)
+    calls = []
+    fallback = _recording_fallback(calls)
+
+    held = reader_pool.process_event(LoadRegionEvent(1), fallback)
+    next(held)
+
+    start = time.perf_counter()
+    thread, results = _process_in_thread(reader_pool, LoadRegionEvent(2), fallback)
+    thread.join()
+
+    assert time.perf_counter() - start >= 0.2
+    assert results == ['writer']
+    assert len(calls) == 1
+    held.close()
+
+
+def test_reader_given_back_while_waiting_is_used(reader_pool):
+    calls = []
+    fallback = _recording_fallback(calls)
+
+    held = reader_pool.process_event(LoadRegionEvent(1), fallback)
+    next(held)
+
+    thread, results = _process_in_thread(reader_pool, LoadRegionEvent(2), fallback)
+    time.sleep(0.1)
+    held.close()
+    thread.join()
+
+    assert calls == []
+    assert _region_ids(results) == [2]
+
+
+def test_thread_holding_a_reader_falls_back_without_waiting(reader_pool, monkeypatch):
+    # Its own reader could not be given back until the second event was done.
+    monkeypatch.setattr(pool, '_READER_WAIT_SECONDS', 5.0)
+    calls = []
+    fallback = _recording_fallback(calls)
+
+    held = reader_pool.process_event(LoadRegionEvent(1), fallback)
+    next(held)
+
+    start = time.perf_counter()
+    assert list(reader_pool.process_event(LoadRegionEvent(2), fallback)) == ['writer']
+    assert time.perf_counter() - start < 1.0
+    held.close()
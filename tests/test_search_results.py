@@ -0,0 +1,185 @@
+# test_search_results.py
+#
+# Tests of the search result list holding only a window of a search's rows.  Tk
+# needs a display, so the list is given a stand-in for its Listbox, and its idle
+# callbacks are run by the tests.
+
+import tkinter
+from p2app.views.search_results import SearchResultList
+
+
+_ROW_COUNT = 500
+_PAGE_SIZE = 20
+_HEIGHT = 10
+
+
+class _Listbox:
+    """Stands in for a Listbox showing _HEIGHT rows, keeping its rows, the first one
+    visible and the selection as Tk would."""
+
+    def __init__(self):
+        self.rows = []
+        self.top = 0
+        self.selection = set()
+
+    def insert(self, index, *texts):
+        if index == tkinter.END:
+            self.rows.extend(texts)
+        else:
+            self.rows[index:index] = texts
+            self.selection = {row + len(texts) if row >= index else row for row in self.selection}
+
+    def delete(self, first, last=None):
+        last = first if last is None else len(self.rows) - 1 if last == tkinter.END else last
+        del self.rows[first:last + 1]
+        self.selection = {
+            row - (last + 1 - first) if row > last else row
+            for row in self.selection if not first <= row <= last}
+        self.top = min(self.top, max(len(self.rows) - _HEIGHT, 0))
+
+    def size(self):
+        return len(self.rows)
+
+    def yview(self, *args):
+        if args:
+            self.top = min(max(args[0], 0), max(len(self.rows) - _HEIGHT, 0))
+        elif self.rows:
+            return self.top / len(self.rows), min(self.top + _HEIGHT, len(self.rows)) / len(self.rows)
+        else:
+            return 0.0, 1.0
+
+    def nearest(self, y):
+        return self.top
+
+    def curselection(self):
+        return tuple(sorted(self.selection))
+
+
+class _Search:
+    """Answers the list's requests for pages as a paged search of rows numbered
+    from 1 to _ROW_COUNT would, remembering each request's after_id."""
+
+    def __init__(self):
+        self.after_ids = []
+        self.selection_changes = 0
+        self.list = SearchResultList.__new__(SearchResultList)
+        self.list._request_page = self._request_page
+        self.list._on_selection_changed = self._on_selection_changed
+        self.list._page_size = _PAGE_SIZE
+        self.list._list = _Listbox()
+        self.list._scheduled_fetch = None
+        self.list._reset()
+        self._idle = []
+        self.list.after_idle = self._idle.append
+
+    def _request_page(self, after_id, page_size):
+        self.after_ids.append(after_id)
+        first = 1 if after_id is None else after_id + 1
+        row_ids = range(first, min(first + page_size, _ROW_COUNT + 1))
+        self.list.add_rows((row_id, f'Row {row_id}') for row_id in row_ids)
+        self.list.end_page(row_ids[-1] if row_ids[-1] < _ROW_COUNT else None)
+
+    def _on_selection_changed(self):
+        self.selection_changes += 1
+
+    def run_idle(self):
+        while self._idle:
+            self._idle.pop(0)()
+
+    def start(self):
+        self.list.start()
+        self.run_idle()
+
+    def scroll_to(self, row):
+        self.list.yview(row)
+        self.list._schedule_fetch()
+        self.run_idle()
+
+    def scroll_to_end(self):
+        # Each scroll fetches at most a page, so this keeps on until none is left.
+        while self.rows()[-1] != f'Row {_ROW_COUNT}':
+            self.scroll_to(self.list.row_count())
+
+    def scroll_to_start(self):
+        while self.rows()[0] != 'Row 1':
+            self.scroll_to(0)
+
+    def rows(self):
+        return self.list._list.rows
+
+    def select(self, row):
+        self.list._list.selection = {row}
+
+
+def _assert_ids_match_rows(search):
+    for row, text in enumerate(search.rows()):
+        search.select(row)
+        assert search.list.selected_id() == int(text.split()[1])
+
+
+def test_start_fetches_the_first_pages():
+    search = _Search()
+    search.start()
+
+    assert search.after_ids == [None, 20]
+    assert search.rows() == [f'Row {row_id}' for row_id in range(1, 41)]
+    _assert_ids_match_rows(search)
+
+
+def test_scrolling_down_keeps_only_the_rows_near_those_visible():
+    search = _Search()
+    search.start()
+    search.scroll_to_end()
+
+    assert search.after_ids == [None, *range(20, _ROW_COUNT, 20)]
+    assert search.list.row_count() <= 4 * _PAGE_SIZE
+    _assert_ids_match_rows(search)
+
+
+def test_scrolling_back_up_fetches_dropped_pages_again():
+    search = _Search()
+    search.start()
+    search.scroll_to_end()
+    scrolled_down = len(search.after_ids)
+    search.scroll_to_start()
+
+    refetched = search.after_ids[scrolled_down:]
+    assert refetched == sorted(refetched, key=lambda after_id: after_id or 0, reverse=True)
+    assert refetched[-1] is None
+    assert search.list.row_count() <= 4 * _PAGE_SIZE
+    _assert_ids_match_rows(search)
+
+
+def test_selection_keeps_its_row_as_pages_come_and_go():
+    search = _Search()
+    search.start()
+    search.scroll_to_end()
+    expected_id = int(search.rows()[2].split()[1])
+    search.select(2)
+
+    # Brings back the pages before the first row, moving the selected one down.
+    search.scroll_to(0)
+
+    assert search.list._list.curselection()[0] > 2
+    assert search.list.selected_id() == expected_id
+    assert search.selection_changes == 0
+
+
+def test_dropping_the_selected_row_reports_that_the_selection_changed():
+    search = _Search()
+    search.start()
+    search.select(0)
+
+    search.scroll_to_end()
+
+    assert search.selection_changes == 1
+    assert search.list.selected_id() is None
+
+
+def test_rows_outside_a_page_are_all_kept():
+    search = _Search()
+    search.list.add_rows((row_id, f'Row {row_id}') for row_id in range(1, 101))
+    search.list.add_rows([(101, 'Row 101')])
+
+    assert search.list.row_count() == 101
+    _assert_ids_match_rows(search)